@@ -29,7 +29,15 @@ def create_app():
     else:
         app.config['JWT_ACCESS_TOKEN_EXPIRES'] = False  # Never expire (for development)
     
-    # Initialize extensions
+    # Initialize extensions (metrics first, so request timing covers the other hooks).
+    # after_request hooks run in reverse order: the query instrumentation is
+    # registered before the database so its report includes the commit.
+    from app.database import db
+    from app.instrumentation import query_instrumentation
+    from app.metrics import metrics
+    metrics.init_app(app)
+    query_instrumentation.init_app(app)
+    db.init_app(app)
     jwt.init_app(app)
     cors.init_app(app, resources={
         r"/api/*": {
@@ -57,6 +65,19 @@ def create_app():
     app.register_blueprint(users_bp, url_prefix=f'{config.API_PREFIX}/users')
     app.register_blueprint(comments_bp, url_prefix=f'{config.API_PREFIX}/comments')
     app.register_blueprint(preferences_bp, url_prefix=f'{config.API_PREFIX}/preferences')
+    if config.METRICS_ENABLED:
+        from app.routes.metrics import metrics_bp
+        app.register_blueprint(metrics_bp)
+    if config.QUERY_DEBUG_ENDPOINT:
+        from app.routes.debug import debug_bp
+        app.register_blueprint(debug_bp, url_prefix=f'{config.API_PREFIX}/_debug')
+    
+    # Build the search index and trending ranking in the background so no request waits for them
+    if config.SEARCH_INDEX_ENABLED:
+        from app.search import search_engine
+        search_engine.start()
+    from app.services.trending_service import trending_service
+    trending_service.start()
     
     @app.route('/')
     def index():
@@ -2,10 +2,10 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.core.utils.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.utils.database import get_async_db
 from app.core.utils.security import decode_access_token
-from app.dal.repositories.user_repository import UserRepository
+from app.dal.repositories.user_repository import AsyncUserRepository
 from app.dal.models import UserModel
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
@@ -13,7 +13,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> UserModel:
     """Get current authenticated user."""
     credentials_exception = HTTPException(
@@ -26,12 +26,13 @@ async def get_current_user(
     if payload is None:
         raise credentials_exception
     
-    user_id: int = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
         raise credentials_exception
     
-    user_repository = UserRepository(db)
-    user = user_repository.get_by_id(user_id)
+    user_repository = AsyncUserRepository(db)
+    user = await user_repository.get_principal(user_id)
     if user is None:
         raise credentials_exception
     
@@ -0,0 +1,55 @@
+"""Request metrics middleware."""
+import time
+from fastapi import Request
+from app.metrics import MetricsRegistry
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request into a MetricsRegistry.
+    
+    Finished requests are labelled with their route template. The route is
+    only known once the router has matched it, so requests in flight are
+    counted by the track_in_flight dependency, which runs on the matched
+    route; requests that match no route are never in flight for long.
+    """
+    
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        scope["metrics_registry"] = self.registry
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            series = self.registry.series(getattr(route, "path", "unmatched"), scope["method"])
+            self.registry.observe(series, time.perf_counter() - started, status_code)
+
+
+async def track_in_flight(request: Request):
+    """App-wide dependency counting the request as in flight on its route's series."""
+    registry = request.scope.get("metrics_registry")
+    route = request.scope.get("route")
+    if registry is None or route is None:
+        yield
+        return
+    series = registry.series(route.path, request.method)
+    series.in_flight += 1
+    try:
+        yield
+    finally:
+        series.in_flight -= 1
@@ -8,7 +8,7 @@ from app.core.dto.article_dto import ArticleResponseDTO
 from app.api.middleware.auth import get_current_admin_user
 from app.bll.services.user_service import UserService
 from app.bll.services.article_service import ArticleService
-from app.dal.repositories.category_repository import CategoryRepository
+from app.dal.repositories.category_repository import CategoryRepository, category_catalog
 from app.dal.models import UserModel, CategoryModel
 from pydantic import BaseModel
 
@@ -23,7 +23,7 @@ class CategoryCreateDTO(BaseModel):
 
 
 @router.get("/users", response_model=List[UserResponseDTO])
-async def get_all_users(
+def get_all_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: UserModel = Depends(get_current_admin_user),
@@ -36,7 +36,7 @@ async def get_all_users(
 
 
 @router.get("/articles", response_model=List[ArticleResponseDTO])
-async def get_all_articles(
+def get_all_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: UserModel = Depends(get_current_admin_user),
@@ -51,7 +51,7 @@ async def get_all_articles(
 
 
 @router.post("/categories", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def create_category(
+def create_category(
     category_data: CategoryCreateDTO,
     current_user: UserModel = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
@@ -74,18 +74,28 @@ async def create_category(
 
 
 @router.get("/categories", response_model=List[dict])
-async def get_all_categories(
-    current_user: UserModel = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+def get_all_categories(
+    current_user: UserModel = Depends(get_current_admin_user)
 ):
     """Get all categories (admin only)."""
-    category_repo = CategoryRepository(db)
-    categories = category_repo.get_all()
-    return [{"id": c.id, "name": c.name, "slug": c.slug, "description": c.description} for c in categories]
+    return [
+        {"id": c["id"], "name": c["name"], "slug": c["slug"], "description": c["description"]}
+        for c in category_catalog.all()
+    ]
+
+
+@router.get("/stats/categories", response_model=dict)
+def get_category_catalog_stats(
+    current_user: UserModel = Depends(get_current_admin_user)
+):
+    """Category catalog of this process, compared with the database (admin only)."""
+    stats = category_catalog.stats()
+    stats.update(category_catalog.check())
+    return stats
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: UserModel = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
@@ -1,8 +1,8 @@
 """Article routes."""
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.core.utils.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.utils.database import get_async_db
 from app.core.dto.article_dto import (
     ArticleCreateDTO,
     ArticleUpdateDTO,
@@ -10,8 +10,9 @@ from app.core.dto.article_dto import (
     ArticleSearchDTO
 )
 from app.api.middleware.auth import get_current_active_user, get_current_admin_user
-from app.bll.services.article_service import ArticleService
-from app.bll.services.recommendation_service import RecommendationService
+from app.bll.services.article_service import AsyncArticleService
+from app.bll.services.recommendation_service import AsyncRecommendationService
+from app.dal.repositories.article_repository import ArticleLoad
 from app.dal.models import UserModel, ArticleModel
 
 router = APIRouter(prefix="/articles", tags=["articles"])
@@ -21,47 +22,51 @@ router = APIRouter(prefix="/articles", tags=["articles"])
 async def get_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get published articles."""
-    article_service = ArticleService(db)
-    articles = article_service.get_published_articles(skip, limit)
+    article_service = AsyncArticleService(db)
+    articles = await article_service.get_published_articles(skip, limit, load=ArticleLoad.LIST)
     return articles
 
 
 @router.get("/search", response_model=List[ArticleResponseDTO])
 async def search_articles(
+    response: Response,
     query: str = Query(None),
     category_id: int = Query(None),
     author_id: int = Query(None),
     is_exclusive: bool = Query(None),
+    sort: str = Query(None, pattern="^(newest|popular|relevance)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
-    """Search articles."""
-    article_service = ArticleService(db)
+    """Search articles; X-Total-Count carries the number of matches over all pages."""
+    article_service = AsyncArticleService(db)
     search_data = ArticleSearchDTO(
         query=query,
         category_id=category_id,
         author_id=author_id,
         is_exclusive=is_exclusive,
+        sort=sort,
         page=page,
         page_size=page_size
     )
-    articles = article_service.search_articles(search_data)
+    articles = await article_service.search_articles(search_data, load=ArticleLoad.LIST)
+    response.headers["X-Total-Count"] = str(await article_service.count_articles(search_data))
     return articles
 
 
 @router.get("/trending", response_model=List[ArticleResponseDTO])
 async def get_trending_articles(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get trending articles."""
-    recommendation_service = RecommendationService(db)
-    articles = recommendation_service.get_trending_articles(limit)
+    recommendation_service = AsyncRecommendationService(db)
+    articles = await recommendation_service.get_trending_articles(limit, load=ArticleLoad.LIST)
     return articles
 
 
@@ -69,27 +74,29 @@ async def get_trending_articles(
 async def get_recommendations(
     limit: int = Query(10, ge=1, le=50),
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get personalized recommendations."""
-    recommendation_service = RecommendationService(db)
-    articles = recommendation_service.get_personalized_recommendations(current_user.id, limit)
+    recommendation_service = AsyncRecommendationService(db)
+    articles = await recommendation_service.get_personalized_recommendations(
+        current_user.id, limit, load=ArticleLoad.LIST
+    )
     return articles
 
 
 @router.get("/{article_id}", response_model=ArticleResponseDTO)
 async def get_article(
     article_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get article by ID."""
-    article_service = ArticleService(db)
-    article = article_service.get_article_by_id(article_id)
+    article_service = AsyncArticleService(db)
+    article = await article_service.get_article_by_id(article_id, load=ArticleLoad.DETAIL)
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
     # Increment views
-    article_service.increment_views(article_id)
+    await article_service.increment_views(article_id)
     
     return article
 
@@ -98,7 +105,7 @@ async def get_article(
 async def create_article(
     article_data: ArticleCreateDTO,
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new article (requires author role)."""
     # Check if user is an author
@@ -108,9 +115,9 @@ async def create_article(
             detail="User is not an author"
         )
     
-    article_service = ArticleService(db)
+    article_service = AsyncArticleService(db)
     try:
-        article = article_service.create_article(current_user.author.id, article_data)
+        article = await article_service.create_article(current_user.author.id, article_data)
         return article
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -121,11 +128,11 @@ async def update_article(
     article_id: int,
     article_data: ArticleUpdateDTO,
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an article."""
-    article_service = ArticleService(db)
-    article = article_service.get_article_by_id(article_id)
+    article_service = AsyncArticleService(db)
+    article = await article_service.get_article_by_id(article_id, load=ArticleLoad.DETAIL)
     
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
@@ -138,7 +145,7 @@ async def update_article(
         )
     
     try:
-        updated_article = article_service.update_article(article_id, article_data)
+        updated_article = await article_service.update_article(article_id, article_data)
         if not updated_article:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
         return updated_article
@@ -150,11 +157,11 @@ async def update_article(
 async def publish_article(
     article_id: int,
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Publish an article."""
-    article_service = ArticleService(db)
-    article = article_service.get_article_by_id(article_id)
+    article_service = AsyncArticleService(db)
+    article = await article_service.get_article_by_id(article_id, load=ArticleLoad.DETAIL)
     
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
@@ -166,7 +173,7 @@ async def publish_article(
             detail="Not authorized to publish this article"
         )
     
-    published_article = article_service.publish_article(article_id)
+    published_article = await article_service.publish_article(article_id)
     if not published_article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
@@ -177,11 +184,11 @@ async def publish_article(
 async def delete_article(
     article_id: int,
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an article."""
-    article_service = ArticleService(db)
-    article = article_service.get_article_by_id(article_id)
+    article_service = AsyncArticleService(db)
+    article = await article_service.get_article_by_id(article_id, load=ArticleLoad.DETAIL)
     
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
@@ -193,10 +200,7 @@ async def delete_article(
             detail="Not authorized to delete this article"
         )
     
-    # Delete article (implement in service if needed)
-    from app.dal.repositories.article_repository import ArticleRepository
-    article_repo = ArticleRepository(db)
-    article_repo.delete(article_id)
+    await article_service.delete_article(article_id)
 
 
 
@@ -1,17 +1,19 @@
 """Authentication routes."""
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.utils.database import get_db
+from app.core.utils.database import get_db, get_async_db
 from app.core.utils.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.core.dto.user_dto import UserCreateDTO, UserLoginDTO, UserResponseDTO, TokenResponseDTO
-from app.bll.services.user_service import UserService
+from app.bll.services.user_service import UserService, AsyncUserService
+from app.passwords import PasswordHasherBusy
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserResponseDTO, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreateDTO, db: Session = Depends(get_db)):
+def register(user_data: UserCreateDTO, db: Session = Depends(get_db)):
     """Register a new user."""
     user_service = UserService(db)
     try:
@@ -19,13 +21,26 @@ async def register(user_data: UserCreateDTO, db: Session = Depends(get_db)):
         return user
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many requests right now, please retry",
+            headers={"Retry-After": "1"},
+        )
 
 
 @router.post("/login", response_model=TokenResponseDTO)
-async def login(credentials: UserLoginDTO, db: Session = Depends(get_db)):
+async def login(credentials: UserLoginDTO, db: AsyncSession = Depends(get_async_db)):
     """Login user and get access token."""
-    user_service = UserService(db)
-    user = user_service.authenticate_user(credentials.email, credentials.password)
+    user_service = AsyncUserService(db)
+    try:
+        user = await user_service.authenticate_user(credentials.email, credentials.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts right now, please retry",
+            headers={"Retry-After": "1"},
+        )
     
     if not user:
         raise HTTPException(
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/comments", tags=["comments"])
 
 
 @router.post("", response_model=CommentResponseDTO, status_code=status.HTTP_201_CREATED)
-async def create_comment(
+def create_comment(
     comment_data: CommentCreateDTO,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -27,7 +27,7 @@ async def create_comment(
 
 
 @router.get("/article/{article_id}", response_model=List[CommentResponseDTO])
-async def get_article_comments(
+def get_article_comments(
     article_id: int,
     skip: int = 0,
     limit: int = 100,
@@ -40,7 +40,7 @@ async def get_article_comments(
 
 
 @router.put("/{comment_id}", response_model=CommentResponseDTO)
-async def update_comment(
+def update_comment(
     comment_id: int,
     comment_data: CommentUpdateDTO,
     current_user: UserModel = Depends(get_current_active_user),
@@ -55,7 +55,7 @@ async def update_comment(
 
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_comment(
+def delete_comment(
     comment_id: int,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
 @router.get("", response_model=List[NotificationResponseDTO])
-async def get_notifications(
+def get_notifications(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     unread_only: bool = Query(False),
@@ -29,7 +29,7 @@ async def get_notifications(
 
 
 @router.put("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
-async def mark_notification_as_read(
+def mark_notification_as_read(
     notification_id: int,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -42,7 +42,7 @@ async def mark_notification_as_read(
 
 
 @router.put("/read-all", status_code=status.HTTP_204_NO_CONTENT)
-async def mark_all_notifications_as_read(
+def mark_all_notifications_as_read(
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
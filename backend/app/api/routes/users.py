@@ -11,7 +11,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserResponseDTO)
-async def get_current_user_profile(
+def get_current_user_profile(
     current_user: UserModel = Depends(get_current_active_user)
 ):
     """Get current user profile."""
@@ -19,7 +19,7 @@ async def get_current_user_profile(
 
 
 @router.put("/me", response_model=UserResponseDTO)
-async def update_current_user_profile(
+def update_current_user_profile(
     user_data: UserUpdateDTO,
     current_user: UserModel = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -33,7 +33,7 @@ async def update_current_user_profile(
 
 
 @router.get("/{user_id}", response_model=UserResponseDTO)
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db)
 ):
@@ -1,9 +1,9 @@
 """Services package."""
-from .user_service import UserService
-from .article_service import ArticleService
+from .user_service import UserService, AsyncUserService
+from .article_service import ArticleService, AsyncArticleService
 from .comment_service import CommentService
 from .notification_service import NotificationService
-from .recommendation_service import RecommendationService
+from .recommendation_service import RecommendationService, AsyncRecommendationService
 from .notification_strategy import (
     INotificationStrategy,
     BreakingNewsStrategy,
@@ -17,10 +17,13 @@ from .observer import Observer, SubscriptionObserver
 
 __all__ = [
     "UserService",
+    "AsyncUserService",
     "ArticleService",
+    "AsyncArticleService",
     "CommentService",
     "NotificationService",
     "RecommendationService",
+    "AsyncRecommendationService",
     "INotificationStrategy",
     "BreakingNewsStrategy",
     "DailyDigestStrategy",
@@ -1,13 +1,28 @@
 """Article service."""
-from typing import List, Optional
+from typing import List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.dal.repositories.article_repository import ArticleRepository
-from app.dal.repositories.category_repository import CategoryRepository
+from app.dal.repositories.article_repository import ArticleQuery, ArticleRepository, AsyncArticleRepository
+from app.dal.repositories.category_repository import CategoryRepository, AsyncCategoryRepository
 from app.dal.models import ArticleModel, ArticleStatusEnum, ArticleTagModel
 from app.core.models.article import ArticleStatus
 from app.core.dto.article_dto import ArticleCreateDTO, ArticleUpdateDTO, ArticleSearchDTO
 
 
+def search_query(search_data: ArticleSearchDTO) -> ArticleQuery:
+    """Article query for a search: all filters are applied in the database."""
+    query = ArticleQuery().published()
+    if search_data.query:
+        query = query.matching(search_data.query)
+    if search_data.category_id:
+        query = query.in_category(search_data.category_id)
+    if search_data.author_id:
+        query = query.by_author(search_data.author_id)
+    if search_data.is_exclusive is not None:
+        query = query.exclusive(search_data.is_exclusive)
+    return query.order_by(search_data.sort)
+
+
 class ArticleService:
     """Article service implementation."""
     
@@ -105,22 +120,11 @@ class ArticleService:
     def search_articles(self, search_data: ArticleSearchDTO) -> List[ArticleModel]:
         """Search articles."""
         skip = (search_data.page - 1) * search_data.page_size
-        limit = search_data.page_size
-        
-        if search_data.query:
-            articles = self.article_repository.search(search_data.query, skip, limit)
-        else:
-            articles = self.article_repository.get_published(skip, limit)
-        
-        # Apply filters
-        if search_data.category_id:
-            articles = [a for a in articles if a.category_id == search_data.category_id]
-        if search_data.author_id:
-            articles = [a for a in articles if a.author_id == search_data.author_id]
-        if search_data.is_exclusive is not None:
-            articles = [a for a in articles if a.is_exclusive == search_data.is_exclusive]
-        
-        return articles
+        return self.article_repository.find(search_query(search_data), skip, search_data.page_size)
+    
+    def count_articles(self, search_data: ArticleSearchDTO) -> int:
+        """Count all articles matching a search."""
+        return self.article_repository.count(search_query(search_data))
     
     def increment_views(self, article_id: int) -> None:
         """Increment article views."""
@@ -134,5 +138,109 @@ class ArticleService:
         return self.article_repository.get_trending(0, limit)
 
 
+class AsyncArticleService:
+    """Article service implementation on an async session."""
+    
+    def __init__(self, db: AsyncSession):
+        self.article_repository = AsyncArticleRepository(db)
+        self.category_repository = AsyncCategoryRepository(db)
+        self.db = db
+    
+    async def create_article(self, author_id: int, article_data: ArticleCreateDTO) -> ArticleModel:
+        """Create a new article."""
+        # Verify category exists
+        category = await self.category_repository.get_by_id(article_data.category_id)
+        if not category:
+            raise ValueError("Category not found")
+        
+        # Create article with its tags in one commit
+        article = ArticleModel(
+            title=article_data.title,
+            content=article_data.content,
+            summary=article_data.summary,
+            author_id=author_id,
+            category_id=article_data.category_id,
+            is_exclusive=article_data.is_exclusive,
+            status=ArticleStatusEnum.DRAFT,
+            tags=[ArticleTagModel(tag=tag) for tag in article_data.tags or []]
+        )
+        return await self.article_repository.create(article)
+    
+    async def get_article_by_id(self, article_id: int, load: Optional[Sequence] = None) -> Optional[ArticleModel]:
+        """Get article by ID; load picks an ArticleLoad profile."""
+        return await self.article_repository.get_by_id(article_id, load)
+    
+    async def update_article(self, article_id: int, article_data: ArticleUpdateDTO) -> Optional[ArticleModel]:
+        """Update an article."""
+        article = await self.article_repository.get_by_id(article_id)
+        if not article:
+            return None
+        
+        if article_data.title is not None:
+            article.title = article_data.title
+        if article_data.content is not None:
+            article.content = article_data.content
+        if article_data.summary is not None:
+            article.summary = article_data.summary
+        if article_data.category_id is not None:
+            category = await self.category_repository.get_by_id(article_data.category_id)
+            if not category:
+                raise ValueError("Category not found")
+            article.category_id = article_data.category_id
+        if article_data.status is not None:
+            article.status = ArticleStatusEnum(article_data.status.value)
+        if article_data.is_exclusive is not None:
+            article.is_exclusive = article_data.is_exclusive
+        
+        # Replace tags if provided; delete-orphan removes the old ones
+        if article_data.tags is not None:
+            article.tags = [ArticleTagModel(tag=tag) for tag in article_data.tags]
+        
+        return await self.article_repository.update(article)
+    
+    async def publish_article(self, article_id: int) -> Optional[ArticleModel]:
+        """Publish an article."""
+        article = await self.article_repository.get_by_id(article_id)
+        if not article:
+            return None
+        
+        from datetime import datetime
+        article.status = ArticleStatusEnum.PUBLISHED
+        article.published_at = datetime.utcnow()
+        return await self.article_repository.update(article)
+    
+    async def delete_article(self, article_id: int) -> bool:
+        """Delete an article."""
+        return await self.article_repository.delete(article_id)
+    
+    async def get_published_articles(self, skip: int = 0, limit: int = 20,
+                                     load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get published articles."""
+        return await self.article_repository.get_published(skip, limit, load)
+    
+    async def get_articles_by_category(self, category_id: int, skip: int = 0, limit: int = 20,
+                                       load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get articles by category."""
+        return await self.article_repository.get_by_category(category_id, skip, limit, load)
+    
+    async def search_articles(self, search_data: ArticleSearchDTO,
+                              load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Search articles."""
+        skip = (search_data.page - 1) * search_data.page_size
+        return await self.article_repository.find(search_query(search_data), skip, search_data.page_size, load)
+    
+    async def count_articles(self, search_data: ArticleSearchDTO) -> int:
+        """Count all articles matching a search."""
+        return await self.article_repository.count(search_query(search_data))
+    
+    async def increment_views(self, article_id: int) -> None:
+        """Increment article views."""
+        await self.article_repository.increment_views(article_id)
+    
+    async def get_trending_articles(self, limit: int = 10, load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get trending articles."""
+        return await self.article_repository.get_trending(0, limit, load=load)
+
+
 
 
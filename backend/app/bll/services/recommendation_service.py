@@ -1,10 +1,11 @@
 """Recommendation service."""
-from typing import List
+from typing import List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.dal.repositories.article_repository import ArticleRepository
-from app.dal.repositories.user_repository import UserRepository
-from app.dal.models import ArticleModel, UserModel, LikeModel, SavedArticleModel
-from sqlalchemy import func
+from app.dal.repositories.article_repository import ArticleRepository, AsyncArticleRepository
+from app.dal.repositories.user_repository import UserRepository, AsyncUserRepository
+from app.dal.models import ArticleModel, ArticleStatusEnum, UserModel, LikeModel, SavedArticleModel
+from sqlalchemy import func, select, union
 
 
 class RecommendationService:
@@ -64,3 +65,54 @@ class RecommendationService:
         """Get trending articles."""
         return self.article_repository.get_trending(0, limit)
 
+
+class AsyncRecommendationService:
+    """Recommendation service implementation on an async session."""
+    
+    def __init__(self, db: AsyncSession):
+        self.article_repository = AsyncArticleRepository(db)
+        self.user_repository = AsyncUserRepository(db)
+        self.db = db
+    
+    async def get_personalized_recommendations(self, user_id: int, limit: int = 10,
+                                               load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get personalized recommendations for a user."""
+        user = await self.user_repository.get_by_id(user_id)
+        if not user:
+            return []
+        
+        # Articles the user has liked or saved
+        interacted_article_ids = set((await self.db.execute(union(
+            select(LikeModel.article_id).filter(LikeModel.user_id == user_id),
+            select(SavedArticleModel.article_id).filter(SavedArticleModel.user_id == user_id)
+        ))).scalars().all())
+        
+        # Get categories from liked and saved articles
+        if interacted_article_ids:
+            category_ids = list((await self.db.execute(
+                select(ArticleModel.category_id).filter(ArticleModel.id.in_(interacted_article_ids)).distinct()
+            )).scalars().all())
+        else:
+            category_ids = []
+        
+        # Get recommendations based on user preferences
+        if category_ids:
+            return await self.article_repository.all(self.article_repository.select_many(load).filter(
+                ArticleModel.category_id.in_(category_ids),
+                ArticleModel.status == ArticleStatusEnum.PUBLISHED,
+                ~ArticleModel.id.in_(interacted_article_ids)
+            ).order_by(
+                ArticleModel.views_count.desc(),
+                ArticleModel.likes_count.desc()
+            ).limit(limit))
+        
+        # Fallback to trending articles
+        return await self.article_repository.get_trending(0, limit, load=load)
+    
+    async def get_trending_articles(self, limit: int = 10, load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get trending articles."""
+        return await self.article_repository.get_trending(0, limit, load=load)
+
+
+
+
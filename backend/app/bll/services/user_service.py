@@ -1,11 +1,12 @@
 """User service."""
 from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.dal.repositories.user_repository import UserRepository
+from app.dal.repositories.user_repository import UserRepository, AsyncUserRepository
 from app.dal.models import UserModel
 from app.core.models.user import User, SubscriptionType
 from app.core.dto.user_dto import UserCreateDTO, UserUpdateDTO
-from app.core.utils.security import get_password_hash, verify_password
+from app.passwords import password_hasher
 
 
 class UserService:
@@ -27,7 +28,7 @@ class UserService:
         user = UserModel(
             username=user_data.username,
             email=user_data.email,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=password_hasher.hash_in_pool(user_data.password),
             full_name=user_data.full_name,
             subscription_type=SubscriptionType.FREE.value
         )
@@ -38,10 +39,15 @@ class UserService:
         user = self.user_repository.get_by_email(email)
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        matches, new_hash = password_hasher.check(password, user.password_hash)
+        if not matches:
             return None
         if not user.is_active:
             return None
+        if new_hash:
+            # Upgrade a hash made with old bcrypt parameters
+            user.password_hash = new_hash
+            user = self.user_repository.update(user)
         return user
     
     def get_user_by_id(self, user_id: int) -> Optional[UserModel]:
@@ -71,5 +77,29 @@ class UserService:
         return self.user_repository.update(user)
 
 
+class AsyncUserService:
+    """User service implementation on an async session."""
+    
+    def __init__(self, db: AsyncSession):
+        self.user_repository = AsyncUserRepository(db)
+        self.db = db
+    
+    async def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
+        """Authenticate a user; bcrypt runs on the hashing pool, off the event loop."""
+        user = await self.user_repository.get_by_email(email)
+        if not user:
+            return None
+        matches, new_hash = await password_hasher.check_async(password, user.password_hash)
+        if not matches:
+            return None
+        if not user.is_active:
+            return None
+        if new_hash:
+            # Upgrade a hash made with old bcrypt parameters
+            user.password_hash = new_hash
+            user = await self.user_repository.update(user)
+        return user
+
+
 
 
@@ -0,0 +1,111 @@
+"""
+Category catalog - process-wide in-memory snapshot of all categories
+"""
+from datetime import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryCatalog:
+    """All categories, loaded once and looked up by id or slug from dicts.
+    
+    loader() returns category rows (dicts with at least id, name and slug).
+    The snapshot is dropped by invalidate() after category writes in this
+    process and reloaded on the next lookup; writes made by other processes
+    show up after ttl seconds. The version is a hash of the catalog contents,
+    so workers serving the same categories report the same version and a
+    stale worker stands out.
+    """
+    
+    def __init__(self, loader, ttl=300.0):
+        self.loader = loader
+        self.ttl = ttl
+        self._snapshot = None  # (rows, by_id, by_slug, version, loaded_at, expires_at)
+        self._load_lock = threading.Lock()
+        self._generation = 0
+        self._stats = {'loads': 0, 'invalidations': 0}
+    
+    def all(self):
+        """Category rows ordered by name; treat them as read-only"""
+        return self._current()[0]
+    
+    def get(self, category_id):
+        """Category row by id, or None"""
+        return self._current()[1].get(category_id)
+    
+    def get_by_slug(self, slug):
+        """Category row by slug, or None"""
+        return self._current()[2].get(slug)
+    
+    @property
+    def version(self):
+        """Content hash of the loaded catalog"""
+        return self._current()[3]
+    
+    def invalidate(self):
+        """Drop the snapshot; the next lookup reloads it"""
+        self._generation += 1
+        self._snapshot = None
+        self._stats['invalidations'] += 1
+    
+    def check(self):
+        """Compare the loaded catalog with the database without replacing it"""
+        version = self.version
+        database_version = self._version(self._sorted(self.loader()))
+        return {'version': version, 'database_version': database_version, 'stale': version != database_version}
+    
+    def stats(self):
+        """Version, size and load counters of this process' catalog"""
+        snapshot = self._snapshot
+        stats = dict(self._stats)
+        stats['pid'] = os.getpid()
+        stats['ttl'] = self.ttl
+        stats['loaded'] = snapshot is not None
+        if snapshot is not None:
+            stats['version'] = snapshot[3]
+            stats['categories'] = len(snapshot[0])
+            stats['loaded_at'] = snapshot[4].isoformat()
+        return stats
+    
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < snapshot[5]:
+            return snapshot
+        with self._load_lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() >= snapshot[5]:
+                snapshot = self._load()
+            return snapshot
+    
+    def _load(self):
+        generation = self._generation
+        rows = self._sorted(self.loader())
+        snapshot = (
+            rows,
+            {row['id']: row for row in rows},
+            {row['slug']: row for row in rows},
+            self._version(rows),
+            datetime.now(),
+            time.monotonic() + self.ttl
+        )
+        # Readers pick up the new catalog with a single reference swap; a load that
+        # raced with invalidate() may predate the write, so it serves only this call
+        if generation == self._generation:
+            self._snapshot = snapshot
+        self._stats['loads'] += 1
+        logger.debug(f"Category catalog loaded: {len(rows)} categories, version {snapshot[3]}")
+        return snapshot
+    
+    @staticmethod
+    def _sorted(rows):
+        return sorted((dict(row) for row in rows), key=lambda row: ((row['name'] or '').casefold(), row['id']))
+    
+    @staticmethod
+    def _version(rows):
+        content = repr([(row['id'], row['name'], row['slug'], row.get('description')) for row in rows])
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
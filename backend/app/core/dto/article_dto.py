@@ -1,7 +1,7 @@
 """Article DTOs."""
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Optional, List, Literal
+from pydantic import BaseModel, field_validator
 from ..models.article import ArticleStatus
 
 
@@ -44,6 +44,12 @@ class ArticleResponseDTO(BaseModel):
     updated_at: datetime
     tags: List[str]
 
+    @field_validator("tags", mode="before")
+    @classmethod
+    def tag_names(cls, tags):
+        """Accept ArticleTagModel rows as well as plain tag names."""
+        return [getattr(tag, "tag", tag) for tag in tags or []]
+
     class Config:
         from_attributes = True
 
@@ -54,6 +60,7 @@ class ArticleSearchDTO(BaseModel):
     category_id: Optional[int] = None
     author_id: Optional[int] = None
     is_exclusive: Optional[bool] = None
+    sort: Optional[Literal["newest", "popular", "relevance"]] = None
     page: int = 1
     page_size: int = 20
 
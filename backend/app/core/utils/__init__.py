@@ -1,5 +1,6 @@
 """Utilities package."""
-from .database import DatabaseConnection, Base, get_db
+from .database import DatabaseConnection, Base, get_db, get_async_db
+from .query_counter import QueryCounter
 from .security import (
     verify_password,
     get_password_hash,
@@ -11,6 +12,8 @@ __all__ = [
     "DatabaseConnection",
     "Base",
     "get_db",
+    "get_async_db",
+    "QueryCounter",
     "verify_password",
     "get_password_hash",
     "create_access_token",
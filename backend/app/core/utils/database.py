@@ -2,7 +2,8 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from typing import AsyncIterator, Optional
 import os
 
 Base = declarative_base()
@@ -14,6 +15,8 @@ class DatabaseConnection:
     _instance: Optional['DatabaseConnection'] = None
     _engine = None
     _session_factory = None
+    _async_engine: Optional[AsyncEngine] = None
+    _async_session_factory = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -46,6 +49,34 @@ class DatabaseConnection:
         """Get database engine."""
         return self._engine
     
+    def get_async_engine(self) -> AsyncEngine:
+        """Get async database engine, created on first use."""
+        if DatabaseConnection._async_engine is None:
+            # The async driver takes the same URL with an async dialect (aiomysql)
+            database_url = os.getenv(
+                "ASYNC_DATABASE_URL",
+                str(self._engine.url.set(drivername="mysql+aiomysql").render_as_string(hide_password=False))
+            )
+            DatabaseConnection._async_engine = create_async_engine(
+                database_url,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+                pool_size=int(os.getenv("ASYNC_DB_POOL_SIZE", "10")),
+                max_overflow=int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "20")),
+                echo=False
+            )
+            DatabaseConnection._async_session_factory = async_sessionmaker(
+                bind=DatabaseConnection._async_engine,
+                autoflush=False,
+                expire_on_commit=False
+            )
+        return DatabaseConnection._async_engine
+    
+    def get_async_session(self) -> AsyncSession:
+        """Get async database session."""
+        self.get_async_engine()
+        return self._async_session_factory()
+    
     def create_tables(self):
         """Create all tables."""
         Base.metadata.create_all(bind=self._engine)
@@ -64,5 +95,10 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for getting async database session."""
+    async with DatabaseConnection().get_async_session() as db:
+        yield db
+
 
 
@@ -0,0 +1,33 @@
+"""SQL statement counter for checking loading strategies."""
+from typing import List
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Counts the SQL statements an engine executes inside a with block.
+    
+    Works with sync and async engines:
+    
+        with QueryCounter(engine) as counter:
+            repository.get_published(0, 100, load=ArticleLoad.LIST)
+        assert counter.count == 2
+    """
+    
+    def __init__(self, engine):
+        # Events of an AsyncEngine are registered on its sync engine
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.statements: List[str] = []
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+    
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+    
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
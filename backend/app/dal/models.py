@@ -1,5 +1,5 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -97,7 +97,7 @@ class ArticleModel(Base):
     summary = Column(String(500))
     author_id = Column(Integer, ForeignKey("authors.id", ondelete="CASCADE"), nullable=False, index=True)
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="RESTRICT"), nullable=False, index=True)
-    status = Column(Enum(ArticleStatusEnum), default=ArticleStatusEnum.DRAFT, index=True)
+    status = Column(Enum(ArticleStatusEnum), default=ArticleStatusEnum.DRAFT)
     is_exclusive = Column(Boolean, default=False)
     views_count = Column(Integer, default=0)
     likes_count = Column(Integer, default=0)
@@ -114,6 +114,15 @@ class ArticleModel(Base):
     saved_articles = relationship("SavedArticleModel", back_populates="article")
     tags = relationship("ArticleTagModel", back_populates="article", cascade="all, delete-orphan")
     notifications = relationship("NotificationModel", back_populates="article")
+    
+    # Listing filters always include status and order by published_at (see ArticleQuery)
+    __table_args__ = (
+        Index("idx_status_published", "status", "published_at"),
+        Index("idx_status_category_published", "status", "category_id", "published_at"),
+        Index("idx_status_author_published", "status", "author_id", "published_at"),
+        Index("idx_status_exclusive_published", "status", "is_exclusive", "published_at"),
+        Index("idx_fulltext_search", "title", "content", "summary", mysql_prefix="FULLTEXT"),
+    )
 
 
 class ArticleTagModel(Base):
@@ -1,17 +1,21 @@
 """Repositories package."""
-from .base_repository import IRepository, BaseRepository
-from .user_repository import UserRepository
-from .article_repository import ArticleRepository
-from .category_repository import CategoryRepository
+from .base_repository import IRepository, BaseRepository, AsyncBaseRepository
+from .user_repository import UserRepository, AsyncUserRepository
+from .article_repository import ArticleRepository, AsyncArticleRepository
+from .category_repository import CategoryRepository, AsyncCategoryRepository
 from .comment_repository import CommentRepository
 from .notification_repository import NotificationRepository
 
 __all__ = [
     "IRepository",
     "BaseRepository",
+    "AsyncBaseRepository",
     "UserRepository",
+    "AsyncUserRepository",
     "ArticleRepository",
+    "AsyncArticleRepository",
     "CategoryRepository",
+    "AsyncCategoryRepository",
     "CommentRepository",
     "NotificationRepository",
 ]
@@ -1,43 +1,227 @@
 """Article repository."""
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from typing import List, Optional, Sequence
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import or_, and_, func, select
+import asyncio
+import copy
 from app.dal.models import ArticleModel, ArticleStatusEnum
-from app.dal.repositories.base_repository import BaseRepository
+from app.dal.repositories.base_repository import BaseRepository, AsyncBaseRepository, list_load_options
 from app.core.models.article import ArticleStatus
+from app.trending import TrendingRanking
+import os
+import threading
+import time
+
+
+class _TrendingSnapshot:
+    """Process-wide trending ranking, reloaded from the database on an interval."""
+    
+    def __init__(self):
+        self.ranking = TrendingRanking(
+            top_n=int(os.getenv("TRENDING_TOP_N", "200")),
+            decay=os.getenv("TRENDING_DECAY", "half_life"),
+            half_life_hours=float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24")),
+            gravity=float(os.getenv("TRENDING_GRAVITY", "1.8"))
+        )
+        self.refresh_interval = float(os.getenv("TRENDING_REFRESH_INTERVAL", "300"))
+        self._lock = threading.Lock()
+        self._loading: Optional[asyncio.Future] = None
+        self._next_refresh = 0.0
+    
+    def ensure_fresh(self, db: Session) -> None:
+        """Reload the ranking if it is due; only the first load makes readers wait."""
+        if time.monotonic() < self._next_refresh:
+            return
+        if not self._lock.acquire(blocking=self.ranking.ranked_at is None):
+            return
+        try:
+            if time.monotonic() >= self._next_refresh:
+                self._rebuild(db.execute(self._rows_query()).all())
+        finally:
+            self._lock.release()
+    
+    async def ensure_fresh_async(self, db: AsyncSession) -> None:
+        """Reload the ranking if it is due; one load runs at a time and only cold callers await it."""
+        while time.monotonic() >= self._next_refresh:
+            task = self._loading
+            if task is None:
+                task = self._loading = asyncio.ensure_future(self._load_async(db))
+                try:
+                    await task
+                finally:
+                    if self._loading is task:
+                        self._loading = None
+                return
+            if self.ranking.ranked_at is not None:
+                return
+            try:
+                await asyncio.shield(task)
+                return
+            except asyncio.CancelledError:
+                # Only the load was cancelled (its request went away): run the next one ourselves
+                if not task.cancelled():
+                    raise
+    
+    async def _load_async(self, db: AsyncSession) -> None:
+        self._rebuild((await db.execute(self._rows_query())).all())
+    
+    def _rows_query(self):
+        return select(
+            ArticleModel.id,
+            ArticleModel.category_id,
+            ArticleModel.views_count,
+            ArticleModel.likes_count,
+            func.coalesce(ArticleModel.published_at, ArticleModel.created_at)
+        ).filter(ArticleModel.status == ArticleStatusEnum.PUBLISHED)
+    
+    def _rebuild(self, rows) -> None:
+        self.ranking.rebuild(rows)
+        self._next_refresh = time.monotonic() + self.refresh_interval
+
+
+_trending = _TrendingSnapshot()
+
+
+class ArticleLoad:
+    """Loading profiles for ArticleModel queries.
+    
+    LIST loads what a page of ArticleResponseDTOs reads (tags in one extra
+    SELECT, category joined) and makes any other relationship access raise,
+    so an N+1 cannot creep in unnoticed. DETAIL loads every relationship a
+    single article page shows.
+    """
+    
+    LIST = (
+        selectinload(ArticleModel.tags),
+        joinedload(ArticleModel.category),
+        raiseload("*"),
+    )
+    DETAIL = (
+        selectinload(ArticleModel.tags),
+        joinedload(ArticleModel.category),
+        joinedload(ArticleModel.author),
+    )
+
+
+class ArticleQuery:
+    """Composable article listing query: filters, full-text match and ordering run in SQL.
+    
+    Every method returns a new query, so a base query can be shared and
+    refined. select() gives one page of articles and count() the total
+    number of matches for the same filters.
+    """
+    
+    ORDERINGS = ("newest", "popular", "relevance")
+    
+    def __init__(self):
+        self._conditions = []
+        self._relevance = None
+        self._ordering = "newest"
+    
+    def published(self) -> "ArticleQuery":
+        """Only published articles."""
+        return self.where(ArticleModel.status == ArticleStatusEnum.PUBLISHED)
+    
+    def in_category(self, category_id: int) -> "ArticleQuery":
+        """Only articles of one category."""
+        return self.where(ArticleModel.category_id == category_id)
+    
+    def by_author(self, author_id: int) -> "ArticleQuery":
+        """Only articles of one author."""
+        return self.where(ArticleModel.author_id == author_id)
+    
+    def exclusive(self, is_exclusive: bool = True) -> "ArticleQuery":
+        """Only exclusive (or only non-exclusive) articles."""
+        return self.where(ArticleModel.is_exclusive == is_exclusive)
+    
+    def matching(self, text: str) -> "ArticleQuery":
+        """Full-text match on title, content and summary; orders by relevance."""
+        relevance = mysql.match(ArticleModel.title, ArticleModel.content, ArticleModel.summary, against=text)
+        query = self.where(relevance)
+        query._relevance = relevance
+        query._ordering = "relevance"
+        return query
+    
+    def where(self, *conditions) -> "ArticleQuery":
+        """Add arbitrary filter conditions."""
+        query = copy.copy(self)
+        query._conditions = self._conditions + list(conditions)
+        return query
+    
+    def order_by(self, ordering: Optional[str]) -> "ArticleQuery":
+        """Order by "newest", "popular" or "relevance" (full-text queries only)."""
+        if ordering is None:
+            return self
+        if ordering not in self.ORDERINGS:
+            raise ValueError(f"Unknown ordering: {ordering}")
+        query = copy.copy(self)
+        query._ordering = ordering
+        return query
+    
+    def select(self, skip: int = 0, limit: int = 100, options=()):
+        """SELECT of one page of matching articles."""
+        if self._ordering == "relevance" and self._relevance is not None:
+            order = [self._relevance.desc(), ArticleModel.published_at.desc()]
+        elif self._ordering == "popular":
+            order = [ArticleModel.views_count.desc(), ArticleModel.likes_count.desc()]
+        else:
+            order = [ArticleModel.published_at.desc()]
+        # id breaks ties so pages do not overlap
+        order.append(ArticleModel.id.desc())
+        return (
+            select(ArticleModel)
+            .options(*options)
+            .where(*self._conditions)
+            .order_by(*order)
+            .offset(skip)
+            .limit(limit)
+        )
+    
+    def count(self):
+        """SELECT of the number of matching articles."""
+        return select(func.count(ArticleModel.id)).where(*self._conditions)
 
 
 class ArticleRepository(BaseRepository[ArticleModel]):
     """Article repository implementation."""
     
+    load_options = ArticleLoad.DETAIL
+    list_options = ArticleLoad.LIST
+    
     def __init__(self, db: Session):
         super().__init__(db, ArticleModel)
     
-    def get_by_category(self, category_id: int, skip: int = 0, limit: int = 100) -> List[ArticleModel]:
+    def get_by_category(self, category_id: int, skip: int = 0, limit: int = 100,
+                        load: Optional[Sequence] = None) -> List[ArticleModel]:
         """Get articles by category."""
-        return self.db.query(ArticleModel).filter(
+        return self.query_many(load).filter(
             and_(
                 ArticleModel.category_id == category_id,
                 ArticleModel.status == ArticleStatusEnum.PUBLISHED
             )
         ).offset(skip).limit(limit).all()
     
-    def get_published(self, skip: int = 0, limit: int = 100) -> List[ArticleModel]:
+    def get_published(self, skip: int = 0, limit: int = 100,
+                      load: Optional[Sequence] = None) -> List[ArticleModel]:
         """Get all published articles."""
-        return self.db.query(ArticleModel).filter(
+        return self.query_many(load).filter(
             ArticleModel.status == ArticleStatusEnum.PUBLISHED
         ).order_by(ArticleModel.published_at.desc()).offset(skip).limit(limit).all()
     
-    def get_by_author(self, author_id: int, skip: int = 0, limit: int = 100) -> List[ArticleModel]:
+    def get_by_author(self, author_id: int, skip: int = 0, limit: int = 100,
+                      load: Optional[Sequence] = None) -> List[ArticleModel]:
         """Get articles by author."""
-        return self.db.query(ArticleModel).filter(
+        return self.query_many(load).filter(
             ArticleModel.author_id == author_id
         ).order_by(ArticleModel.created_at.desc()).offset(skip).limit(limit).all()
     
-    def search(self, query: str, skip: int = 0, limit: int = 100) -> List[ArticleModel]:
+    def search(self, query: str, skip: int = 0, limit: int = 100,
+               load: Optional[Sequence] = None) -> List[ArticleModel]:
         """Search articles by query."""
         search_pattern = f"%{query}%"
-        return self.db.query(ArticleModel).filter(
+        return self.query_many(load).filter(
             and_(
                 ArticleModel.status == ArticleStatusEnum.PUBLISHED,
                 or_(
@@ -48,18 +232,33 @@ class ArticleRepository(BaseRepository[ArticleModel]):
             )
         ).offset(skip).limit(limit).all()
     
-    def get_trending(self, skip: int = 0, limit: int = 10) -> List[ArticleModel]:
-        """Get trending articles based on views and likes."""
-        return self.db.query(ArticleModel).filter(
-            ArticleModel.status == ArticleStatusEnum.PUBLISHED
-        ).order_by(
-            ArticleModel.views_count.desc(),
-            ArticleModel.likes_count.desc()
-        ).offset(skip).limit(limit).all()
+    def get_trending(self, skip: int = 0, limit: int = 10, category_id: Optional[int] = None,
+                     load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get trending articles from the precomputed time-decayed ranking."""
+        _trending.ensure_fresh(self.db)
+        article_ids = _trending.ranking.top(skip + limit, category_id=category_id)[skip:]
+        if not article_ids:
+            return []
+        articles = {
+            article.id: article
+            for article in self.query_many(load).filter(ArticleModel.id.in_(article_ids)).all()
+        }
+        return [articles[article_id] for article_id in article_ids if article_id in articles]
+    
+    def find(self, query: ArticleQuery, skip: int = 0, limit: int = 100,
+             load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get one page of articles matching a query."""
+        statement = query.select(skip, limit, options=list_load_options(self, load))
+        return list(self.db.execute(statement).unique().scalars().all())
     
-    def get_exclusive(self, skip: int = 0, limit: int = 100) -> List[ArticleModel]:
+    def count(self, query: ArticleQuery) -> int:
+        """Count all articles matching a query."""
+        return self.db.execute(query.count()).scalar_one()
+    
+    def get_exclusive(self, skip: int = 0, limit: int = 100,
+                      load: Optional[Sequence] = None) -> List[ArticleModel]:
         """Get exclusive articles."""
-        return self.db.query(ArticleModel).filter(
+        return self.query_many(load).filter(
             and_(
                 ArticleModel.is_exclusive == True,
                 ArticleModel.status == ArticleStatusEnum.PUBLISHED
@@ -67,5 +266,99 @@ class ArticleRepository(BaseRepository[ArticleModel]):
         ).offset(skip).limit(limit).all()
 
 
+class AsyncArticleRepository(AsyncBaseRepository[ArticleModel]):
+    """Article repository implementation on an async session."""
+    
+    load_options = ArticleLoad.DETAIL
+    list_options = ArticleLoad.LIST
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, ArticleModel)
+    
+    async def get_by_category(self, category_id: int, skip: int = 0, limit: int = 100,
+                              load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get articles by category."""
+        return await self.all(self.select_many(load).filter(
+            and_(
+                ArticleModel.category_id == category_id,
+                ArticleModel.status == ArticleStatusEnum.PUBLISHED
+            )
+        ).offset(skip).limit(limit))
+    
+    async def get_published(self, skip: int = 0, limit: int = 100,
+                            load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get all published articles."""
+        return await self.all(self.select_many(load).filter(
+            ArticleModel.status == ArticleStatusEnum.PUBLISHED
+        ).order_by(ArticleModel.published_at.desc()).offset(skip).limit(limit))
+    
+    async def get_by_author(self, author_id: int, skip: int = 0, limit: int = 100,
+                            load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get articles by author."""
+        return await self.all(self.select_many(load).filter(
+            ArticleModel.author_id == author_id
+        ).order_by(ArticleModel.created_at.desc()).offset(skip).limit(limit))
+    
+    async def search(self, query: str, skip: int = 0, limit: int = 100,
+                     load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Search articles by query."""
+        search_pattern = f"%{query}%"
+        return await self.all(self.select_many(load).filter(
+            and_(
+                ArticleModel.status == ArticleStatusEnum.PUBLISHED,
+                or_(
+                    ArticleModel.title.like(search_pattern),
+                    ArticleModel.content.like(search_pattern),
+                    ArticleModel.summary.like(search_pattern)
+                )
+            )
+        ).offset(skip).limit(limit))
+    
+    async def get_trending(self, skip: int = 0, limit: int = 10, category_id: Optional[int] = None,
+                           load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get trending articles from the precomputed time-decayed ranking."""
+        await _trending.ensure_fresh_async(self.db)
+        article_ids = _trending.ranking.top(skip + limit, category_id=category_id)[skip:]
+        return await self.get_by_ids(article_ids, load)
+    
+    async def get_by_ids(self, article_ids: List[int], load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get articles by ID in the given order."""
+        if not article_ids:
+            return []
+        articles = {
+            article.id: article
+            for article in await self.all(self.select_many(load).filter(ArticleModel.id.in_(article_ids)))
+        }
+        return [articles[article_id] for article_id in article_ids if article_id in articles]
+    
+    async def find(self, query: ArticleQuery, skip: int = 0, limit: int = 100,
+                   load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get one page of articles matching a query."""
+        return await self.all(query.select(skip, limit, options=list_load_options(self, load)))
+    
+    async def count(self, query: ArticleQuery) -> int:
+        """Count all articles matching a query."""
+        return (await self.db.execute(query.count())).scalar_one()
+    
+    async def get_exclusive(self, skip: int = 0, limit: int = 100,
+                            load: Optional[Sequence] = None) -> List[ArticleModel]:
+        """Get exclusive articles."""
+        return await self.all(self.select_many(load).filter(
+            and_(
+                ArticleModel.is_exclusive == True,
+                ArticleModel.status == ArticleStatusEnum.PUBLISHED
+            )
+        ).offset(skip).limit(limit))
+    
+    async def increment_views(self, article_id: int) -> None:
+        """Increment the view counter in place."""
+        await self.db.execute(
+            ArticleModel.__table__.update()
+            .where(ArticleModel.id == article_id)
+            .values(views_count=ArticleModel.views_count + 1)
+        )
+        await self.db.commit()
+
+
 
 
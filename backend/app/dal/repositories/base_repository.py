@@ -1,11 +1,20 @@
 """Base repository interface and implementation."""
-from typing import Generic, TypeVar, Type, Optional, List
+from typing import Generic, TypeVar, Type, Optional, List, Sequence
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.utils.database import Base
 
 T = TypeVar("T", bound=Base)
 
 
+def list_load_options(repository, load: Optional[Sequence]) -> Sequence:
+    """Load options for a list read: explicit, the list profile, or the single entity profile."""
+    if load is not None:
+        return load
+    return repository.load_options if repository.list_options is None else repository.list_options
+
+
 class IRepository(Generic[T]):
     """Repository interface following Repository pattern."""
     
@@ -31,19 +40,35 @@ class IRepository(Generic[T]):
 
 
 class BaseRepository(IRepository[T]):
-    """Base repository implementation."""
+    """Base repository implementation.
+    
+    load_options are the loader options (selectinload, joinedload, ...) for
+    single entities and list_options those for lists; read methods accept a
+    load argument to pick another profile.
+    """
+    
+    load_options: Sequence = ()
+    list_options: Optional[Sequence] = None
     
     def __init__(self, db: Session, model: Type[T]):
         self.db = db
         self.model = model
     
-    def get_by_id(self, id: int) -> Optional[T]:
+    def query(self, load: Optional[Sequence] = None):
+        """Query of the model with the single entity (or given) load options."""
+        return self.db.query(self.model).options(*(self.load_options if load is None else load))
+    
+    def query_many(self, load: Optional[Sequence] = None):
+        """Query of the model with the list (or given) load options."""
+        return self.query(list_load_options(self, load))
+    
+    def get_by_id(self, id: int, load: Optional[Sequence] = None) -> Optional[T]:
         """Get entity by ID."""
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        return self.query(load).filter(self.model.id == id).first()
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
+    def get_all(self, skip: int = 0, limit: int = 100, load: Optional[Sequence] = None) -> List[T]:
         """Get all entities."""
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+        return self.query_many(load).offset(skip).limit(limit).all()
     
     def create(self, entity: T) -> T:
         """Create a new entity."""
@@ -68,5 +93,70 @@ class BaseRepository(IRepository[T]):
         return False
 
 
+class AsyncBaseRepository(Generic[T]):
+    """Base repository implementation on an async session.
+    
+    Relationships cannot be lazy loaded from async code, so the ones callers
+    read must be in the load profile: load_options for single entities,
+    list_options for lists, or the load argument of the read methods.
+    """
+    
+    load_options: Sequence = ()
+    list_options: Optional[Sequence] = None
+    
+    def __init__(self, db: AsyncSession, model: Type[T]):
+        self.db = db
+        self.model = model
+    
+    def select(self, load: Optional[Sequence] = None):
+        """SELECT of the model with the single entity (or given) load options."""
+        return select(self.model).options(*(self.load_options if load is None else load))
+    
+    def select_many(self, load: Optional[Sequence] = None):
+        """SELECT of the model with the list (or given) load options."""
+        return self.select(list_load_options(self, load))
+    
+    async def get_by_id(self, id: int, load: Optional[Sequence] = None) -> Optional[T]:
+        """Get entity by ID."""
+        result = await self.db.execute(self.select(load).filter(self.model.id == id))
+        return result.scalars().first()
+    
+    async def get_all(self, skip: int = 0, limit: int = 100, load: Optional[Sequence] = None) -> List[T]:
+        """Get all entities."""
+        return await self.all(self.select_many(load).offset(skip).limit(limit))
+    
+    async def all(self, statement) -> List[T]:
+        """Execute a SELECT of the model and return the entities."""
+        result = await self.db.execute(statement)
+        return list(result.scalars().all())
+    
+    async def create(self, entity: T) -> T:
+        """Create a new entity."""
+        self.db.add(entity)
+        await self.db.commit()
+        return await self.reload(entity)
+    
+    async def update(self, entity: T) -> T:
+        """Update an existing entity."""
+        await self.db.commit()
+        return await self.reload(entity)
+    
+    async def reload(self, entity: T) -> T:
+        """Re-read an entity and its eager loaded relationships after a commit."""
+        result = await self.db.execute(
+            self.select().filter(self.model.id == entity.id).execution_options(populate_existing=True)
+        )
+        return result.scalars().one()
+    
+    async def delete(self, id: int) -> bool:
+        """Delete an entity by ID."""
+        entity = await self.get_by_id(id)
+        if entity:
+            await self.db.delete(entity)
+            await self.db.commit()
+            return True
+        return False
+
+
 
 
@@ -1,8 +1,28 @@
 """Category repository."""
-from typing import Optional
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.category_catalog import CategoryCatalog
+from app.core.utils.database import DatabaseConnection
 from app.dal.models import CategoryModel
-from app.dal.repositories.base_repository import BaseRepository
+from app.dal.repositories.base_repository import BaseRepository, AsyncBaseRepository
+import os
+
+
+def _load_categories() -> List[dict]:
+    """Category rows for the catalog, read on a short-lived session."""
+    db = DatabaseConnection().get_session()
+    try:
+        return [
+            {"id": c.id, "name": c.name, "slug": c.slug, "description": c.description, "created_at": c.created_at}
+            for c in db.query(CategoryModel).all()
+        ]
+    finally:
+        db.close()
+
+
+# Process-wide category catalog; category writes through the repositories invalidate it
+category_catalog = CategoryCatalog(_load_categories, ttl=float(os.getenv("CATEGORY_CATALOG_TTL", "300")))
 
 
 class CategoryRepository(BaseRepository[CategoryModel]):
@@ -14,6 +34,56 @@ class CategoryRepository(BaseRepository[CategoryModel]):
     def get_by_slug(self, slug: str) -> Optional[CategoryModel]:
         """Get category by slug."""
         return self.db.query(CategoryModel).filter(CategoryModel.slug == slug).first()
+    
+    def create(self, entity: CategoryModel) -> CategoryModel:
+        """Create a category and invalidate the catalog."""
+        entity = super().create(entity)
+        category_catalog.invalidate()
+        return entity
+    
+    def update(self, entity: CategoryModel) -> CategoryModel:
+        """Update a category and invalidate the catalog."""
+        entity = super().update(entity)
+        category_catalog.invalidate()
+        return entity
+    
+    def delete(self, id: int) -> bool:
+        """Delete a category and invalidate the catalog."""
+        deleted = super().delete(id)
+        if deleted:
+            category_catalog.invalidate()
+        return deleted
+
+
+class AsyncCategoryRepository(AsyncBaseRepository[CategoryModel]):
+    """Category repository implementation on an async session."""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, CategoryModel)
+    
+    async def get_by_slug(self, slug: str) -> Optional[CategoryModel]:
+        """Get category by slug."""
+        result = await self.db.execute(self.select().filter(CategoryModel.slug == slug))
+        return result.scalars().first()
+    
+    async def create(self, entity: CategoryModel) -> CategoryModel:
+        """Create a category and invalidate the catalog."""
+        entity = await super().create(entity)
+        category_catalog.invalidate()
+        return entity
+    
+    async def update(self, entity: CategoryModel) -> CategoryModel:
+        """Update a category and invalidate the catalog."""
+        entity = await super().update(entity)
+        category_catalog.invalidate()
+        return entity
+    
+    async def delete(self, id: int) -> bool:
+        """Delete a category and invalidate the catalog."""
+        deleted = await super().delete(id)
+        if deleted:
+            category_catalog.invalidate()
+        return deleted
 
 
 
@@ -1,9 +1,46 @@
 """User repository."""
 from typing import Optional
-from sqlalchemy.orm import Session
-from app.dal.models import UserModel
-from app.dal.repositories.base_repository import BaseRepository
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
+from app.dal.models import AuthorModel, UserModel
+from app.dal.repositories.base_repository import BaseRepository, AsyncBaseRepository
 from app.core.models.user import User, SubscriptionType
+from app.cache import TTLCache
+import os
+
+# user_id -> column values of recently authenticated users and their authors.
+# Updates and deletes through the repositories invalidate entries.
+principal_cache = TTLCache(
+    max_size=int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")),
+    default_ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+)
+
+
+def _columns(entity) -> dict:
+    return {attr.key: getattr(entity, attr.key) for attr in inspect(type(entity)).column_attrs}
+
+
+def _detached(model, values: dict):
+    entity = model(**values)
+    make_transient_to_detached(entity)
+    return entity
+
+
+def _principal_snapshot(user: UserModel) -> tuple:
+    """Plain column values of a user and its author, safe to share between sessions."""
+    author = user.author
+    return _columns(user), _columns(author) if author is not None else None
+
+
+def _principal_from_snapshot(snapshot: tuple) -> UserModel:
+    """A new detached UserModel, with its author loaded, from a principal snapshot."""
+    user_values, author_values = snapshot
+    user = _detached(UserModel, user_values)
+    set_committed_value(user, "author", _detached(AuthorModel, author_values) if author_values else None)
+    return user
 
 
 class UserRepository(BaseRepository[UserModel]):
@@ -12,6 +49,18 @@ class UserRepository(BaseRepository[UserModel]):
     def __init__(self, db: Session):
         super().__init__(db, UserModel)
     
+    def update(self, entity: UserModel) -> UserModel:
+        """Update a user and drop its cached principal."""
+        entity = super().update(entity)
+        principal_cache.invalidate(entity.id)
+        return entity
+    
+    def delete(self, id: int) -> bool:
+        """Delete a user and drop its cached principal."""
+        deleted = super().delete(id)
+        principal_cache.invalidate(id)
+        return deleted
+    
     def get_by_email(self, email: str) -> Optional[UserModel]:
         """Get user by email."""
         return self.db.query(UserModel).filter(UserModel.email == email).first()
@@ -33,5 +82,47 @@ class UserRepository(BaseRepository[UserModel]):
         ).offset(skip).limit(limit).all()
 
 
+class AsyncUserRepository(AsyncBaseRepository[UserModel]):
+    """User repository implementation on an async session."""
+    
+    # Routes check current_user.author for author permissions
+    load_options = (selectinload(UserModel.author),)
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, UserModel)
+    
+    async def get_principal(self, user_id: int) -> Optional[UserModel]:
+        """Get a user for authentication, from the principal cache when possible.
+        
+        The cache holds column values, not ORM objects; each hit builds a new
+        detached user that is merged into this session without a query.
+        """
+        snapshot = principal_cache.get(user_id)
+        if snapshot is not None:
+            return await self.db.merge(_principal_from_snapshot(snapshot), load=False)
+        
+        user = await self.get_by_id(user_id)
+        if user is not None:
+            principal_cache.set(user_id, _principal_snapshot(user))
+        return user
+    
+    async def update(self, entity: UserModel) -> UserModel:
+        """Update a user and drop its cached principal."""
+        entity = await super().update(entity)
+        principal_cache.invalidate(entity.id)
+        return entity
+    
+    async def delete(self, id: int) -> bool:
+        """Delete a user and drop its cached principal."""
+        deleted = await super().delete(id)
+        principal_cache.invalidate(id)
+        return deleted
+    
+    async def get_by_email(self, email: str) -> Optional[UserModel]:
+        """Get user by email."""
+        result = await self.db.execute(self.select().filter(UserModel.email == email))
+        return result.scalars().first()
+
+
 
 
@@ -1,20 +1,213 @@
 """
-Database connection - Thread-safe connection manager
+Database connection - Thread-safe connection pool manager with request-scoped unit of work
 """
 import pymysql
+from collections import deque
 from contextlib import contextmanager
+from flask import g, has_request_context, current_app, jsonify, request
 from config import config
+from app.instrumentation import query_instrumentation
 import logging
 import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the checkout timeout"""
+    pass
+
+
+class _PoolEntry:
+    """Pooled connection together with its creation time"""
+    __slots__ = ('connection', 'created_at')
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+
+
+class ConnectionPool:
+    """Bounded connection pool with overflow, checkout timeout, pre-ping and recycling"""
+    
+    def __init__(self, creator, pool_size=5, max_overflow=10, timeout=30,
+                 recycle=3600, pre_ping=True):
+        self._creator = creator
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self._idle = deque()
+        self._total = 0  # Open connections, idle and checked out
+        self._cond = threading.Condition()
+    
+    def checkout(self):
+        """Take a healthy connection from the pool, opening one if allowed"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    # LIFO keeps the most recently used (warmest) connections in rotation
+                    entry = self._idle.pop()
+                    break
+                if self._total < self.pool_size + self.max_overflow:
+                    self._total += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"Connection pool exhausted (size={self.pool_size}, "
+                        f"overflow={self.max_overflow}), timed out after {self.timeout}s"
+                    )
+                self._cond.wait(remaining)
+        
+        if entry is None:
+            return self._open()
+        return self._validate(entry)
+    
+    def checkin(self, entry, discard=False):
+        """Return a connection to the pool; broken or surplus connections are closed"""
+        if not discard:
+            try:
+                discard = not entry.connection.open
+            except Exception:
+                discard = True
+        
+        with self._cond:
+            if not discard and len(self._idle) < self.pool_size:
+                self._idle.append(entry)
+                self._cond.notify()
+                return
+            self._total -= 1
+            self._cond.notify()
+        self._close(entry)
+    
+    def dispose(self):
+        """Close all idle connections"""
+        with self._cond:
+            entries = list(self._idle)
+            self._idle.clear()
+            self._total -= len(entries)
+            self._cond.notify_all()
+        for entry in entries:
+            self._close(entry)
+    
+    def status(self):
+        """Snapshot of pool usage"""
+        with self._cond:
+            idle = len(self._idle)
+            total = self._total
+        return {
+            'pool_size': self.pool_size,
+            'max_overflow': self.max_overflow,
+            'open': total,
+            'idle': idle,
+            'checked_out': total - idle,
+            'overflow': max(0, total - self.pool_size)
+        }
+    
+    def _open(self):
+        """Open a new connection for a slot already reserved in _total"""
+        try:
+            return _PoolEntry(self._creator())
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+    
+    def _validate(self, entry):
+        """Recycle connections past max lifetime and replace ones that fail a ping"""
+        if self.recycle and time.monotonic() - entry.created_at > self.recycle:
+            logger.debug("Recycling pooled connection past max lifetime")
+            self._close(entry)
+            return self._open()
+        
+        if self.pre_ping:
+            try:
+                entry.connection.ping(reconnect=False)
+            except Exception:
+                logger.debug("Pooled connection failed health check, reconnecting")
+                self._close(entry)
+                return self._open()
+        return entry
+    
+    @staticmethod
+    def _close(entry):
+        try:
+            entry.connection.close()
+        except:
+            pass
+
+
+class _InstrumentedCursor(pymysql.cursors.DictCursor):
+    """DictCursor reporting each statement and its duration to the query instrumentation"""
+    
+    def execute(self, query, args=None):
+        if not query_instrumentation.enabled:
+            return super().execute(query, args)
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, args)
+        except Exception:
+            query_instrumentation.record_query(self, query, args, time.perf_counter() - started, failed=True)
+            raise
+        query_instrumentation.record_query(self, query, args, time.perf_counter() - started)
+        return result
+
+
+class _SavepointCursor(_InstrumentedCursor):
+    """Cursor that marks a savepoint before the first write of its block.
+    
+    The savepoint is only needed when earlier blocks already wrote to the
+    transaction; otherwise a failing block can simply roll everything back.
+    """
+    unit_of_work = None
+    savepoint = None
+    _savepoint_set = False
+    _first_write = False
+    
+    def execute(self, query, args=None):
+        uow = self.unit_of_work
+        if uow is not None and not (self._savepoint_set or self._first_write) and _is_write(query):
+            if uow.dirty:
+                self._savepoint_set = True
+                super().execute(f"SAVEPOINT {self.savepoint}")
+            else:
+                self._first_write = True
+                uow.dirty = True
+        return super().execute(query, args)
+
+
+def _is_write(query):
+    """Whether a statement can modify data (anything except plain reads)"""
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    head = query.lstrip().split(None, 1)[0].upper() if query.strip() else ''
+    return head not in ('SELECT', 'SHOW', 'EXPLAIN', 'DESCRIBE', 'WITH')
+
+
+class _UnitOfWork:
+    """Connection and transaction shared by every get_cursor() block of one request"""
+    __slots__ = ('entry', 'savepoints', 'dirty', 'rollback_only', 'broken', 'after_commit')
+    
+    def __init__(self, entry):
+        self.entry = entry
+        self.savepoints = 0
+        self.dirty = False
+        self.rollback_only = False
+        self.broken = False
+        self.after_commit = []
+
+
 class DatabaseConnection:
-    """Thread-safe database connection manager"""
+    """Thread-safe database connection manager backed by a connection pool"""
     _instance = None
     _lock = threading.Lock()
-    _local = threading.local()
+    _pool = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -24,30 +217,31 @@ class DatabaseConnection:
         return cls._instance
     
     def __init__(self):
-        # Don't connect on initialization - connect lazily when needed
+        # Don't connect on initialization - the pool opens connections lazily
         pass
     
-    def _get_thread_connection(self):
-        """Get or create connection for current thread"""
-        if not hasattr(self._local, 'connection') or self._local.connection is None:
-            self._local.connection = self._create_connection()
-        elif not self._local.connection.open:
-            try:
-                self._local.connection.close()
-            except:
-                pass
-            self._local.connection = self._create_connection()
-        else:
-            # Test connection is alive
-            try:
-                self._local.connection.ping()
-            except:
-                try:
-                    self._local.connection.close()
-                except:
-                    pass
-                self._local.connection = self._create_connection()
-        return self._local.connection
+    def init_app(self, app):
+        """Bind a unit of work to each request: one connection and transaction, committed before the response is sent"""
+        app.extensions['database'] = self
+        app.before_request(self._begin_unit_of_work)
+        app.after_request(self._commit_unit_of_work)
+        app.teardown_request(self._end_unit_of_work)
+    
+    @property
+    def pool(self):
+        """Process-wide connection pool, created on first use"""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    DatabaseConnection._pool = ConnectionPool(
+                        self._create_connection,
+                        pool_size=config.DB_POOL_SIZE,
+                        max_overflow=config.DB_POOL_MAX_OVERFLOW,
+                        timeout=config.DB_POOL_TIMEOUT,
+                        recycle=config.DB_POOL_RECYCLE,
+                        pre_ping=config.DB_POOL_PRE_PING
+                    )
+        return self._pool
     
     def _create_connection(self):
         """Create a new database connection"""
@@ -59,42 +253,63 @@ class DatabaseConnection:
                 password=config.DB_PASSWORD,
                 database=config.DB_NAME,
                 charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor,
+                cursorclass=_InstrumentedCursor,
                 autocommit=False,
                 connect_timeout=10,
                 read_timeout=30,
                 write_timeout=30
             )
-            logger.debug("Database connection established for thread")
+            logger.debug("Database connection established for pool")
             return conn
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             raise
     
+    @contextmanager
     def get_connection(self):
-        """Get database connection for current thread"""
-        return self._get_thread_connection()
+        """Context manager that checks a connection out of the pool and returns it afterwards"""
+        entry = self._checkout()
+        discard = False
+        try:
+            yield entry.connection
+        except pymysql.err.OperationalError:
+            discard = True
+            raise
+        finally:
+            self.pool.checkin(entry, discard=discard)
     
     @contextmanager
     def get_cursor(self):
-        """Context manager for database cursor - creates new connection per operation"""
-        conn = None
+        """Context manager for database cursor.
+        
+        Inside a request every block shares the request's connection and transaction;
+        a failing block is rolled back to its savepoint. Outside a request each block
+        gets its own pooled connection and transaction.
+        """
+        uow = self._current_unit_of_work()
+        if uow is not None:
+            with self._unit_of_work_cursor(uow) as cursor:
+                yield cursor
+            return
+        
+        entry = self._checkout()
+        conn = entry.connection
         cursor = None
+        discard = False
         
         try:
-            # Create a fresh connection for each cursor operation to avoid packet sequence errors
-            conn = self._create_connection()
             cursor = conn.cursor()
             
             try:
                 yield cursor
                 conn.commit()
             except Exception as e:
-                if conn:
-                    try:
-                        conn.rollback()
-                    except:
-                        pass
+                if isinstance(e, pymysql.err.OperationalError):
+                    discard = True
+                try:
+                    conn.rollback()
+                except:
+                    discard = True
                 raise
         finally:
             if cursor:
@@ -102,25 +317,150 @@ class DatabaseConnection:
                     cursor.close()
                 except:
                     pass
-            if conn:
+            self.pool.checkin(entry, discard=discard)
+    
+    def _checkout(self):
+        """Check a connection out of the pool, accounting the wait to the current request"""
+        started = time.perf_counter()
+        entry = self.pool.checkout()
+        query_instrumentation.record_connect(time.perf_counter() - started)
+        return entry
+    
+    def on_commit(self, callback):
+        """Run callback once the current request transaction commits.
+        
+        Outside a request each get_cursor() block commits on its own, so the
+        callback runs immediately. Call it after the writing block has finished.
+        """
+        uow = self._current_unit_of_work(start=False)
+        if uow is None:
+            callback()
+        else:
+            uow.after_commit.append(callback)
+    
+    def _current_unit_of_work(self, start=True):
+        """Unit of work of the current request, started on first use; None outside requests"""
+        if not has_request_context() or current_app.extensions.get('database') is not self:
+            return None
+        if g.get('_db_unit_of_work_closed'):
+            # Teardown callbacks run on their own connections
+            return None
+        uow = g.get('_db_unit_of_work')
+        if uow is None and start:
+            uow = _UnitOfWork(self._checkout())
+            g._db_unit_of_work = uow
+        return uow
+    
+    @contextmanager
+    def _unit_of_work_cursor(self, uow):
+        """Cursor on the request connection; nested blocks reuse the same transaction"""
+        uow.savepoints += 1
+        cursor = uow.entry.connection.cursor(_SavepointCursor)
+        cursor.unit_of_work = uow
+        cursor.savepoint = f"uow_sp_{uow.savepoints}"
+        try:
+            yield cursor
+        except Exception as e:
+            if isinstance(e, pymysql.err.OperationalError):
+                # Deadlocks and lost connections abort the whole transaction
+                uow.rollback_only = True
+                uow.broken = True
+            else:
                 try:
-                    conn.close()
-                except:
-                    pass
+                    if cursor._savepoint_set:
+                        cursor.execute(f"ROLLBACK TO SAVEPOINT {cursor.savepoint}")
+                    elif cursor._first_write:
+                        uow.entry.connection.rollback()
+                        uow.dirty = False
+                except Exception:
+                    uow.rollback_only = True
+            raise
+        finally:
+            try:
+                cursor.close()
+            except:
+                pass
     
-    def close(self):
-        """Close database connection for current thread"""
-        if hasattr(self._local, 'connection') and self._local.connection:
+    def _begin_unit_of_work(self):
+        """Reset per-request state in case the app context outlives a request"""
+        g.pop('_db_unit_of_work_closed', None)
+    
+    def _commit_unit_of_work(self, response):
+        """Commit the request transaction before the response goes out.
+        
+        Server errors roll the transaction back instead. A failing commit
+        (deadlock, lock wait timeout, lost connection) replaces the response
+        with a 500, and so does a transaction with writes that had to be rolled
+        back even though the handler caught the error, so clients never see
+        success for writes that were lost.
+        """
+        uow = g.pop('_db_unit_of_work', None)
+        g._db_unit_of_work_closed = True
+        if uow is None:
+            return response
+        lost_writes = uow.rollback_only and uow.dirty and response.status_code < 500
+        if response.status_code >= 500:
+            uow.rollback_only = True
+        
+        if self._finish_unit_of_work(uow, commit=not uow.rollback_only) is False or lost_writes:
+            if lost_writes:
+                logger.error(f"Rolled back writes of {request.method} {request.path} after a caught database error")
+            response = jsonify({'error': 'Failed to save changes. Please try again.'})
+            response.status_code = 500
+        return response
+    
+    def _end_unit_of_work(self, exc=None):
+        """Backstop for requests that never reached after_request: roll back and return the connection"""
+        uow = g.pop('_db_unit_of_work', None)
+        g._db_unit_of_work_closed = True
+        if uow is not None:
+            self._finish_unit_of_work(uow, commit=False)
+    
+    def _finish_unit_of_work(self, uow, commit):
+        """Commit or roll back and return the connection to the pool.
+        
+        Returns True when committed (after-commit callbacks have run), False when
+        the commit failed, None when the transaction was rolled back on purpose.
+        """
+        conn = uow.entry.connection
+        discard = uow.broken
+        committed = None
+        try:
+            if commit:
+                committed = False
+                started = time.perf_counter()
+                try:
+                    conn.commit()
+                finally:
+                    if query_instrumentation.enabled:
+                        query_instrumentation.record_query(None, 'COMMIT', None, time.perf_counter() - started)
+                committed = True
+            else:
+                conn.rollback()
+        except Exception as e:
+            logger.error(f"Failed to finish request transaction: {e}")
+            discard = True
             try:
-                if self._local.connection.open:
-                    self._local.connection.close()
-                    logger.debug("Database connection closed for thread")
+                conn.rollback()
             except:
                 pass
-            finally:
-                self._local.connection = None
+        finally:
+            self.pool.checkin(uow.entry, discard=discard)
+        
+        if committed:
+            for callback in uow.after_commit:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"After-commit callback failed: {e}", exc_info=True)
+        return committed
+    
+    def close(self):
+        """Close all idle pooled connections"""
+        if self._pool is not None:
+            self._pool.dispose()
+            logger.debug("Database connection pool disposed")
 
 
 # Global database instance
 db = DatabaseConnection()
-
@@ -0,0 +1,79 @@
+"""
+Feed cache - serialized anonymous feed pages, invalidated by a generation counter
+"""
+from app.cache import TTLCache, SingleFlight
+from config import config
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """Caches rendered feed pages by their filters.
+    
+    Keys are prefixed with a generation that invalidate() bumps whenever
+    articles or categories change, so pages rendered before a write are never
+    served after it, even when their query was still running. Pages also
+    expire after ttl seconds, which bounds staleness of view and like counts
+    and of writes made by other processes. Concurrent misses for the same page
+    are coalesced so only one of them queries the database.
+    """
+    
+    def __init__(self, max_size=1000, ttl=30.0, enabled=True):
+        self.enabled = enabled
+        self._pages = TTLCache(max_size=max_size, default_ttl=ttl)
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {'loads': 0, 'coalesced': 0, 'invalidations': 0}
+    
+    def get_or_load(self, key, loader):
+        """Cached page for key, calling loader() on a miss"""
+        if not self.enabled:
+            return loader()
+        
+        generation_key = (self._generation,) + tuple(key)
+        page = self._pages.get(generation_key)
+        if page is not None:
+            return page
+        
+        page, shared = self._flights.do(generation_key, lambda: self._load(generation_key, loader))
+        if shared:
+            with self._lock:
+                self._stats['coalesced'] += 1
+        return page
+    
+    def invalidate(self):
+        """Drop all pages; called after article and category writes commit"""
+        with self._lock:
+            self._generation += 1
+            self._stats['invalidations'] += 1
+        self._pages.clear()
+    
+    def stats(self):
+        """Generation, page cache and coalescing counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['generation'] = self._generation
+        stats['enabled'] = self.enabled
+        stats['pages'] = self._pages.stats()
+        return stats
+    
+    def _load(self, generation_key, loader):
+        page = loader()
+        with self._lock:
+            self._stats['loads'] += 1
+            current = generation_key[0] == self._generation
+        # A page loaded across an invalidation may predate the write; let it go
+        if current:
+            self._pages.set(generation_key, page)
+        return page
+
+
+# Global feed cache instance
+feed_cache = FeedCache(
+    max_size=config.FEED_CACHE_SIZE,
+    ttl=config.FEED_CACHE_TTL,
+    enabled=config.FEED_CACHE_ENABLED
+)
@@ -0,0 +1,253 @@
+"""
+Query instrumentation - per-request statement counts, timings, fingerprints and slow query log
+"""
+from collections import deque
+from functools import lru_cache
+from flask import g, has_request_context, request
+from config import config
+import logging
+import pymysql
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_COMMENTS = re.compile(r'/\*.*?\*/|--[^\n]*', re.S)
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDERS = re.compile(r'%\(\w+\)s|%s')
+_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)|(?<=\bIN)\s*\(\s*\?\s*\)', re.I)
+_ROWS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_SPACES = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(query):
+    """Normalized form of a statement: literals and placeholders become ?, lists collapse to (...)"""
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    sql = _COMMENTS.sub(' ', query)
+    sql = _STRINGS.sub('?', sql)
+    sql = _PLACEHOLDERS.sub('?', sql)
+    sql = _NUMBERS.sub('?', sql)
+    sql = _LISTS.sub(' (...)', sql)
+    sql = _ROWS.sub('(...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+class RequestQueries:
+    """Statements issued while serving one request"""
+    __slots__ = ('statements', 'db_time', 'connect_time', 'fingerprints', 'slow')
+    
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.connect_time = 0.0
+        self.fingerprints = {}  # fingerprint -> [count, seconds]
+        self.slow = []
+    
+    def record(self, sql_fingerprint, elapsed):
+        self.statements += 1
+        self.db_time += elapsed
+        entry = self.fingerprints.get(sql_fingerprint)
+        if entry is None:
+            self.fingerprints[sql_fingerprint] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+    
+    def repeated(self, threshold):
+        """Fingerprints run at least threshold times: likely N+1 loops"""
+        return sorted(
+            ((fp, entry[0]) for fp, entry in self.fingerprints.items() if entry[0] >= threshold),
+            key=lambda item: -item[1]
+        )
+    
+    def server_timing(self):
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} queries", '
+            f'db-connect;dur={self.connect_time * 1000:.2f}'
+        )
+    
+    def to_dict(self, threshold):
+        fingerprints = sorted(self.fingerprints.items(), key=lambda item: -item[1][1])
+        return {
+            'statements': self.statements,
+            'db_ms': round(self.db_time * 1000, 2),
+            'connect_ms': round(self.connect_time * 1000, 2),
+            'fingerprints': [
+                {'fingerprint': fp, 'count': count, 'total_ms': round(seconds * 1000, 2)}
+                for fp, (count, seconds) in fingerprints
+            ],
+            'repeated': [{'fingerprint': fp, 'count': count} for fp, count in self.repeated(threshold)],
+            'slow': self.slow
+        }
+
+
+class QueryInstrumentation:
+    """Collects statement counts and timings per request and process-wide.
+    
+    Every cursor handed out by db.get_cursor() reports its statements here.
+    Each response gets a Server-Timing header with the request's database time,
+    statement count and connection checkout time; fingerprints run at least
+    repeat_warning times in one request are logged as possible N+1 patterns.
+    Statements slower than slow_ms go to the slow query log, SELECTs with a
+    sampled EXPLAIN plan. The last history requests are kept for inspection.
+    """
+    
+    # Process-wide fingerprint totals stop growing past this many entries
+    MAX_FINGERPRINTS = 1000
+    
+    def __init__(self, enabled=True, slow_ms=200, explain_sample_rate=0.1, repeat_warning=10, history=100):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.repeat_warning = repeat_warning
+        self._lock = threading.Lock()
+        self._requests = deque(maxlen=history)
+        self._slow = deque(maxlen=history)
+        self._totals = {}  # fingerprint -> [count, seconds]
+    
+    def init_app(self, app):
+        app.extensions['query_instrumentation'] = self
+        app.before_request(self._begin_request)
+        app.after_request(self._finish_request)
+    
+    def current(self):
+        """Statements of the current request, or None outside a request"""
+        if not has_request_context():
+            return None
+        return g.get('_request_queries')
+    
+    def record_query(self, cursor, query, args, elapsed, failed=False):
+        """Account one executed statement; called by the instrumented cursors"""
+        sql_fingerprint = fingerprint(query)
+        current = self.current()
+        if current is not None:
+            current.record(sql_fingerprint, elapsed)
+        
+        with self._lock:
+            entry = self._totals.get(sql_fingerprint)
+            if entry is not None:
+                entry[0] += 1
+                entry[1] += elapsed
+            elif len(self._totals) < self.MAX_FINGERPRINTS:
+                self._totals[sql_fingerprint] = [1, elapsed]
+        
+        if elapsed * 1000 >= self.slow_ms and not failed:
+            self._record_slow(cursor, query, args, sql_fingerprint, elapsed, current)
+    
+    def record_connect(self, elapsed):
+        """Account time spent checking a connection out of the pool (including opening it)"""
+        current = self.current()
+        if current is not None:
+            current.connect_time += elapsed
+    
+    def recent_requests(self, limit=20):
+        with self._lock:
+            return list(self._requests)[-limit:][::-1]
+    
+    def slow_queries(self, limit=20):
+        with self._lock:
+            return list(self._slow)[-limit:][::-1]
+    
+    def top_fingerprints(self, limit=20, order='total_ms'):
+        """Process-wide fingerprints ordered by total time or count"""
+        with self._lock:
+            totals = [(fp, count, seconds) for fp, (count, seconds) in self._totals.items()]
+        key = (lambda item: -item[1]) if order == 'count' else (lambda item: -item[2])
+        return [
+            {
+                'fingerprint': fp,
+                'count': count,
+                'total_ms': round(seconds * 1000, 2),
+                'mean_ms': round(seconds * 1000 / count, 3)
+            }
+            for fp, count, seconds in sorted(totals, key=key)[:limit]
+        ]
+    
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._slow.clear()
+            self._totals.clear()
+    
+    def settings(self):
+        return {
+            'enabled': self.enabled,
+            'slow_ms': self.slow_ms,
+            'explain_sample_rate': self.explain_sample_rate,
+            'repeat_warning': self.repeat_warning
+        }
+    
+    def _begin_request(self):
+        if self.enabled:
+            g._request_queries = RequestQueries()
+    
+    def _finish_request(self, response):
+        current = g.pop('_request_queries', None)
+        if current is None:
+            return response
+        response.headers.add('Server-Timing', current.server_timing())
+        
+        for sql_fingerprint, count in current.repeated(self.repeat_warning):
+            logger.warning(f"{count} x same query in {request.method} {request.path}: {sql_fingerprint}")
+        
+        entry = current.to_dict(self.repeat_warning)
+        entry.update({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'at': time.time()
+        })
+        with self._lock:
+            self._requests.append(entry)
+        return response
+    
+    def _record_slow(self, cursor, query, args, sql_fingerprint, elapsed, current):
+        path = f"{request.method} {request.path}" if has_request_context() else None
+        entry = {
+            'fingerprint': sql_fingerprint,
+            'ms': round(elapsed * 1000, 2),
+            'path': path,
+            'at': time.time(),
+            'explain': None
+        }
+        if sql_fingerprint.upper().startswith('SELECT') and random.random() < self.explain_sample_rate:
+            entry['explain'] = self._explain(cursor, query, args)
+        
+        logger.warning(f"Slow query ({entry['ms']:.0f} ms){' in ' + path if path else ''}: {sql_fingerprint}")
+        if entry['explain']:
+            logger.warning(f"EXPLAIN: {entry['explain']}")
+        if current is not None:
+            current.slow.append(entry)
+        with self._lock:
+            self._slow.append(entry)
+    
+    @staticmethod
+    def _explain(cursor, query, args):
+        """Plan of a statement on the cursor's connection; results are buffered so this is safe"""
+        try:
+            # A plain DictCursor: the EXPLAIN itself is not instrumented
+            explain_cursor = cursor.connection.cursor(pymysql.cursors.DictCursor)
+            try:
+                explain_cursor.execute('EXPLAIN ' + query, args)
+                return explain_cursor.fetchall()
+            finally:
+                explain_cursor.close()
+        except Exception as e:
+            logger.debug(f"EXPLAIN failed: {e}")
+            return None
+
+
+# Global query instrumentation instance
+query_instrumentation = QueryInstrumentation(
+    enabled=config.QUERY_INSTRUMENTATION_ENABLED,
+    slow_ms=config.SLOW_QUERY_MS,
+    explain_sample_rate=config.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    repeat_warning=config.QUERY_REPEAT_WARNING,
+    history=config.QUERY_DEBUG_HISTORY
+)
@@ -1,6 +1,8 @@
 """FastAPI main application."""
-from fastapi import FastAPI
+import os
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from app.api.routes import (
     auth_router,
     users_router,
@@ -9,11 +11,19 @@ from app.api.routes import (
     notifications_router,
     admin_router,
 )
+from app.api.middleware.metrics import MetricsMiddleware, track_in_flight
+from app.core.utils.database import DatabaseConnection
+from app.dal.repositories.category_repository import category_catalog
+from app.dal.repositories.user_repository import principal_cache
+from app.metrics import MetricsRegistry, cache_hit_ratio, CONTENT_TYPE
+from app.passwords import password_hasher
 
 app = FastAPI(
     title="Online News Portal API",
     description="Full-stack news portal application",
-    version="1.0.0"
+    version="1.0.0",
+    # Requests in flight per route for /metrics
+    dependencies=[Depends(track_in_flight)]
 )
 
 # CORS middleware
@@ -23,8 +33,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
+# Request metrics, served at /metrics
+metrics = MetricsRegistry(enabled=os.getenv("METRICS_ENABLED", "True").lower() == "true")
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
 # Include routers
 app.include_router(auth_router, prefix="/api")
 app.include_router(users_router, prefix="/api")
@@ -42,9 +57,35 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Health check endpoint; reports this worker's category catalog version."""
+    return {"status": "healthy", "category_catalog_version": category_catalog.stats().get("version")}
+
+
+def _pool_connections():
+    """Connections of the sync and (once created) async engine pools by state."""
+    engines = {"sync": DatabaseConnection().get_engine()}
+    if DatabaseConnection._async_engine is not None:
+        engines["async"] = DatabaseConnection._async_engine.sync_engine
+    samples = []
+    for name, engine in engines.items():
+        pool = engine.pool
+        samples.append(({"engine": name, "state": "checked_out"}, pool.checkedout()))
+        samples.append(({"engine": name, "state": "idle"}, pool.checkedin()))
+        samples.append(({"engine": name, "state": "overflow"}, max(0, pool.overflow())))
+    return samples
 
 
+metrics.gauge("db_pool_connections", "Database connections by engine and state", _pool_connections)
+metrics.gauge("cache_hit_ratio", "Hits per lookup since start",
+              lambda: [({"cache": "principal"}, cache_hit_ratio(principal_cache.stats()))])
+metrics.gauge("cache_entries", "Cached entries", lambda: [({"cache": "principal"}, len(principal_cache))])
+metrics.gauge("category_catalog_entries", "Categories in the in-memory catalog",
+              lambda: category_catalog.stats().get("categories"))
+metrics.gauge("password_hash_queue_depth", "Password checks waiting for a hashing worker",
+              lambda: password_hasher.stats()["queue_depth"])
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request and subsystem metrics in Prometheus text format."""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,223 @@
+"""
+Metrics - request latency histograms, status counters and gauges in Prometheus text format
+"""
+from bisect import bisect_left
+from config import config
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# Methods recorded under their own name; anything else a client sends is counted as OTHER
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+
+class RouteSeries:
+    """Counters of one route and method, shared by every request thread"""
+    __slots__ = ('buckets', 'sum', 'count', 'in_flight', 'statuses')
+    
+    def __init__(self, bucket_count):
+        self.buckets = [0] * (bucket_count + 1)  # The last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.in_flight = 0
+        self.statuses = {}
+    
+    def merge(self, other):
+        for i, value in enumerate(list(other.buckets)):
+            self.buckets[i] += value
+        self.sum += other.sum
+        self.count += other.count
+        self.in_flight += other.in_flight
+        # Request threads may add a status while this runs; copy the items first
+        for status, value in list(other.statuses.items()):
+            self.statuses[status] = self.statuses.get(status, 0) + value
+
+
+class MetricsRegistry:
+    """Request metrics and gauges of one application.
+    
+    There is one series per route and method, created the first time the pair
+    is seen; routes come from the URL map and unknown methods share one
+    series, so the set is bounded. Recording a request looks its series up
+    and bumps plain ints: no lock and no new objects, whatever the server's
+    thread model (werkzeug's threaded server starts a thread per request).
+    Concurrent increments rely on the GIL and may very rarely lose a count,
+    which is acceptable for monitoring.
+    
+    Gauges are callbacks run at scrape time; each returns a number or a list
+    of (labels dict, value) pairs.
+    """
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS, enabled=True):
+        self.buckets = tuple(buckets)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._routes = {}  # route -> method -> RouteSeries
+        self._gauges = []
+    
+    def series(self, route, method):
+        """Series for route and method"""
+        if method not in METHODS:
+            method = 'OTHER'
+        methods = self._routes.get(route)
+        series = methods.get(method) if methods is not None else None
+        if series is None:
+            series = self._add_series(route, method)
+        return series
+    
+    def observe(self, series, elapsed, status):
+        """Record one finished request on series"""
+        series.buckets[bisect_left(self.buckets, elapsed)] += 1
+        series.sum += elapsed
+        series.count += 1
+        series.statuses[status] = series.statuses.get(status, 0) + 1
+    
+    def gauge(self, name, help_text, fn, metric_type='gauge'):
+        """Register a callback evaluated at scrape time"""
+        self._gauges.append((name, help_text, metric_type, fn))
+    
+    def init_app(self, app):
+        """Time every request of a Flask app"""
+        from flask import g, request
+        
+        def begin():
+            rule = request.url_rule
+            series = self.series(rule.rule if rule is not None else 'unmatched', request.method)
+            series.in_flight += 1
+            g._metrics_series = series
+            g._metrics_started = time.perf_counter()
+        
+        def finish(response):
+            series = g.get('_metrics_series')
+            if series is not None:
+                self.observe(series, time.perf_counter() - g._metrics_started, response.status_code)
+            return response
+        
+        def teardown(exc=None):
+            series = g.pop('_metrics_series', None)
+            if series is not None:
+                series.in_flight -= 1
+        
+        if self.enabled:
+            app.before_request(begin)
+            app.after_request(finish)
+            app.teardown_request(teardown)
+        app.extensions['metrics'] = self
+    
+    def collect(self):
+        """route -> method -> RouteSeries copied from the live series"""
+        with self._lock:
+            routes = [(route, list(methods.items())) for route, methods in self._routes.items()]
+        totals = {}
+        for route, methods in routes:
+            for method, series in methods:
+                total = totals.setdefault(route, {})[method] = RouteSeries(len(self.buckets))
+                total.merge(series)
+        return totals
+    
+    def render(self):
+        """Prometheus text exposition of request metrics and gauges"""
+        lines = []
+        totals = self.collect()
+        series_list = [
+            (route, method, series)
+            for route, methods in sorted(totals.items())
+            for method, series in sorted(methods.items())
+        ]
+        
+        lines.append('# HELP http_requests_total Finished requests by route, method and status')
+        lines.append('# TYPE http_requests_total counter')
+        for route, method, series in series_list:
+            for status, value in sorted(series.statuses.items()):
+                labels = _labels({'route': route, 'method': method, 'status': status})
+                lines.append(f'http_requests_total{labels} {value}')
+        
+        lines.append('# HELP http_requests_in_flight Requests being served')
+        lines.append('# TYPE http_requests_in_flight gauge')
+        for route, method, series in series_list:
+            lines.append(f"http_requests_in_flight{_labels({'route': route, 'method': method})} {series.in_flight}")
+        
+        lines.append('# HELP http_request_duration_seconds Request latency')
+        lines.append('# TYPE http_request_duration_seconds histogram')
+        for route, method, series in series_list:
+            if not series.count:
+                continue
+            cumulative = 0
+            for bound, value in zip(self.buckets + ('+Inf',), series.buckets):
+                cumulative += value
+                labels = _labels({'route': route, 'method': method, 'le': bound})
+                lines.append(f'http_request_duration_seconds_bucket{labels} {cumulative}')
+            labels = _labels({'route': route, 'method': method})
+            lines.append(f'http_request_duration_seconds_sum{labels} {series.sum:.6f}')
+            lines.append(f'http_request_duration_seconds_count{labels} {series.count}')
+        
+        for name, help_text, metric_type, fn in self._gauges:
+            try:
+                value = fn()
+            except Exception as e:
+                logger.warning(f"Metric {name} failed: {e}")
+                continue
+            if value is None:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            samples = value if isinstance(value, list) else [({}, value)]
+            for labels, sample in samples:
+                if sample is not None:
+                    lines.append(f'{name}{_labels(labels)} {_number(sample)}')
+        
+        return '\n'.join(lines) + '\n'
+    
+    def _add_series(self, route, method):
+        """Create the series of a route and method seen for the first time"""
+        with self._lock:
+            methods = self._routes.get(route)
+            if methods is None:
+                # Copy on write: readers never see a dict being resized
+                methods = {}
+            series = methods.get(method)
+            if series is None:
+                series = RouteSeries(len(self.buckets))
+                methods = dict(methods)
+                methods[method] = series
+                routes = dict(self._routes)
+                routes[route] = methods
+                self._routes = routes
+            return series
+
+
+def cache_hit_ratio(stats):
+    """Hit ratio from a TTLCache-style stats() dict, or None before the first lookup"""
+    lookups = stats.get('hits', 0) + stats.get('misses', 0)
+    return stats['hits'] / lookups if lookups else None
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return '{' + pairs + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+# Global metrics registry of the Flask app
+metrics = MetricsRegistry(enabled=config.METRICS_ENABLED)
@@ -15,11 +15,10 @@ def admin_required(f):
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user_repo = UserRepository()
-        user = user_repo.find_by_id(current_user_id)
+        # Cached role lookup: no user load on every request
+        principal = UserRepository().find_principal(get_jwt_identity())
         
-        if not user or user.role != 'admin':
+        if not principal or not principal['is_active'] or principal['role'] != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
         return f(*args, **kwargs)
@@ -32,11 +31,9 @@ def editor_required(f):
     @wraps(f)
     @jwt_required()
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user_repo = UserRepository()
-        user = user_repo.find_by_id(current_user_id)
+        principal = UserRepository().find_principal(get_jwt_identity())
         
-        if not user or user.role not in ['admin', 'editor']:
+        if not principal or not principal['is_active'] or principal['role'] not in ['admin', 'editor']:
             return jsonify({'error': 'Editor access required'}), 403
         
         return f(*args, **kwargs)
@@ -0,0 +1,118 @@
+"""
+HTTP cache middleware - conditional GET (ETag / Last-Modified) for read endpoints
+"""
+from functools import wraps
+from datetime import timezone
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from config import config
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def http_cache(max_age=None, validator=None, on_not_modified=None):
+    """Decorator adding ETag, Last-Modified, Cache-Control and 304 responses to a GET endpoint.
+    
+    validator(user_id, **view_kwargs) cheaply returns (version parts, last_modified)
+    for the resource, or None when it cannot tell; a matching If-None-Match or
+    If-Modified-Since then answers 304 without running the view, and
+    on_not_modified(user_id, **view_kwargs) keeps side effects such as view
+    counting. Without a validator the ETag is a hash of the response body.
+    
+    Anonymous responses are public for max_age seconds (config.HTTP_CACHE_MAX_AGE
+    by default, 0 = always revalidate); authenticated ones are private and always
+    revalidated. Both vary on Authorization.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not config.HTTP_CACHE_ENABLED:
+                return f(*args, **kwargs)
+            
+            user_id = _current_user_id()
+            etag = last_modified = None
+            
+            if validator is not None:
+                try:
+                    validated = validator(user_id, **kwargs)
+                except Exception as e:
+                    logger.warning(f"Cache validator for {f.__name__} failed: {e}")
+                    validated = None
+                if validated is not None:
+                    parts, last_modified = validated
+                    etag = _hash((f.__name__, user_id) + tuple(parts))
+                    if _not_modified(etag, last_modified):
+                        if on_not_modified is not None:
+                            on_not_modified(user_id, **kwargs)
+                        response = make_response('', 304)
+                        _set_headers(response, user_id, max_age, etag, last_modified)
+                        return response
+            
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            
+            _set_headers(response, user_id, max_age, etag or _hash(response.get_data()), last_modified)
+            return response.make_conditional(request)
+        
+        return decorated_function
+    
+    return decorator
+
+
+def _current_user_id():
+    """Identity of a valid JWT on the request, or None"""
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+    except Exception:
+        return None
+    if isinstance(user_id, str):
+        try:
+            return int(user_id)
+        except ValueError:
+            return None
+    return user_id
+
+
+def _hash(value):
+    """Strong validator: the same value always gives the same tag"""
+    data = value if isinstance(value, bytes) else repr(value).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def _http_date(value):
+    """Naive database timestamps are local time; HTTP dates are UTC, in whole seconds"""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _not_modified(etag, last_modified):
+    """Whether the request's validators match; If-None-Match takes precedence (RFC 9110)"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return _http_date(last_modified) <= request.if_modified_since
+    return False
+
+
+def _set_headers(response, user_id, max_age, etag, last_modified):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    
+    if user_id is None:
+        max_age = config.HTTP_CACHE_MAX_AGE if max_age is None else max_age
+        response.cache_control.public = True
+        if max_age > 0:
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+    else:
+        # Bodies include per-user state (saved, liked, premium): never shared, always revalidated
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    response.vary.add('Authorization')
@@ -0,0 +1,13 @@
+-- Composite indexes for article listings and search (bll ArticleService.search_articles)
+
+USE news_portal;
+
+-- Every listing filters on status and orders by published_at; the optional
+-- category, author and exclusive filters each get an index of their own.
+-- idx_status is a prefix of these indexes and is no longer needed.
+ALTER TABLE articles
+    ADD INDEX idx_status_published (status, published_at),
+    ADD INDEX idx_status_category_published (status, category_id, published_at),
+    ADD INDEX idx_status_author_published (status, author_id, published_at),
+    ADD INDEX idx_status_exclusive_published (status, is_exclusive, published_at),
+    DROP INDEX idx_status;
@@ -0,0 +1,27 @@
+-- Durable outbox for notification delivery (services/notification_outbox.py)
+--
+-- Creating a notification queues one row per delivery channel in the same
+-- transaction; notification_worker.py claims pending rows in batches,
+-- hands them to the channel's observers and retries failures with backoff.
+-- Apply to the database the API uses (DB_NAME).
+
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    notification_id INT,
+    user_id INT NOT NULL,
+    channel VARCHAR(20) NOT NULL,
+    payload JSON NOT NULL,
+    status ENUM('pending', 'processing', 'delivered', 'failed') NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    available_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(100),
+    locked_until DATETIME,
+    last_error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    delivered_at DATETIME,
+    -- Claims: pending rows of a channel that are due, oldest first
+    INDEX idx_outbox_claim (status, channel, available_at, id),
+    -- Lease expiry of rows held by crashed workers, and purging delivered rows
+    INDEX idx_outbox_status_locked (status, locked_until),
+    INDEX idx_outbox_status_delivered (status, delivered_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
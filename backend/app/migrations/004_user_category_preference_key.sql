@@ -0,0 +1,9 @@
+-- One preference row per user and category (services/recommendation_service.py)
+--
+-- record_views_batch() applies all preference increments of a view flush
+-- with a single INSERT ... ON DUPLICATE KEY UPDATE, which needs this key.
+-- Apply to the database the API uses (DB_NAME); merge duplicate rows first
+-- if any exist.
+
+ALTER TABLE user_preferences
+    ADD UNIQUE KEY unique_user_category (user_id, category_id);
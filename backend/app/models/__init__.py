@@ -1,6 +1,7 @@
 from .user import User
 from .article import Article
+from .article_summary import ArticleSummary
 from .category import Category
 
-__all__ = ['User', 'Article', 'Category']
+__all__ = ['User', 'Article', 'ArticleSummary', 'Category']
 
@@ -0,0 +1,92 @@
+"""
+Article summary model - compact article representation for lists
+"""
+from datetime import datetime
+
+
+class ArticleSummary:
+    """Article without its content, with author and category names.
+    
+    Feeds, search results, recommendations and admin lists return summaries;
+    only the article detail endpoint returns the full Article.
+    """
+    
+    def __init__(self, id=None, title=None, slug=None, excerpt=None, author_id=None,
+                 category_id=None, is_breaking=False, is_premium=False, status='draft',
+                 views_count=0, likes_count=0, published_at=None, created_at=None,
+                 updated_at=None, author_username=None, author_first_name=None,
+                 author_last_name=None, category_name=None, category_slug=None):
+        self.id = id
+        self.title = title
+        self.slug = slug
+        self.excerpt = excerpt
+        self.author_id = author_id
+        self.category_id = category_id
+        self.is_breaking = is_breaking
+        self.is_premium = is_premium
+        self.status = status
+        self.views_count = views_count
+        self.likes_count = likes_count
+        self.published_at = published_at
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.author_username = author_username
+        self.author_first_name = author_first_name
+        self.author_last_name = author_last_name
+        self.category_name = category_name
+        self.category_slug = category_slug
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'slug': self.slug,
+            'excerpt': self.excerpt,
+            'author_id': self.author_id,
+            'category_id': self.category_id,
+            'is_breaking': self.is_breaking,
+            'is_premium': self.is_premium,
+            'status': self.status,
+            'views_count': self.views_count,
+            'likes_count': self.likes_count,
+            'published_at': self.published_at.isoformat() if isinstance(self.published_at, datetime) else self.published_at,
+            'created_at': self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at,
+            'updated_at': self.updated_at.isoformat() if isinstance(self.updated_at, datetime) else self.updated_at,
+            'author': {
+                'id': self.author_id,
+                'username': self.author_username,
+                'first_name': self.author_first_name,
+                'last_name': self.author_last_name
+            } if self.author_username else None,
+            'category': {
+                'id': self.category_id,
+                'name': self.category_name,
+                'slug': self.category_slug
+            } if self.category_name else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Create ArticleSummary from a summary row"""
+        return cls(
+            id=data.get('id'),
+            title=data.get('title'),
+            slug=data.get('slug'),
+            excerpt=data.get('excerpt'),
+            author_id=data.get('author_id'),
+            category_id=data.get('category_id'),
+            is_breaking=data.get('is_breaking', False),
+            is_premium=data.get('is_premium', False),
+            status=data.get('status', 'draft'),
+            views_count=data.get('views_count', 0),
+            likes_count=data.get('likes_count', 0),
+            published_at=data.get('published_at'),
+            created_at=data.get('created_at'),
+            updated_at=data.get('updated_at'),
+            author_username=data.get('author_username'),
+            author_first_name=data.get('author_first_name'),
+            author_last_name=data.get('author_last_name'),
+            category_name=data.get('category_name'),
+            category_slug=data.get('category_slug')
+        )
@@ -2,7 +2,7 @@
 User model
 """
 from datetime import datetime
-import bcrypt
+from app.passwords import password_hasher
 
 
 class User:
@@ -24,14 +24,12 @@ class User:
     
     @staticmethod
     def hash_password(password):
-        """Hash password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """Hash password using bcrypt at the configured cost"""
+        return password_hasher.hash(password)
     
     def verify_password(self, password):
         """Verify password"""
-        if not self.password_hash:
-            return False
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.verify(password, self.password_hash)
     
     def to_dict(self):
         """Convert to dictionary"""
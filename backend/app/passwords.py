@@ -0,0 +1,128 @@
+"""
+Passwords - bcrypt hashing with a configurable cost on a bounded worker pool
+"""
+from concurrent.futures import ThreadPoolExecutor
+from config import config
+import asyncio
+import bcrypt
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password checks are already waiting for a worker"""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords with bcrypt at a configurable work factor.
+    
+    Hashes made with another cost keep verifying; verify_and_update() returns
+    a replacement hash for them so logins upgrade stored hashes transparently.
+    
+    Checks run on a pool of max_workers threads (bcrypt releases the GIL), so
+    a burst of logins occupies at most that many cores and request threads or
+    the event loop stay free for other requests. At most max_pending checks
+    may wait for a worker; beyond that callers get PasswordHasherBusy.
+    """
+    
+    def __init__(self, rounds=12, max_workers=4, max_pending=64):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hasher')
+        self._lock = threading.Lock()
+        self._submitted = 0  # queued or running
+        self._stats = {'hashed': 0, 'verified': 0, 'rehashed': 0, 'rejected': 0}
+    
+    def hash(self, password):
+        """bcrypt hash of password at the configured cost"""
+        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('utf-8')
+        self._count('hashed')
+        return password_hash
+    
+    def verify(self, password, password_hash):
+        """Whether password matches password_hash"""
+        if not password_hash:
+            return False
+        try:
+            matches = bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:
+            logger.warning("Unsupported password hash format")
+            return False
+        self._count('verified')
+        return matches
+    
+    def needs_rehash(self, password_hash):
+        """Whether password_hash was made with other bcrypt parameters than the configured ones"""
+        parts = password_hash.split('$')
+        return len(parts) < 4 or parts[1] != '2b' or parts[2] != f"{self.rounds:02d}"
+    
+    def verify_and_update(self, password, password_hash):
+        """(matches, new hash or None): the new hash replaces one made with old parameters"""
+        if not self.verify(password, password_hash):
+            return False, None
+        if not self.needs_rehash(password_hash):
+            return True, None
+        self._count('rehashed')
+        return True, self.hash(password)
+    
+    def submit(self, fn, *args):
+        """Run fn(*args) on the worker pool; raises PasswordHasherBusy when the queue is full"""
+        with self._lock:
+            if self._submitted >= self.max_workers + self.max_pending:
+                self._stats['rejected'] += 1
+                raise PasswordHasherBusy('Too many concurrent password checks')
+            self._submitted += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+    
+    def check(self, password, password_hash):
+        """verify_and_update() on the worker pool, waiting for the result"""
+        return self.submit(self.verify_and_update, password, password_hash).result()
+    
+    async def check_async(self, password, password_hash):
+        """verify_and_update() on the worker pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(self.verify_and_update, password, password_hash))
+    
+    def hash_in_pool(self, password):
+        """hash() on the worker pool, waiting for the result"""
+        return self.submit(self.hash, password).result()
+    
+    async def hash_async(self, password):
+        """hash() on the worker pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(self.hash, password))
+    
+    def stats(self):
+        """Cost, pool size, queue depth and counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            submitted = self._submitted
+        stats['rounds'] = self.rounds
+        stats['workers'] = self.max_workers
+        stats['max_pending'] = self.max_pending
+        stats['in_flight'] = submitted
+        stats['queue_depth'] = max(0, submitted - self.max_workers)
+        return stats
+    
+    def _release(self):
+        with self._lock:
+            self._submitted -= 1
+    
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    rounds=config.PASSWORD_HASH_ROUNDS,
+    max_workers=config.PASSWORD_HASH_WORKERS,
+    max_pending=config.PASSWORD_HASH_MAX_PENDING
+)
@@ -1,6 +1,7 @@
 from .user_repository import UserRepository
 from .article_repository import ArticleRepository
 from .category_repository import CategoryRepository
+from .comment_repository import CommentRepository
 
-__all__ = ['UserRepository', 'ArticleRepository', 'CategoryRepository']
+__all__ = ['UserRepository', 'ArticleRepository', 'CategoryRepository', 'CommentRepository']
 
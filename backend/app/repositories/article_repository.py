@@ -3,13 +3,30 @@ Article Repository - Repository Pattern
 """
 from app.database import db
 from app.models.article import Article
-from app.models.user import User
-from app.models.category import Category
+from app.models.article_summary import ArticleSummary
+from app.repositories.pagination import InvalidCursorError, keyset_condition
+from app.repositories.identity_map import current_identity_map
+from app.search import search_engine, SearchIndexNotReady
+from app.feed_cache import feed_cache
+from config import config
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# List projection: everything an ArticleSummary shows, without the content column
+SUMMARY_COLUMNS = """
+    a.id, a.title, a.slug, a.excerpt, a.author_id, a.category_id,
+    a.is_breaking, a.is_premium, a.status, a.views_count, a.likes_count,
+    a.published_at, a.created_at, a.updated_at,
+    u.username as author_username, u.first_name as author_first_name, u.last_name as author_last_name,
+    c.name as category_name, c.slug as category_slug
+"""
+SUMMARY_JOINS = """
+    LEFT JOIN users u ON a.author_id = u.id
+    LEFT JOIN categories c ON a.category_id = c.id
+"""
+
 
 class ArticleRepository:
     """Repository for article data access"""
@@ -32,43 +49,88 @@ class ArticleRepository:
                 article.is_premium, article.status, published_at
             ))
             article.id = cursor.lastrowid
-            return article
+        
+        db.on_commit(lambda: search_engine.refresh_article(article.id))
+        db.on_commit(feed_cache.invalidate)
+        return article
     
     def find_by_id(self, article_id, include_author=False, include_category=False):
         """Find article by ID"""
+        include = []
+        if include_author:
+            include.append('author')
+        if include_category:
+            include.append('category')
         try:
+            articles = self.find_by_ids([article_id], include=include)
+            return articles[0] if articles else None
+        except Exception as e:
+            logger.error(f"Error in find_by_id: {e}", exc_info=True)
+            raise
+    
+    def find_by_ids(self, article_ids, include=()):
+        """Find many articles in id order, with at most one query each for articles, authors and categories.
+        
+        include may name 'author' and/or 'category'. Objects already loaded in the
+        current request are reused from the identity map instead of being refetched.
+        """
+        identity_map = current_identity_map()
+        found, missing = identity_map.split(Article, article_ids)
+        
+        if missing:
             with db.get_cursor() as cursor:
-                sql = "SELECT * FROM articles WHERE id = %s"
-                cursor.execute(sql, (article_id,))
-                result = cursor.fetchone()
-                if not result:
-                    return None
-                
-                article = Article.from_dict(result)
-            
-            # Load author and category outside the cursor context to avoid nested context issues
-            if include_author and article.author_id:
+                placeholders = ','.join(['%s'] * len(missing))
+                sql = f"SELECT * FROM articles WHERE id IN ({placeholders})"
+                cursor.execute(sql, missing)
+                for row in cursor.fetchall():
+                    article = Article.from_dict(row)
+                    identity_map.add(Article, article.id, article)
+                    found[article.id] = article
+        
+        articles = []
+        seen = set()
+        for article_id in article_ids:
+            article = found.get(article_id)
+            if article is not None and article_id not in seen:
+                seen.add(article_id)
+                articles.append(article)
+        
+        if 'author' in include:
+            author_ids = [a.author_id for a in articles if a.author_id and a.author is None]
+            if author_ids:
                 try:
                     from app.repositories.user_repository import UserRepository
-                    user_repo = UserRepository()
-                    article.author = user_repo.find_by_id(article.author_id)
+                    authors = UserRepository().find_by_ids(author_ids)
+                    for article in articles:
+                        if article.author is None:
+                            article.author = authors.get(article.author_id)
                 except Exception as e:
-                    logger.warning(f"Failed to load author: {e}")
-                    article.author = None
-            
-            if include_category and article.category_id:
+                    logger.warning(f"Failed to load authors: {e}")
+        
+        if 'category' in include:
+            category_ids = [a.category_id for a in articles if a.category_id and a.category is None]
+            if category_ids:
                 try:
                     from app.repositories.category_repository import CategoryRepository
-                    category_repo = CategoryRepository()
-                    article.category = category_repo.find_by_id(article.category_id)
+                    categories = CategoryRepository().find_by_ids(category_ids)
+                    for article in articles:
+                        if article.category is None:
+                            article.category = categories.get(article.category_id)
                 except Exception as e:
-                    logger.warning(f"Failed to load category: {e}")
-                    article.category = None
-            
-            return article
-        except Exception as e:
-            logger.error(f"Error in find_by_id: {e}", exc_info=True)
-            raise
+                    logger.warning(f"Failed to load categories: {e}")
+        
+        return articles
+    
+    def find_summaries_by_ids(self, article_ids):
+        """Find many article summaries in id order with one query"""
+        if not article_ids:
+            return []
+        with db.get_cursor() as cursor:
+            placeholders = ','.join(['%s'] * len(article_ids))
+            sql = f"SELECT {SUMMARY_COLUMNS} FROM articles a {SUMMARY_JOINS} WHERE a.id IN ({placeholders})"
+            cursor.execute(sql, list(article_ids))
+            rows = {row['id']: row for row in cursor.fetchall()}
+        return [ArticleSummary.from_dict(rows[article_id]) for article_id in article_ids if article_id in rows]
     
     def find_by_slug(self, slug):
         """Find article by slug"""
@@ -94,24 +156,37 @@ class ArticleRepository:
                 article.category_id, article.is_breaking, article.is_premium,
                 article.status, published_at, datetime.now(), article.id
             ))
-            return article
+        
+        current_identity_map().add(Article, article.id, article)
+        db.on_commit(lambda: search_engine.refresh_article(article.id))
+        db.on_commit(feed_cache.invalidate)
+        return article
     
     def delete(self, article_id):
         """Delete article"""
         with db.get_cursor() as cursor:
             sql = "DELETE FROM articles WHERE id = %s"
             cursor.execute(sql, (article_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        
+        current_identity_map().discard(Article, article_id)
+        if deleted:
+            db.on_commit(lambda: search_engine.refresh_article(article_id))
+            db.on_commit(feed_cache.invalidate)
+        return deleted
     
-    def find_published(self, limit=20, offset=0, category_id=None, author_id=None):
-        """Find published articles with filters"""
+    def find_published(self, limit=20, offset=0, category_id=None, author_id=None, after=None):
+        """Find published article summaries with filters.
+        
+        With after=(published_at, id) the page is read by seeking past that row,
+        so deep pages cost the same as the first one; offset is then ignored.
+        """
         try:
             with db.get_cursor() as cursor:
-                sql = """
-                    SELECT a.*, u.username as author_username, c.name as category_name
+                sql = f"""
+                    SELECT {SUMMARY_COLUMNS}
                     FROM articles a
-                    LEFT JOIN users u ON a.author_id = u.id
-                    LEFT JOIN categories c ON a.category_id = c.id
+                    {SUMMARY_JOINS}
                     WHERE a.status = 'published'
                 """
                 params = []
@@ -124,8 +199,15 @@ class ArticleRepository:
                     sql += " AND a.author_id = %s"
                     params.append(author_id)
                 
-                sql += " ORDER BY a.published_at DESC LIMIT %s OFFSET %s"
-                params.extend([limit, offset])
+                if after:
+                    condition, cursor_params = keyset_condition('a.published_at', 'a.id', after)
+                    sql += f" AND {condition}"
+                    params.extend(cursor_params)
+                    sql += " ORDER BY a.published_at DESC, a.id DESC LIMIT %s"
+                    params.append(limit)
+                else:
+                    sql += " ORDER BY a.published_at DESC, a.id DESC LIMIT %s OFFSET %s"
+                    params.extend([limit, offset])
                 
                 cursor.execute(sql, params)
                 results = cursor.fetchall()
@@ -133,12 +215,7 @@ class ArticleRepository:
                 
                 for row in results:
                     try:
-                        article = Article.from_dict(row)
-                        if row.get('author_username'):
-                            article.author = User(username=row['author_username'])
-                        if row.get('category_name'):
-                            article.category = Category(name=row['category_name'])
-                        articles.append(article)
+                        articles.append(ArticleSummary.from_dict(row))
                     except Exception as e:
                         logger.error(f"Error parsing article row: {e}")
                         continue
@@ -148,20 +225,90 @@ class ArticleRepository:
             logger.error(f"Error in find_published: {e}", exc_info=True)
             raise
     
-    def search(self, query, limit=20, offset=0):
-        """Search articles by keyword - includes title, content, excerpt, and author name"""
+    def search(self, query, limit=20, offset=0, after=None):
+        """Search articles by keyword - includes title, content, excerpt, and author name.
+        
+        Results are ranked by relevance from the in-memory search index; each article
+        carries its search_score. If the index is disabled or unavailable the
+        database is searched instead, newest first.
+        
+        A cursor keeps the ordering of the page it came from: date cursors always
+        continue the database search, and score cursors raise InvalidCursorError
+        when the index is unavailable, rather than silently starting over.
+        """
+        if after and isinstance(after[0], datetime):
+            return self._search_database(query, limit=limit, offset=offset, after=after)
+        
+        if config.SEARCH_INDEX_ENABLED:
+            try:
+                return self._search_index(query, limit=limit, offset=offset, after=after)
+            except SearchIndexNotReady:
+                logger.info("Search index not built yet, searching the database")
+            except Exception as e:
+                logger.error(f"Search index unavailable, falling back to database search: {e}", exc_info=True)
+        
+        if after:
+            raise InvalidCursorError('Search results have changed, start again without a cursor')
+        return self._search_database(query, limit=limit, offset=offset)
+    
+    def _search_index(self, query, limit, offset, after, max_rounds=5):
+        """A full page of ranked results from the index.
+        
+        The index can list articles that were unpublished since its last refresh;
+        those are dropped from the index and the page is refilled with the next
+        ranked ids, so short pages only happen when the results run out.
+        """
+        ranked = search_engine.search(query, limit=limit, offset=offset, after=after)
+        articles = []
+        for _ in range(max_rounds):
+            found, stale = self._find_ranked(ranked)
+            articles.extend(found)
+            if stale:
+                search_engine.discard(stale)
+            if not stale or len(ranked) < limit or len(articles) >= limit:
+                break
+            last_id, last_score = ranked[-1]
+            ranked = search_engine.search(query, limit=limit, after=(last_score, last_id))
+        return articles[:limit]
+    
+    def _find_ranked(self, ranked):
+        """Article summaries for [(article_id, score)] in ranking order, and ids no longer published"""
+        if not ranked:
+            return [], []
+        with db.get_cursor() as cursor:
+            placeholders = ','.join(['%s'] * len(ranked))
+            sql = f"""
+                SELECT {SUMMARY_COLUMNS}
+                FROM articles a
+                {SUMMARY_JOINS}
+                WHERE a.id IN ({placeholders}) AND a.status = 'published'
+            """
+            cursor.execute(sql, [article_id for article_id, _ in ranked])
+            rows = {row['id']: row for row in cursor.fetchall()}
+        
+        articles = []
+        stale = []
+        for article_id, score in ranked:
+            row = rows.get(article_id)
+            if row is None:
+                stale.append(article_id)
+                continue
+            try:
+                article = ArticleSummary.from_dict(row)
+                article.search_score = score
+                articles.append(article)
+            except Exception as e:
+                logger.error(f"Error parsing article in search: {e}")
+        return articles, stale
+    
+    def _search_database(self, query, limit=20, offset=0, after=None):
+        """Search articles with FULLTEXT and LIKE predicates, newest first"""
         with db.get_cursor() as cursor:
             search_term = f"%{query}%"
-            sql = """
-                SELECT a.*,
-                       u.username as author_username, 
-                       u.first_name as author_first_name, 
-                       u.last_name as author_last_name,
-                       c.name as category_name, 
-                       c.slug as category_slug
+            sql = f"""
+                SELECT {SUMMARY_COLUMNS}
                 FROM articles a
-                LEFT JOIN users u ON a.author_id = u.id
-                LEFT JOIN categories c ON a.category_id = c.id
+                {SUMMARY_JOINS}
                 WHERE a.status = 'published' 
                 AND (
                     MATCH(a.title, a.content, a.excerpt) AGAINST(%s IN NATURAL LANGUAGE MODE)
@@ -173,36 +320,27 @@ class ArticleRepository:
                     OR u.last_name LIKE %s
                     OR CONCAT(u.first_name, ' ', u.last_name) LIKE %s
                 )
-                ORDER BY a.published_at DESC
-                LIMIT %s OFFSET %s
             """
-            cursor.execute(sql, (
+            params = [
                 query, search_term, search_term, search_term,
-                search_term, search_term, search_term, search_term,
-                limit, offset
-            ))
+                search_term, search_term, search_term, search_term
+            ]
+            
+            if after:
+                condition, cursor_params = keyset_condition('a.published_at', 'a.id', after)
+                sql += f" AND {condition} ORDER BY a.published_at DESC, a.id DESC LIMIT %s"
+                params.extend(cursor_params + [limit])
+            else:
+                sql += " ORDER BY a.published_at DESC, a.id DESC LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
+            
+            cursor.execute(sql, params)
             results = cursor.fetchall()
             
             articles = []
             for row in results:
                 try:
-                    article = Article.from_dict(row)
-                    # Load author if available
-                    if row.get('author_username'):
-                        article.author = User(
-                            id=row.get('author_id'),
-                            username=row.get('author_username'),
-                            first_name=row.get('author_first_name'),
-                            last_name=row.get('author_last_name')
-                        )
-                    # Load category if available
-                    if row.get('category_name'):
-                        article.category = Category(
-                            id=row.get('category_id'),
-                            name=row.get('category_name'),
-                            slug=row.get('category_slug')
-                        )
-                    articles.append(article)
+                    articles.append(ArticleSummary.from_dict(row))
                 except Exception as e:
                     logger.error(f"Error parsing article in search: {e}")
                     continue
@@ -211,7 +349,25 @@ class ArticleRepository:
     
     def increment_views(self, article_id):
         """Increment article views count"""
+        self.increment_views_batch({article_id: 1})
+    
+    def increment_views_batch(self, deltas):
+        """Add view deltas ({article_id: count}) to many articles with one UPDATE"""
+        if not deltas:
+            return
+        # Sorted ids keep row-lock order stable across concurrent flushes
+        article_ids = sorted(deltas)
         with db.get_cursor() as cursor:
-            sql = "UPDATE articles SET views_count = views_count + 1 WHERE id = %s"
-            cursor.execute(sql, (article_id,))
+            case_sql = ' '.join(['WHEN %s THEN %s'] * len(article_ids))
+            placeholders = ','.join(['%s'] * len(article_ids))
+            sql = f"""
+                UPDATE articles
+                SET views_count = views_count + CASE id {case_sql} ELSE 0 END
+                WHERE id IN ({placeholders})
+            """
+            params = []
+            for article_id in article_ids:
+                params.extend([article_id, deltas[article_id]])
+            params.extend(article_ids)
+            cursor.execute(sql, params)
 
@@ -3,11 +3,34 @@ Category Repository - Repository Pattern
 """
 from app.database import db
 from app.models.category import Category
+from app.feed_cache import feed_cache
+from app.category_catalog import CategoryCatalog
+from config import config
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _load_categories():
+    """Category rows for the catalog.
+    
+    Read on a connection of its own, never the request's transaction: a
+    request that has already read would otherwise reload a catalog from its
+    old snapshot after another request's category write invalidated it.
+    """
+    with db.get_connection() as conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT * FROM categories")
+                return cursor.fetchall()
+        finally:
+            conn.rollback()
+
+
+# Shared by all CategoryRepository instances; reads are served from it, writes invalidate it
+category_catalog = CategoryCatalog(_load_categories, ttl=config.CATEGORY_CATALOG_TTL)
+
+
 class CategoryRepository:
     """Repository for category data access"""
     
@@ -20,43 +43,32 @@ class CategoryRepository:
             sql = "INSERT INTO categories (name, slug, description) VALUES (%s, %s, %s)"
             cursor.execute(sql, (category.name, category.slug, category.description))
             category.id = cursor.lastrowid
-            return category
+        
+        db.on_commit(category_catalog.invalidate)
+        db.on_commit(feed_cache.invalidate)
+        return category
     
     def find_by_id(self, category_id):
         """Find category by ID"""
-        with db.get_cursor() as cursor:
-            sql = "SELECT * FROM categories WHERE id = %s"
-            cursor.execute(sql, (category_id,))
-            result = cursor.fetchone()
-            return Category.from_dict(result) if result else None
+        return Category.from_dict(category_catalog.get(category_id))
+    
+    def find_by_ids(self, category_ids):
+        """Find many categories; returns {id: Category}"""
+        categories = {}
+        for category_id in category_ids:
+            row = category_catalog.get(category_id)
+            if row:
+                categories[category_id] = Category.from_dict(row)
+        return categories
     
     def find_by_slug(self, slug):
         """Find category by slug"""
-        with db.get_cursor() as cursor:
-            sql = "SELECT * FROM categories WHERE slug = %s"
-            cursor.execute(sql, (slug,))
-            result = cursor.fetchone()
-            return Category.from_dict(result) if result else None
+        return Category.from_dict(category_catalog.get_by_slug(slug))
     
     def find_all(self):
-        """Find all categories"""
+        """Find all categories, ordered by name"""
         try:
-            with db.get_cursor() as cursor:
-                sql = "SELECT * FROM categories ORDER BY name"
-                cursor.execute(sql)
-                results = cursor.fetchall()
-                if not results:
-                    return []
-                categories = []
-                for row in results:
-                    try:
-                        category = Category.from_dict(row)
-                        if category:
-                            categories.append(category)
-                    except Exception as e:
-                        logger.error(f"Error parsing category: {e}, row: {row}")
-                        continue
-                return categories
+            return [Category.from_dict(row) for row in category_catalog.all()]
         except Exception as e:
             logger.error(f"Error in find_all categories: {e}", exc_info=True)
             # Return empty list instead of raising to prevent 500 errors
@@ -67,12 +79,20 @@ class CategoryRepository:
         with db.get_cursor() as cursor:
             sql = "UPDATE categories SET name = %s, slug = %s, description = %s WHERE id = %s"
             cursor.execute(sql, (category.name, category.slug, category.description, category.id))
-            return category
+        
+        db.on_commit(category_catalog.invalidate)
+        db.on_commit(feed_cache.invalidate)
+        return category
     
     def delete(self, category_id):
         """Delete category"""
         with db.get_cursor() as cursor:
             sql = "DELETE FROM categories WHERE id = %s"
             cursor.execute(sql, (category_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        
+        if deleted:
+            db.on_commit(category_catalog.invalidate)
+            db.on_commit(feed_cache.invalidate)
+        return deleted
 
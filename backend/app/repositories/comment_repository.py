@@ -0,0 +1,108 @@
+"""
+Comment Repository - Repository Pattern
+"""
+from app.database import db
+from app.repositories.pagination import keyset_condition
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CommentRepository:
+    """Repository for comment threads.
+    
+    A page of threads (root comments with every approved descendant) is loaded
+    with one recursive query and assembled into a tree in memory.
+    """
+    
+    def __init__(self):
+        self.table = 'comments'
+    
+    def find_threads(self, article_id, limit=None, after=None, replies_limit=None):
+        """Approved comment threads of an article, newest roots first.
+        
+        Roots are paginated by (created_at, id) keyset when limit is given.
+        Every comment carries its nested replies (oldest first) and reply_count,
+        the number of all its descendants; with replies_limit only the first
+        replies of each comment are nested so large threads can be expanded
+        lazily through find_thread().
+        """
+        root_filters = ["article_id = %s", "is_approved = TRUE", "parent_id IS NULL"]
+        params = [article_id]
+        if after:
+            condition, condition_params = keyset_condition('created_at', 'id', after)
+            root_filters.append(condition)
+            params.extend(condition_params)
+        
+        root_sql = f"""
+            SELECT id FROM comments
+            WHERE {' AND '.join(root_filters)}
+            ORDER BY created_at DESC, id DESC
+        """
+        if limit:
+            root_sql += " LIMIT %s"
+            params.append(limit)
+        
+        rows = self._load_threads(root_sql, params)
+        roots = [row for row in rows if row['depth'] == 0]
+        roots.sort(key=lambda row: (row['created_at'], row['id']), reverse=True)
+        return self._build_tree(rows, roots, replies_limit)
+    
+    def find_thread(self, comment_id, replies_limit=None):
+        """One approved comment with all of its approved replies, or None"""
+        root_sql = "SELECT id FROM comments WHERE id = %s AND is_approved = TRUE"
+        rows = self._load_threads(root_sql, [comment_id])
+        roots = [row for row in rows if row['depth'] == 0]
+        if not roots:
+            return None
+        return self._build_tree(rows, roots, replies_limit)[0]
+    
+    def _load_threads(self, root_sql, params):
+        """Rows of the selected roots and all their approved descendants in one query"""
+        with db.get_cursor() as cursor:
+            sql = f"""
+                WITH RECURSIVE roots AS (
+                    {root_sql}
+                ),
+                thread (id, depth) AS (
+                    SELECT id, 0 FROM roots
+                    UNION ALL
+                    SELECT c.id, t.depth + 1
+                    FROM comments c
+                    INNER JOIN thread t ON c.parent_id = t.id
+                    WHERE c.is_approved = TRUE
+                )
+                SELECT c.*, u.username, u.first_name, u.last_name, t.depth
+                FROM thread t
+                INNER JOIN comments c ON c.id = t.id
+                JOIN users u ON c.user_id = u.id
+                ORDER BY c.created_at ASC, c.id ASC
+            """
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    
+    def _build_tree(self, rows, roots, replies_limit=None):
+        """Nest rows (ordered oldest first) under their parents and count descendants"""
+        children = {}
+        for row in rows:
+            row['replies'] = []
+            if row['depth'] > 0:
+                children.setdefault(row['parent_id'], []).append(row)
+        
+        # Iterative depth-first walk so deep threads do not hit the recursion limit
+        order = []
+        stack = list(roots)
+        while stack:
+            comment = stack.pop()
+            order.append(comment)
+            stack.extend(children.get(comment['id'], []))
+        for comment in reversed(order):
+            self._finish(comment, children.get(comment['id'], []), replies_limit)
+        return roots
+    
+    @staticmethod
+    def _finish(comment, replies, replies_limit):
+        comment['reply_count'] = sum(1 + reply['reply_count'] for reply in replies)
+        comment['replies'] = replies if replies_limit is None else replies[:replies_limit]
+        comment['has_more_replies'] = len(replies) > len(comment['replies'])
+        comment.pop('depth', None)
@@ -0,0 +1,46 @@
+"""
+Identity Map - request-scoped cache of loaded model objects
+"""
+from flask import g, has_request_context
+
+
+class IdentityMap:
+    """Keeps one loaded object per (model, id) so repeated lookups skip the database"""
+    
+    def __init__(self):
+        self._objects = {}
+    
+    def get(self, model, object_id):
+        return self._objects.get((model, object_id))
+    
+    def add(self, model, object_id, obj):
+        self._objects[(model, object_id)] = obj
+    
+    def discard(self, model, object_id):
+        self._objects.pop((model, object_id), None)
+    
+    def split(self, model, ids):
+        """Partition ids into ({id: cached object}, [ids still to load])"""
+        found = {}
+        missing = []
+        seen = set()
+        for object_id in ids:
+            if object_id in seen:
+                continue
+            seen.add(object_id)
+            obj = self._objects.get((model, object_id))
+            if obj is not None:
+                found[object_id] = obj
+            else:
+                missing.append(object_id)
+        return found, missing
+
+
+def current_identity_map():
+    """Identity map of the current request; a throwaway map outside requests"""
+    if not has_request_context():
+        return IdentityMap()
+    identity_map = g.get('_identity_map')
+    if identity_map is None:
+        identity_map = g._identity_map = IdentityMap()
+    return identity_map
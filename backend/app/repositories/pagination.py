@@ -0,0 +1,61 @@
+"""
+Pagination - opaque keyset (cursor) tokens for seek-based listing queries
+"""
+from datetime import datetime
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+    pass
+
+
+def encode_cursor(sort_value, row_id):
+    """Encode the (sort value, id) of the last row of a page as an opaque token"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token from encode_cursor into (sort value, id).
+    
+    Timestamps come back as datetime; numeric sort values (such as search
+    relevance scores) as float.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        sort_value, row_id = json.loads(raw.decode('utf-8'))
+        if isinstance(sort_value, str):
+            sort_value = datetime.fromisoformat(sort_value)
+        elif isinstance(sort_value, (int, float)) and not isinstance(sort_value, bool):
+            sort_value = float(sort_value)
+        else:
+            raise ValueError(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise InvalidCursorError('Invalid pagination cursor')
+
+
+def keyset_condition(sort_column, id_column, cursor):
+    """SQL condition and params selecting rows after the cursor in (sort DESC, id DESC) order"""
+    sort_value, row_id = cursor
+    sql = f"({sort_column} < %s OR ({sort_column} = %s AND {id_column} < %s))"
+    return sql, [sort_value, sort_value, row_id]
+
+
+def next_cursor(rows, limit, sort_key, id_key='id'):
+    """Cursor for the page after rows, or None when this was the last page"""
+    if not rows or not limit or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if isinstance(last, dict):
+        sort_value, row_id = last.get(sort_key), last.get(id_key)
+    else:
+        sort_value, row_id = getattr(last, sort_key, None), getattr(last, id_key, None)
+    if sort_value is None or row_id is None:
+        return None
+    return encode_cursor(sort_value, row_id)
@@ -3,11 +3,19 @@ User Repository - Repository Pattern
 """
 from app.database import db
 from app.models.user import User
+from app.repositories.pagination import keyset_condition
+from app.repositories.identity_map import current_identity_map
+from app.cache import TTLCache
+from config import config
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# user_id -> {'id', 'role', 'is_active'} for authorization checks.
+# Writes in this process invalidate entries; the TTL bounds staleness from other processes.
+_principal_cache = TTLCache(max_size=config.PRINCIPAL_CACHE_SIZE, default_ttl=config.PRINCIPAL_CACHE_TTL)
+
 
 class UserRepository:
     """Repository for user data access"""
@@ -37,6 +45,54 @@ class UserRepository:
             result = cursor.fetchone()
             return User.from_dict(result) if result else None
     
+    def find_principal(self, user_id):
+        """Role and active flag of a user, cached briefly; None for unknown users"""
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        
+        principal = _principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+        
+        with db.get_cursor() as cursor:
+            sql = "SELECT id, role, is_active FROM users WHERE id = %s"
+            cursor.execute(sql, (user_id,))
+            result = cursor.fetchone()
+        if not result:
+            return None
+        
+        principal = {'id': result['id'], 'role': result['role'], 'is_active': bool(result['is_active'])}
+        _principal_cache.set(user_id, principal)
+        return principal
+    
+    def invalidate_principal(self, user_id):
+        """Forget the cached principal of a user"""
+        try:
+            _principal_cache.invalidate(int(user_id))
+        except (TypeError, ValueError):
+            pass
+    
+    def principal_cache_stats(self):
+        """Principal cache counters"""
+        return _principal_cache.stats()
+    
+    def find_by_ids(self, user_ids):
+        """Find many users with one query; returns {id: User}, reusing users loaded in this request"""
+        identity_map = current_identity_map()
+        users, missing = identity_map.split(User, user_ids)
+        if missing:
+            with db.get_cursor() as cursor:
+                placeholders = ','.join(['%s'] * len(missing))
+                sql = f"SELECT * FROM users WHERE id IN ({placeholders})"
+                cursor.execute(sql, missing)
+                for row in cursor.fetchall():
+                    user = User.from_dict(row)
+                    identity_map.add(User, user.id, user)
+                    users[user.id] = user
+        return users
+    
     def find_by_email(self, email):
         """Find user by email"""
         with db.get_cursor() as cursor:
@@ -66,24 +122,47 @@ class UserRepository:
                 user.username, user.email, user.first_name, user.last_name,
                 user.role, user.is_active, datetime.now(), user.id
             ))
-            return user
+        
+        current_identity_map().discard(User, user.id)
+        db.on_commit(lambda: self.invalidate_principal(user.id))
+        return user
+    
+    def update_password_hash(self, user_id, password_hash):
+        """Replace a user's password hash, e.g. after a rehash with new parameters"""
+        with db.get_cursor() as cursor:
+            sql = "UPDATE users SET password_hash = %s WHERE id = %s"
+            cursor.execute(sql, (password_hash, user_id))
+        
+        current_identity_map().discard(User, user_id)
     
     def delete(self, user_id):
         """Delete user"""
         with db.get_cursor() as cursor:
             sql = "DELETE FROM users WHERE id = %s"
             cursor.execute(sql, (user_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        
+        current_identity_map().discard(User, user_id)
+        if deleted:
+            db.on_commit(lambda: self.invalidate_principal(user_id))
+        return deleted
     
-    def find_all(self, limit=None, offset=None):
-        """Find all users with pagination"""
+    def find_all(self, limit=None, offset=None, after=None):
+        """Find all users with pagination; after=(created_at, id) seeks past that row"""
         with db.get_cursor() as cursor:
-            sql = "SELECT * FROM users ORDER BY created_at DESC"
+            sql = "SELECT * FROM users"
+            params = []
+            if after:
+                condition, params = keyset_condition('created_at', 'id', after)
+                sql += f" WHERE {condition}"
+            sql += " ORDER BY created_at DESC, id DESC"
             if limit:
-                sql += f" LIMIT {limit}"
-                if offset:
-                    sql += f" OFFSET {offset}"
-            cursor.execute(sql)
+                sql += " LIMIT %s"
+                params.append(limit)
+                if offset and not after:
+                    sql += " OFFSET %s"
+                    params.append(offset)
+            cursor.execute(sql, params)
             results = cursor.fetchall()
             return [User.from_dict(row) for row in results]
 
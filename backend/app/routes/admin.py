@@ -5,10 +5,18 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.middleware.auth import admin_required, editor_required
 from app.repositories.article_repository import ArticleRepository
-from app.repositories.category_repository import CategoryRepository
+from app.repositories.category_repository import CategoryRepository, category_catalog
 from app.repositories.user_repository import UserRepository
 from app.models.article import Article
 from app.services.notification_service import NotificationService
+from app.services.notification_fanout import notification_fanout
+from app.services.notification_outbox import notification_outbox
+from app.services.view_counter import view_counter
+from app.search import search_engine
+from app.services.trending_service import trending_service
+from app.feed_cache import feed_cache
+from app.passwords import password_hasher
+from app.repositories.pagination import decode_cursor, next_cursor, keyset_condition, InvalidCursorError
 from app.database import db
 from datetime import datetime
 import re
@@ -41,32 +49,62 @@ def list_all_articles():
         status = request.args.get('status')
         offset = (page - 1) * limit
         
+        after = None
+        if request.args.get('cursor'):
+            try:
+                after = decode_cursor(request.args['cursor'])
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e)}), 400
+        
         with db.get_cursor() as cursor:
-            sql = "SELECT * FROM articles WHERE 1=1"
+            sql = "SELECT id FROM articles WHERE 1=1"
             params = []
             
             if status:
                 sql += " AND status = %s"
                 params.append(status)
             
-            sql += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-            params.extend([limit, offset])
+            if after:
+                condition, cursor_params = keyset_condition('created_at', 'id', after)
+                sql += f" AND {condition} ORDER BY created_at DESC, id DESC LIMIT %s"
+                params.extend(cursor_params + [limit])
+            else:
+                sql += " ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
             
             cursor.execute(sql, params)
-            results = cursor.fetchall()
-            articles = [Article.from_dict(row) for row in results]
-            
-            return jsonify({
-                'articles': [article.to_dict() for article in articles],
-                'page': page,
-                'limit': limit
-            }), 200
+            article_ids = [row['id'] for row in cursor.fetchall()]
+        
+        articles = article_repo.find_summaries_by_ids(article_ids)
+        
+        return jsonify({
+            'articles': [article.to_dict() for article in articles],
+            'page': page,
+            'limit': limit,
+            'next_cursor': next_cursor(articles, limit, 'created_at')
+        }), 200
     
     except Exception as e:
         logger.error(f"List articles error: {e}")
         return jsonify({'error': 'Failed to list articles'}), 500
 
 
+@admin_bp.route('/articles/<int:article_id>', methods=['GET'])
+@editor_required
+def get_article(article_id):
+    """Get full article, including content and unpublished ones (admin/editor)"""
+    try:
+        article = article_repo.find_by_id(article_id, include_author=True, include_category=True)
+        if not article:
+            return jsonify({'error': 'Article not found'}), 404
+        
+        return jsonify({'article': article.to_dict()}), 200
+    
+    except Exception as e:
+        logger.error(f"Get article error: {e}")
+        return jsonify({'error': 'Failed to get article'}), 500
+
+
 @admin_bp.route('/articles/<int:article_id>', methods=['PUT'])
 @editor_required
 def update_article(article_id):
@@ -92,16 +130,21 @@ def update_article(article_id):
             article.is_breaking = data['is_breaking']
         if 'is_premium' in data:
             article.is_premium = data['is_premium']
+        send_breaking = False
         if 'status' in data:
             article.status = data['status']
             if data['status'] == 'published' and not article.published_at:
                 article.published_at = datetime.now()
-                if article.is_breaking:
-                    notification_service.send_breaking_news(article.id, article.title)
+                send_breaking = article.is_breaking
         
         article = article_repo.update(article)
         
-        return jsonify({'article': article.to_dict()}), 200
+        response = {'article': article.to_dict()}
+        if send_breaking:
+            job = notification_service.send_breaking_news(article.id, article.title)
+            response['notification_job_id'] = job.id
+        
+        return jsonify(response), 200
     
     except Exception as e:
         logger.error(f"Update article error: {e}")
@@ -186,12 +229,20 @@ def list_users():
         limit = int(request.args.get('limit', 50))
         offset = (page - 1) * limit
         
-        users = user_repo.find_all(limit=limit, offset=offset)
+        after = None
+        if request.args.get('cursor'):
+            try:
+                after = decode_cursor(request.args['cursor'])
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        users = user_repo.find_all(limit=limit, offset=offset, after=after)
         
         return jsonify({
             'users': [user.to_dict() for user in users],
             'page': page,
-            'limit': limit
+            'limit': limit,
+            'next_cursor': next_cursor(users, limit, 'created_at')
         }), 200
     
     except Exception as e:
@@ -217,3 +268,116 @@ def toggle_user_active(user_id):
         logger.error(f"Toggle user active error: {e}")
         return jsonify({'error': 'Failed to update user status'}), 500
 
+
+@admin_bp.route('/stats/views', methods=['GET'])
+@admin_required
+def get_view_counter_stats():
+    """View counter buffer statistics (admin only)"""
+    try:
+        return jsonify({'view_counter': view_counter.stats()}), 200
+    
+    except Exception as e:
+        logger.error(f"View counter stats error: {e}")
+        return jsonify({'error': 'Failed to get view counter stats'}), 500
+
+
+@admin_bp.route('/stats/search', methods=['GET'])
+@admin_required
+def get_search_index_stats():
+    """Search index statistics (admin only)"""
+    try:
+        return jsonify({'search_index': search_engine.stats()}), 200
+    
+    except Exception as e:
+        logger.error(f"Search index stats error: {e}")
+        return jsonify({'error': 'Failed to get search index stats'}), 500
+
+
+@admin_bp.route('/stats/trending', methods=['GET'])
+@admin_required
+def get_trending_stats():
+    """Trending ranking statistics (admin only)"""
+    try:
+        return jsonify({'trending': trending_service.stats()}), 200
+    
+    except Exception as e:
+        logger.error(f"Trending stats error: {e}")
+        return jsonify({'error': 'Failed to get trending stats'}), 500
+
+
+@admin_bp.route('/stats/feed-cache', methods=['GET'])
+@admin_required
+def get_feed_cache_stats():
+    """Anonymous feed cache statistics (admin only)"""
+    try:
+        return jsonify({'feed_cache': feed_cache.stats()}), 200
+    
+    except Exception as e:
+        logger.error(f"Feed cache stats error: {e}")
+        return jsonify({'error': 'Failed to get feed cache stats'}), 500
+
+
+@admin_bp.route('/stats/categories', methods=['GET'])
+@admin_required
+def get_category_catalog_stats():
+    """Category catalog of this process, compared with the database (admin only)"""
+    try:
+        stats = category_catalog.stats()
+        stats.update(category_catalog.check())
+        return jsonify({'category_catalog': stats}), 200
+    
+    except Exception as e:
+        logger.error(f"Category catalog stats error: {e}")
+        return jsonify({'error': 'Failed to get category catalog stats'}), 500
+
+
+@admin_bp.route('/stats/password-hashing', methods=['GET'])
+@admin_required
+def get_password_hashing_stats():
+    """Password hashing pool statistics, including queue depth (admin only)"""
+    try:
+        return jsonify({'password_hashing': password_hasher.stats()}), 200
+    
+    except Exception as e:
+        logger.error(f"Password hashing stats error: {e}")
+        return jsonify({'error': 'Failed to get password hashing stats'}), 500
+
+
+@admin_bp.route('/stats/notification-outbox', methods=['GET'])
+@admin_required
+def get_notification_outbox_stats():
+    """Undelivered notifications per channel and status (admin only)"""
+    try:
+        return jsonify({'notification_outbox': notification_outbox.stats()}), 200
+    
+    except Exception as e:
+        logger.error(f"Notification outbox stats error: {e}")
+        return jsonify({'error': 'Failed to get notification outbox stats'}), 500
+
+
+@admin_bp.route('/notifications/jobs', methods=['GET'])
+@admin_required
+def list_notification_jobs():
+    """Recent notification fan-out jobs with progress (admin only)"""
+    try:
+        return jsonify({'jobs': [job.to_dict() for job in notification_fanout.list_jobs()]}), 200
+    
+    except Exception as e:
+        logger.error(f"List notification jobs error: {e}")
+        return jsonify({'error': 'Failed to list notification jobs'}), 500
+
+
+@admin_bp.route('/notifications/jobs/<job_id>', methods=['GET'])
+@admin_required
+def get_notification_job(job_id):
+    """Progress of one notification fan-out job (admin only)"""
+    try:
+        job = notification_fanout.get_job(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({'job': job.to_dict()}), 200
+    
+    except Exception as e:
+        logger.error(f"Get notification job error: {e}")
+        return jsonify({'error': 'Failed to get notification job'}), 500
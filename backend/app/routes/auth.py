@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from app.repositories.user_repository import UserRepository
 from app.models.user import User
+from app.passwords import password_hasher, PasswordHasherBusy
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,7 +37,7 @@ def register():
         user = User(
             username=data['username'],
             email=data['email'],
-            password_hash=User.hash_password(data['password']),
+            password_hash=password_hasher.hash_in_pool(data['password']),
             first_name=data.get('first_name'),
             last_name=data.get('last_name'),
             role='user'
@@ -53,6 +54,11 @@ def register():
             'access_token': access_token
         }), 201
     
+    except PasswordHasherBusy:
+        response = jsonify({'error': 'Too many requests right now. Please try again.'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
     except Exception as e:
         logger.error(f"Registration error: {e}", exc_info=True)
         error_msg = str(e)
@@ -73,12 +79,24 @@ def login():
         # Find user
         user = user_repo.find_by_email(data['email'])
         
-        if not user or not user.verify_password(data['password']):
+        if not user:
+            return jsonify({'error': 'Invalid credentials'}), 401
+        
+        # bcrypt runs on the bounded hashing pool, not on this request thread
+        matches, new_hash = password_hasher.check(data['password'], user.password_hash)
+        if not matches:
             return jsonify({'error': 'Invalid credentials'}), 401
         
         if not user.is_active:
             return jsonify({'error': 'Account is deactivated'}), 403
         
+        if new_hash:
+            # Stored hash used old bcrypt parameters; upgrade it now that we know the password
+            try:
+                user_repo.update_password_hash(user.id, new_hash)
+            except Exception as e:
+                logger.warning(f"Failed to upgrade password hash for user {user.id}: {e}")
+        
         # Create access token (identity must be a string)
         access_token = create_access_token(identity=str(user.id))
         
@@ -88,6 +106,11 @@ def login():
             'access_token': access_token
         }), 200
     
+    except PasswordHasherBusy:
+        response = jsonify({'error': 'Too many login attempts right now. Please try again.'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
     except Exception as e:
         logger.error(f"Login error: {e}")
         return jsonify({'error': 'Login failed'}), 500
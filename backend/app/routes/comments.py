@@ -5,48 +5,85 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.database import db
 from app.middleware.auth import optional_auth
+from app.middleware.http_cache import http_cache
+from app.repositories.comment_repository import CommentRepository
+from app.repositories.pagination import decode_cursor, next_cursor, InvalidCursorError
+from app.services.notification_service import NotificationService
 import logging
 
 logger = logging.getLogger(__name__)
 
 comments_bp = Blueprint('comments', __name__)
+comment_repo = CommentRepository()
+notification_service = NotificationService()
+
+
+def _comments_validator(user_id, article_id):
+    """Version of an article's approved comments: any added, edited or removed comment changes it"""
+    with db.get_cursor() as cursor:
+        sql = """
+            SELECT COUNT(*) as total, MAX(id) as last_id, MAX(updated_at) as last_updated_at
+            FROM comments
+            WHERE article_id = %s AND is_approved = TRUE
+        """
+        cursor.execute(sql, (article_id,))
+        row = cursor.fetchone()
+    parts = (request.query_string, row['total'], row['last_id'], row['last_updated_at'])
+    return parts, row['last_updated_at']
 
 
 @comments_bp.route('/articles/<int:article_id>/comments', methods=['GET'])
+@http_cache(max_age=0, validator=_comments_validator)
 @optional_auth
 def get_comments(article_id):
-    """Get comments for an article"""
+    """Get comment threads for an article.
+    
+    Without ?limit= every thread is returned. With it, threads are paginated
+    by their root comment: pass the returned next_cursor as ?cursor= to fetch
+    the following page. ?replies_limit= nests only the first replies of each
+    comment; reply_count and has_more_replies tell the client to expand the
+    rest through /comments/<id>/replies.
+    """
     try:
-        with db.get_cursor() as cursor:
-            sql = """
-                SELECT c.*, u.username, u.first_name, u.last_name
-                FROM comments c
-                JOIN users u ON c.user_id = u.id
-                WHERE c.article_id = %s AND c.is_approved = TRUE AND c.parent_id IS NULL
-                ORDER BY c.created_at DESC
-            """
-            cursor.execute(sql, (article_id,))
-            comments = cursor.fetchall()
-            
-            # Get replies for each comment
-            for comment in comments:
-                sql_replies = """
-                    SELECT c.*, u.username, u.first_name, u.last_name
-                    FROM comments c
-                    JOIN users u ON c.user_id = u.id
-                    WHERE c.parent_id = %s AND c.is_approved = TRUE
-                    ORDER BY c.created_at ASC
-                """
-                cursor.execute(sql_replies, (comment['id'],))
-                comment['replies'] = cursor.fetchall()
-            
-            return jsonify({'comments': comments}), 200
+        limit = request.args.get('limit', type=int)
+        replies_limit = request.args.get('replies_limit', type=int)
+        
+        after = None
+        if request.args.get('cursor'):
+            try:
+                after = decode_cursor(request.args['cursor'])
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        comments = comment_repo.find_threads(article_id, limit=limit, after=after, replies_limit=replies_limit)
+        
+        return jsonify({
+            'comments': comments,
+            'next_cursor': next_cursor(comments, limit, 'created_at')
+        }), 200
     
     except Exception as e:
         logger.error(f"Get comments error: {e}")
         return jsonify({'error': 'Failed to get comments'}), 500
 
 
+@comments_bp.route('/<int:comment_id>/replies', methods=['GET'])
+@optional_auth
+def get_replies(comment_id):
+    """Get one comment with its whole reply tree"""
+    try:
+        replies_limit = request.args.get('replies_limit', type=int)
+        comment = comment_repo.find_thread(comment_id, replies_limit=replies_limit)
+        if not comment:
+            return jsonify({'error': 'Comment not found'}), 404
+        
+        return jsonify({'comment': comment}), 200
+    
+    except Exception as e:
+        logger.error(f"Get replies error: {e}")
+        return jsonify({'error': 'Failed to get replies'}), 500
+
+
 @comments_bp.route('/articles/<int:article_id>/comments', methods=['POST'])
 @jwt_required()
 def create_comment(article_id):
@@ -87,11 +124,9 @@ def create_comment(article_id):
                 if parent_comment:
                     parent_user_id = parent_comment['user_id']
         
-        # Send notification if it's a reply (outside cursor context to avoid nested cursors)
+        # Notify the parent comment's author; delivery is queued and sent by the notification worker
         if parent_id and parent_user_id and parent_user_id != current_user_id:
             try:
-                from app.services.notification_service import NotificationService
-                notification_service = NotificationService()
                 notification_service.create_notification(
                     user_id=parent_user_id,
                     notification_type='comment_reply',
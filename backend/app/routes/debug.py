@@ -0,0 +1,48 @@
+"""
+Debug routes (admins only, registered only when QUERY_DEBUG_ENDPOINT is on)
+"""
+from flask import Blueprint, request, jsonify
+from app.instrumentation import query_instrumentation
+from app.middleware.auth import admin_required
+import logging
+
+logger = logging.getLogger(__name__)
+
+debug_bp = Blueprint('debug', __name__)
+
+
+@debug_bp.route('/queries', methods=['GET'])
+@admin_required
+def get_queries():
+    """Recent requests with their statements, process-wide query fingerprints and slow queries.
+    
+    ?limit= caps each list (default 20), ?order=count sorts fingerprints by
+    executions instead of total time, ?path= keeps requests whose path starts with it.
+    """
+    try:
+        limit = min(int(request.args.get('limit', 20)), 500)
+        order = request.args.get('order', 'total_ms')
+        path = request.args.get('path')
+        
+        requests_log = query_instrumentation.recent_requests(limit=500 if path else limit)
+        if path:
+            requests_log = [r for r in requests_log if r['path'].startswith(path)][:limit]
+        
+        return jsonify({
+            'settings': query_instrumentation.settings(),
+            'requests': requests_log,
+            'fingerprints': query_instrumentation.top_fingerprints(limit=limit, order=order),
+            'slow_queries': query_instrumentation.slow_queries(limit=limit)
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Get query debug info error: {e}")
+        return jsonify({'error': 'Failed to get query debug info'}), 500
+
+
+@debug_bp.route('/queries', methods=['DELETE'])
+@admin_required
+def reset_queries():
+    """Forget collected requests, fingerprints and slow queries"""
+    query_instrumentation.reset()
+    return jsonify({'message': 'Query statistics reset'}), 200
@@ -0,0 +1,63 @@
+"""
+Metrics routes - Prometheus scrape endpoint and the gauges it reports
+"""
+from flask import Blueprint, Response
+from app.metrics import metrics, cache_hit_ratio, CONTENT_TYPE
+from app.database import db
+from app.feed_cache import feed_cache
+from app.passwords import password_hasher
+from app.repositories.user_repository import UserRepository
+from app.services.subscription_service import SubscriptionService
+from app.services.notification_fanout import notification_fanout
+from app.services.notification_outbox import notification_outbox
+from app.services.view_counter import view_counter
+import logging
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+def _pool_connections():
+    status = db.pool.status()
+    return [({'state': state}, status[state]) for state in ('open', 'idle', 'checked_out', 'overflow')]
+
+
+def _cache_stats():
+    return {
+        'feed': feed_cache.stats()['pages'],
+        'principal': UserRepository().principal_cache_stats(),
+        'entitlement': SubscriptionService().entitlement_cache_stats()
+    }
+
+
+def _cache_metric(fn):
+    return lambda: [({'cache': name}, fn(stats)) for name, stats in _cache_stats().items()]
+
+
+metrics.gauge('db_pool_connections', 'Database connections by state', _pool_connections)
+metrics.gauge('db_pool_size', 'Configured pool size', lambda: db.pool.pool_size)
+metrics.gauge('cache_hit_ratio', 'Hits per lookup since start', _cache_metric(cache_hit_ratio))
+metrics.gauge('cache_hits_total', 'Cache hits', _cache_metric(lambda stats: stats['hits']), 'counter')
+metrics.gauge('cache_misses_total', 'Cache misses', _cache_metric(lambda stats: stats['misses']), 'counter')
+metrics.gauge('cache_entries', 'Cached entries', _cache_metric(lambda stats: stats['size']))
+metrics.gauge('notification_queue_depth', 'Notification fan-out jobs pending or running',
+              lambda: notification_fanout.stats()['queue_depth'])
+metrics.gauge('notification_remaining', 'Notifications still to be written by unfinished fan-out jobs',
+              lambda: notification_fanout.stats()['remaining_notifications'])
+metrics.gauge('notification_outbox_entries', 'Undelivered notifications by channel and status',
+              lambda: [
+                  ({'channel': channel, 'status': status}, counts[status])
+                  for channel, counts in notification_outbox.stats()['channels'].items()
+                  for status in ('pending', 'processing', 'failed')
+              ])
+metrics.gauge('password_hash_queue_depth', 'Password checks waiting for a hashing worker',
+              lambda: password_hasher.stats()['queue_depth'])
+metrics.gauge('view_counter_pending_views', 'Article views buffered but not yet flushed',
+              lambda: view_counter.stats()['pending_views'])
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request and subsystem metrics in Prometheus text format"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
@@ -1,16 +1,23 @@
 """
 News routes
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.repositories.article_repository import ArticleRepository
-from app.repositories.category_repository import CategoryRepository
+from app.repositories.category_repository import CategoryRepository, category_catalog
 from app.repositories.user_repository import UserRepository
 from app.models.article import Article
 from app.services.recommendation_service import RecommendationService
 from app.services.notification_service import NotificationService
 from app.services.subscription_service import SubscriptionService
+from app.services.view_counter import view_counter
+from app.services.trending_service import trending_service
+from app.repositories.pagination import decode_cursor, next_cursor, InvalidCursorError
 from app.middleware.auth import optional_auth, premium_required
+from app.middleware.http_cache import http_cache
+from app.database import db
+from app.feed_cache import feed_cache
+from config import config
 from datetime import datetime
 import re
 import logging
@@ -34,10 +41,45 @@ def slugify(text):
     return text.strip('-')
 
 
+def _feed_cursor(articles, limit):
+    """Next-page cursor: relevance-ranked search pages by score, everything else by date"""
+    if articles and getattr(articles[-1], 'search_score', None) is not None:
+        return next_cursor(articles, limit, 'search_score')
+    return next_cursor(articles, limit, 'published_at')
+
+
+def _feed_response(articles, page, limit, has_premium=False, saved_article_ids=(), liked_article_ids=()):
+    """Feed page payload.
+    
+    Feed items are summaries without content; the excerpt is the preview of
+    premium articles, whose content is only served to subscribers on the detail endpoint.
+    """
+    result_articles = []
+    for article in articles:
+        article_dict = article.to_dict()
+        article_dict['is_saved'] = article.id in saved_article_ids
+        article_dict['is_liked'] = article.id in liked_article_ids
+        article_dict['premium_locked'] = bool(article.is_premium and not has_premium)
+        result_articles.append(article_dict)
+    
+    return {
+        'articles': result_articles,
+        'page': page,
+        'limit': limit,
+        'total': len(result_articles),
+        'next_cursor': _feed_cursor(articles, limit)
+    }
+
+
 @news_bp.route('', methods=['GET'])
+@http_cache()
 @optional_auth
 def get_news():
-    """Get news feed with pagination and filters"""
+    """Get news feed with pagination and filters.
+    
+    Pass the returned next_cursor as ?cursor= to fetch the following page;
+    page-based pagination is still accepted.
+    """
     try:
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 20))
@@ -47,15 +89,22 @@ def get_news():
         
         offset = (page - 1) * limit
         
-        # Get articles
-        if search:
-            articles = article_repo.search(search, limit=limit, offset=offset)
-        else:
-            articles = article_repo.find_published(
+        after = None
+        if request.args.get('cursor'):
+            try:
+                after = decode_cursor(request.args['cursor'])
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        def load_articles():
+            if search:
+                return article_repo.search(search, limit=limit, offset=offset, after=after)
+            return article_repo.find_published(
                 limit=limit,
                 offset=offset,
                 category_id=category_id,
-                author_id=author_id
+                author_id=author_id,
+                after=after
             )
         
         # Check premium access for current user
@@ -76,12 +125,21 @@ def get_news():
         except:
             pass
         
+        if not current_user_id and not search:
+            # Anonymous pages depend only on the filters: render each once and share it
+            key = (category_id, author_id, page, limit, request.args.get('cursor'))
+            body = feed_cache.get_or_load(
+                key, lambda: current_app.json.dumps(_feed_response(load_articles(), page, limit))
+            )
+            return current_app.response_class(body, mimetype=current_app.json.mimetype), 200
+        
+        articles = load_articles()
+        
         # Check saved and liked status for authenticated users
         saved_article_ids = set()
         liked_article_ids = set()
         if current_user_id:
             try:
-                from app.database import db
                 with db.get_cursor() as cursor:
                     article_ids = [a.id for a in articles if a.id]
                     if article_ids:
@@ -99,29 +157,12 @@ def get_news():
             except Exception as e:
                 logger.warning(f"Failed to check saved/liked articles: {e}")
         
-        # Filter out premium articles for non-premium users
-        result_articles = []
-        for article in articles:
-            if article.is_premium and not has_premium:
-                # Show limited preview for premium articles
-                article_dict = article.to_dict()
-                article_dict['content'] = article_dict['content'][:200] + '... [Premium content - Subscribe to read more]'
-                article_dict['is_saved'] = article.id in saved_article_ids
-                article_dict['is_liked'] = article.id in liked_article_ids
-                result_articles.append(article_dict)
-            else:
-                article_dict = article.to_dict()
-                article_dict['is_saved'] = article.id in saved_article_ids
-                article_dict['is_liked'] = article.id in liked_article_ids
-                result_articles.append(article_dict)
-        
-        return jsonify({
-            'articles': result_articles,
-            'page': page,
-            'limit': limit,
-            'total': len(result_articles)
-        }), 200
+        return jsonify(_feed_response(
+            articles, page, limit, has_premium, saved_article_ids, liked_article_ids
+        )), 200
     
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Get news error: {e}", exc_info=True)
         error_msg = str(e)
@@ -130,7 +171,54 @@ def get_news():
         return jsonify({'error': f'Failed to fetch news: {error_msg}'}), 500
 
 
+def _article_validator(user_id, article_id):
+    """Version of an article detail response for conditional GETs.
+    
+    Views are left out: they change on every read and would defeat revalidation.
+    """
+    with db.get_cursor() as cursor:
+        cursor.execute(
+            "SELECT updated_at, likes_count, status, is_premium FROM articles WHERE id = %s",
+            (article_id,)
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        parts = (row['updated_at'], row['likes_count'], row['status'], bool(row['is_premium']))
+        if user_id:
+            cursor.execute(
+                """
+                SELECT EXISTS(SELECT 1 FROM saved_articles WHERE article_id = %s AND user_id = %s) as is_saved,
+                       EXISTS(SELECT 1 FROM article_likes WHERE article_id = %s AND user_id = %s) as is_liked
+                """,
+                (article_id, user_id, article_id, user_id)
+            )
+            flags = cursor.fetchone()
+            parts += (bool(flags['is_saved']), bool(flags['is_liked']))
+    if user_id and row['is_premium']:
+        parts += (subscription_service.has_premium_access(user_id),)
+    return parts, row['updated_at']
+
+
+def _record_article_view(user_id, article_id):
+    """Count a read of an article, also when it is answered with 304"""
+    # Record view (optional - don't fail if this fails)
+    try:
+        if user_id:
+            ip_address = request.remote_addr
+            recommendation_service.record_view(user_id, article_id, ip_address)
+    except Exception as e:
+        logger.warning(f"Failed to record view: {e}")
+    
+    # Increment views (buffered - flushed to the database in batches)
+    try:
+        view_counter.add_view(article_id)
+    except Exception as e:
+        logger.warning(f"Failed to increment views: {e}")
+
+
 @news_bp.route('/<int:article_id>', methods=['GET'])
+@http_cache(max_age=0, validator=_article_validator, on_not_modified=_record_article_view)
 @optional_auth
 def get_article(article_id):
     """Get single article by ID"""
@@ -165,32 +253,16 @@ def get_article(article_id):
         if article.is_premium and not has_premium:
             return jsonify({'error': 'Premium subscription required'}), 403
         
-        # Record view (optional - don't fail if this fails)
-        try:
-            if current_user_id:
-                ip_address = request.remote_addr
-                recommendation_service.record_view(current_user_id, article_id, ip_address)
-        except Exception as e:
-            logger.warning(f"Failed to record view: {e}")
-        
-        # Increment views (optional - don't fail if this fails)
-        try:
-            article_repo.increment_views(article_id)
-        except Exception as e:
-            logger.warning(f"Failed to increment views: {e}")
+        _record_article_view(current_user_id, article_id)
         
-        # Re-fetch article to get updated view count
-        article = article_repo.find_by_id(article_id, include_author=True, include_category=True)
-        
-        if not article:
-            return jsonify({'error': 'Article not found'}), 404
+        # Include views still waiting in the buffer instead of re-fetching the article
+        article.views_count = (article.views_count or 0) + view_counter.pending_views(article_id)
         
         # Check if article is saved and liked
         is_saved = False
         is_liked = False
         if current_user_id:
             try:
-                from app.database import db
                 with db.get_cursor() as cursor:
                     # Check saved status
                     sql_saved = "SELECT * FROM saved_articles WHERE article_id = %s AND user_id = %s"
@@ -235,21 +307,33 @@ def search_news():
             return jsonify({'error': 'Search query is required'}), 400
         
         offset = (page - 1) * limit
-        articles = article_repo.search(query, limit=limit, offset=offset)
+        
+        after = None
+        if request.args.get('cursor'):
+            try:
+                after = decode_cursor(request.args['cursor'])
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        articles = article_repo.search(query, limit=limit, offset=offset, after=after)
         
         return jsonify({
             'articles': [article.to_dict() for article in articles],
             'query': query,
             'page': page,
-            'limit': limit
+            'limit': limit,
+            'next_cursor': _feed_cursor(articles, limit)
         }), 200
     
+    except InvalidCursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Search error: {e}")
         return jsonify({'error': 'Search failed'}), 500
 
 
 @news_bp.route('/categories', methods=['GET'])
+@http_cache(max_age=config.HTTP_CACHE_CATALOG_MAX_AGE)
 def get_categories():
     """Get all categories"""
     try:
@@ -257,7 +341,10 @@ def get_categories():
         if not categories:
             logger.warning("No categories found in database")
             return jsonify({'categories': []}), 200
-        return jsonify({'categories': [cat.to_dict() for cat in categories]}), 200
+        response = jsonify({'categories': [cat.to_dict() for cat in categories]})
+        # Lets clients and monitoring spot workers still serving an old catalog
+        response.headers['X-Catalog-Version'] = category_catalog.version
+        return response, 200
     except Exception as e:
         logger.error(f"Get categories error: {e}", exc_info=True)
         error_msg = str(e)
@@ -270,6 +357,23 @@ def get_categories():
             return jsonify({'error': f'Failed to fetch categories: {error_msg}'}), 500
 
 
+@news_bp.route('/trending', methods=['GET'])
+def get_trending():
+    """Get trending articles, optionally within one category"""
+    try:
+        limit = min(int(request.args.get('limit', 10)), config.TRENDING_TOP_N)
+        category_id = request.args.get('category_id', type=int)
+        
+        article_ids = trending_service.get_trending_ids(limit, category_id=category_id)
+        articles = article_repo.find_summaries_by_ids(article_ids)
+        
+        return jsonify({'articles': [article.to_dict() for article in articles]}), 200
+    
+    except Exception as e:
+        logger.error(f"Get trending error: {e}", exc_info=True)
+        return jsonify({'error': 'Failed to get trending articles'}), 500
+
+
 @news_bp.route('/recommended', methods=['GET'])
 @jwt_required()
 def get_recommended():
@@ -373,12 +477,16 @@ def create_article():
             
             if article.status == 'published':
                 article.published_at = datetime.now()
-                if article.is_breaking:
-                    notification_service.send_breaking_news(None, article.title)
             
             article = article_repo.create(article)
             
-            return jsonify({'article': article.to_dict()}), 201
+            response = {'article': article.to_dict()}
+            if article.status == 'published' and article.is_breaking:
+                # Needs the new article id for the link; delivered in the background
+                job = notification_service.send_breaking_news(article.id, article.title)
+                response['notification_job_id'] = job.id
+            
+            return jsonify(response), 201
         
         except Exception as e:
             logger.error(f"Create article error: {e}")
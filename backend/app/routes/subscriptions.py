@@ -4,6 +4,8 @@ Subscription routes
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.subscription_service import SubscriptionService
+from app.middleware.http_cache import http_cache
+from config import config
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,6 +39,7 @@ def get_user_subscription():
 
 
 @subscriptions_bp.route('/tiers', methods=['GET'])
+@http_cache(max_age=config.HTTP_CACHE_CATALOG_MAX_AGE)
 def get_subscription_tiers():
     """Get all available subscription tiers"""
     try:
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.repositories.user_repository import UserRepository
 from app.repositories.article_repository import ArticleRepository
+from app.repositories.pagination import decode_cursor, next_cursor, keyset_condition, InvalidCursorError
 from app.database import db
 import logging
 
@@ -76,24 +77,39 @@ def get_saved_articles():
         limit = int(request.args.get('limit', 20))
         offset = (page - 1) * limit
         
+        after = None
+        if request.args.get('cursor'):
+            try:
+                after = decode_cursor(request.args['cursor'])
+            except InvalidCursorError as e:
+                return jsonify({'error': str(e)}), 400
+        
         with db.get_cursor() as cursor:
             sql = """
-                SELECT a.* FROM articles a
-                JOIN saved_articles sa ON a.id = sa.article_id
+                SELECT sa.article_id, sa.created_at as saved_at FROM saved_articles sa
                 WHERE sa.user_id = %s
-                ORDER BY sa.created_at DESC
-                LIMIT %s OFFSET %s
             """
-            cursor.execute(sql, (current_user_id, limit, offset))
-            results = cursor.fetchall()
+            params = [current_user_id]
             
-            articles = [article_repo.find_by_id(row['id']) for row in results]
+            if after:
+                condition, cursor_params = keyset_condition('sa.created_at', 'sa.article_id', after)
+                sql += f" AND {condition} ORDER BY sa.created_at DESC, sa.article_id DESC LIMIT %s"
+                params.extend(cursor_params + [limit])
+            else:
+                sql += " ORDER BY sa.created_at DESC, sa.article_id DESC LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
             
-            return jsonify({
-                'articles': [article.to_dict() for article in articles if article],
-                'page': page,
-                'limit': limit
-            }), 200
+            cursor.execute(sql, params)
+            results = cursor.fetchall()
+        
+        articles = article_repo.find_summaries_by_ids([row['article_id'] for row in results])
+        
+        return jsonify({
+            'articles': [article.to_dict() for article in articles],
+            'page': page,
+            'limit': limit,
+            'next_cursor': next_cursor(results, limit, 'saved_at', id_key='article_id')
+        }), 200
     
     except Exception as e:
         logger.error(f"Get saved articles error: {e}")
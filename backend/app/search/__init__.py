@@ -0,0 +1,5 @@
+from .analyzer import Analyzer
+from .index import InvertedIndex
+from .engine import SearchEngine, SearchIndexNotReady, search_engine
+
+__all__ = ['Analyzer', 'InvertedIndex', 'SearchEngine', 'SearchIndexNotReady', 'search_engine']
@@ -0,0 +1,70 @@
+"""
+Search Analyzer - tokenization, stopword removal and light stemming
+"""
+from functools import lru_cache
+import re
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for
+from further had has have having he her here hers herself him himself his how i if in
+into is it its itself just me more most my myself no nor not now of off on once only or
+other our ours ourselves out over own same she should so some such than that the their
+theirs them themselves then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your
+yours yourself yourselves
+""".split())
+
+_TOKEN_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+_MARKUP_RE = re.compile(r'<[^>]+>')
+_VOWELS = frozenset('aeiouy')
+
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Light English stemmer: strips plural and -ed/-ing suffixes (Porter step 1 style)"""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    
+    if word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith('ies'):
+        word = word[:-3] + 'y'
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    
+    for suffix in ('ing', 'ed'):
+        base = word[:-len(suffix)]
+        if word.endswith(suffix) and len(base) >= 3 and _VOWELS.intersection(base):
+            word = base
+            # running -> run, stopped -> stop
+            if word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+    return word
+
+
+class Analyzer:
+    """Turns text into index terms: lowercase word tokens without stopwords, stemmed"""
+    
+    def __init__(self, stopwords=STOPWORDS, min_length=2):
+        self.stopwords = stopwords
+        self.min_length = min_length
+    
+    def tokenize(self, text):
+        """Lowercase word tokens of text, markup removed"""
+        if not text:
+            return []
+        return _TOKEN_RE.findall(_MARKUP_RE.sub(' ', text).lower())
+    
+    def analyze(self, text):
+        """Index terms of text in document order"""
+        terms = []
+        for token in self.tokenize(text):
+            if token.endswith("'s"):
+                token = token[:-2]
+            token = token.replace("'", '')
+            if len(token) < self.min_length or token in self.stopwords:
+                continue
+            terms.append(stem(token))
+        return terms
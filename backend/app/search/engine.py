@@ -0,0 +1,225 @@
+"""
+Search Engine - in-process article search served from an inverted index
+"""
+from app.database import db
+from app.search.analyzer import Analyzer
+from app.search.index import InvertedIndex
+from config import config
+from datetime import timedelta
+import heapq
+import logging
+import threading
+import time
+import pymysql
+
+logger = logging.getLogger(__name__)
+
+# Re-read rows changed slightly before the last sync to absorb clock skew between app and DB
+_SYNC_OVERLAP = timedelta(minutes=5)
+
+_DOCUMENT_SQL = """
+    SELECT a.id, a.title, a.excerpt, a.content,
+           u.username as author_username,
+           u.first_name as author_first_name,
+           u.last_name as author_last_name
+    FROM articles a
+    LEFT JOIN users u ON a.author_id = u.id
+    WHERE a.status = 'published'
+"""
+
+
+class SearchIndexNotReady(Exception):
+    """The index is still being built; callers search the database meanwhile"""
+    pass
+
+
+class SearchEngine:
+    """Ranks published articles with BM25 over title, excerpt, content and author names.
+    
+    start() builds the index on a background thread, which then refreshes it
+    every refresh_interval to pick up changes made by other processes. Until
+    the first build finishes, search() raises SearchIndexNotReady. Writes made
+    through ArticleRepository update the index once their transaction commits.
+    """
+    
+    FIELD_WEIGHTS = {'title': 3.0, 'author': 2.0, 'excerpt': 1.5, 'content': 1.0}
+    
+    def __init__(self, refresh_interval=60, analyzer=None):
+        self.refresh_interval = refresh_interval
+        self.analyzer = analyzer or Analyzer()
+        self._index = InvertedIndex(self.FIELD_WEIGHTS)
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._built = False
+        self._synced_at = None
+        self._stats = {'searches': 0, 'rebuilds': 0, 'refreshes': 0, 'last_build_seconds': None}
+    
+    def search(self, query, limit=20, offset=0, after=None):
+        """Ranked [(article_id, score)] for query.
+        
+        Results are ordered by score, then id, both descending; after=(score, id)
+        continues from that result instead of using offset.
+        """
+        self._ensure_fresh()
+        
+        terms = self.analyzer.analyze(query)
+        if not terms:
+            return []
+        
+        query_terms = {}
+        for term in terms:
+            query_terms[term] = query_terms.get(term, 0.0) + 1.0
+        
+        with self._lock:
+            # Treat an unknown last word as a prefix so partially typed queries still match
+            last = terms[-1]
+            if len(last) >= 3 and not self._index.has_term(last):
+                for term in self._index.expand_prefix(last):
+                    query_terms.setdefault(term, 0.5)
+            scores = self._index.score(query_terms)
+            self._stats['searches'] += 1
+        
+        items = scores.items()
+        if after is not None:
+            after_key = (after[0], after[1])
+            items = [item for item in items if (item[1], item[0]) < after_key]
+            offset = 0
+        
+        ranked = heapq.nsmallest(offset + limit, items, key=lambda item: (-item[1], -item[0]))
+        return ranked[offset:]
+    
+    def discard(self, article_ids):
+        """Drop articles the database no longer lists as published (the index lags up to one refresh)"""
+        with self._lock:
+            for article_id in article_ids:
+                self._index.remove(article_id)
+    
+    def refresh_article(self, article_id):
+        """Re-read one article into the index, dropping it if it is no longer published"""
+        if not self._built:
+            return
+        try:
+            with db.get_cursor() as cursor:
+                cursor.execute(_DOCUMENT_SQL + " AND a.id = %s", (article_id,))
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.warning(f"Failed to refresh search index for article {article_id}: {e}")
+            return
+        
+        with self._lock:
+            if row:
+                self._index.add(row['id'], self._document(row))
+            else:
+                self._index.remove(article_id)
+    
+    def rebuild(self):
+        """Build a fresh index from all published articles"""
+        started = time.monotonic()
+        index = InvertedIndex(self.FIELD_WEIGHTS)
+        
+        with db.get_connection() as conn:
+            try:
+                synced_at = self._database_now(conn)
+                # Stream rows so article bodies are never all held in memory at once
+                cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+                try:
+                    cursor.execute(_DOCUMENT_SQL + " ORDER BY a.id")
+                    for row in cursor:
+                        index.add(row['id'], self._document(row))
+                finally:
+                    cursor.close()
+            finally:
+                conn.rollback()
+        
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._index = index
+            self._synced_at = synced_at
+            self._built = True
+            self._stats['rebuilds'] += 1
+            self._stats['last_build_seconds'] = round(elapsed, 3)
+        logger.info(f"Search index built: {len(index)} articles in {elapsed:.2f}s")
+    
+    def refresh(self):
+        """Apply articles changed since the last sync and drop unpublished ones"""
+        since = self._synced_at - _SYNC_OVERLAP
+        with db.get_connection() as conn:
+            try:
+                synced_at = self._database_now(conn)
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        _DOCUMENT_SQL + " AND (a.updated_at >= %s OR a.created_at >= %s OR u.updated_at >= %s)",
+                        (since, since, since)
+                    )
+                    changed = cursor.fetchall()
+                    cursor.execute("SELECT id FROM articles WHERE status = 'published'")
+                    published = {row['id'] for row in cursor.fetchall()}
+            finally:
+                conn.rollback()
+        
+        documents = [(row['id'], self._document(row)) for row in changed]
+        with self._lock:
+            for article_id in self._index.doc_ids() - published:
+                self._index.remove(article_id)
+            for article_id, document in documents:
+                self._index.add(article_id, document)
+            self._synced_at = synced_at
+            self._stats['refreshes'] += 1
+    
+    def stats(self):
+        """Index size and usage counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(self._index.stats())
+        stats['built'] = self._built
+        stats['refresh_interval'] = self.refresh_interval
+        return stats
+    
+    def start(self):
+        """Build the index and keep it refreshed on a background thread; safe to call repeatedly"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='search-index', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while True:
+            try:
+                if self._built:
+                    self.refresh()
+                else:
+                    self.rebuild()
+            except Exception as e:
+                logger.warning(f"Search index {'refresh' if self._built else 'build'} failed: {e}")
+            # A failed first build is retried sooner than a regular refresh
+            time.sleep(self.refresh_interval if self._built else min(self.refresh_interval, 10))
+    
+    def _ensure_fresh(self):
+        if self._thread is None:
+            self.start()
+        if not self._built:
+            raise SearchIndexNotReady('Search index is still being built')
+    
+    def _document(self, row):
+        author = ' '.join(filter(None, (
+            row.get('author_username'), row.get('author_first_name'), row.get('author_last_name')
+        )))
+        analyze = self.analyzer.analyze
+        return {
+            'title': analyze(row.get('title')),
+            'author': analyze(author.replace('_', ' ')),
+            'excerpt': analyze(row.get('excerpt')),
+            'content': analyze(row.get('content'))
+        }
+    
+    @staticmethod
+    def _database_now(conn):
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT NOW() AS now")
+            return cursor.fetchone()['now']
+
+
+# Global search engine instance
+search_engine = SearchEngine(refresh_interval=config.SEARCH_REFRESH_INTERVAL)
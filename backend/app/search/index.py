@@ -0,0 +1,138 @@
+"""
+Inverted Index - compact postings lists with field-weighted BM25 scoring
+"""
+from array import array
+from bisect import bisect_left
+import math
+
+
+class InvertedIndex:
+    """In-memory inverted index.
+    
+    Each term maps to two parallel arrays sorted by document id: the ids and
+    the field-weighted term frequencies. Documents are replaced as a whole, so
+    updates only touch the postings of the terms the document contained.
+    """
+    
+    def __init__(self, field_weights, k1=1.2, b=0.75):
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self._postings = {}     # term -> (array('I') doc ids, array('f') weighted term frequencies)
+        self._doc_terms = {}    # doc id -> terms, needed to remove the document again
+        self._doc_lengths = {}  # doc id -> field-weighted length
+        self._total_length = 0.0
+        self._vocabulary = None  # Sorted terms for prefix lookups, rebuilt lazily
+    
+    def __len__(self):
+        return len(self._doc_terms)
+    
+    def __contains__(self, doc_id):
+        return doc_id in self._doc_terms
+    
+    def doc_ids(self):
+        """Ids of all indexed documents"""
+        return set(self._doc_terms)
+    
+    def add(self, doc_id, fields):
+        """Index a document given as {field: [terms]}, replacing any previous version"""
+        if doc_id in self._doc_terms:
+            self.remove(doc_id)
+        
+        frequencies = {}
+        length = 0.0
+        for field, terms in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for term in terms:
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+            length += weight * len(terms)
+        
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('I'), array('f'))
+                self._vocabulary = None
+            ids, frequencies_array = postings
+            if not ids or ids[-1] < doc_id:
+                # Documents mostly arrive in id order, so appending is the common case
+                ids.append(doc_id)
+                frequencies_array.append(frequency)
+            else:
+                position = bisect_left(ids, doc_id)
+                ids.insert(position, doc_id)
+                frequencies_array.insert(position, frequency)
+        
+        self._doc_terms[doc_id] = tuple(frequencies)
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+    
+    def remove(self, doc_id):
+        """Drop a document from the index; returns False if it was not indexed"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        
+        for term in terms:
+            ids, frequencies = self._postings[term]
+            position = bisect_left(ids, doc_id)
+            del ids[position]
+            del frequencies[position]
+            if not ids:
+                del self._postings[term]
+                self._vocabulary = None
+        
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        return True
+    
+    def has_term(self, term):
+        return term in self._postings
+    
+    def expand_prefix(self, prefix, limit=20):
+        """Indexed terms starting with prefix, for search-as-you-type queries"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        terms = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and len(terms) < limit:
+            term = vocabulary[position]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+            position += 1
+        return terms
+    
+    def score(self, query_terms):
+        """BM25 scores {doc_id: score} of documents matching any of {term: query weight}"""
+        doc_count = len(self._doc_terms)
+        if not doc_count:
+            return {}
+        
+        k1 = self.k1
+        avg_length = self._total_length / doc_count or 1.0
+        length_norm = {}
+        scores = {}
+        
+        for term, query_weight in query_terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            ids, frequencies = postings
+            df = len(ids)
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) * query_weight
+            
+            for doc_id, frequency in zip(ids, frequencies):
+                norm = length_norm.get(doc_id)
+                if norm is None:
+                    norm = length_norm[doc_id] = k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+        
+        return scores
+    
+    def stats(self):
+        """Size of the index"""
+        return {
+            'documents': len(self._doc_terms),
+            'terms': len(self._postings),
+            'postings': sum(len(ids) for ids, _ in self._postings.values())
+        }
@@ -0,0 +1,231 @@
+"""
+Notification Fan-out - bulk delivery of one notification to many users
+"""
+from app.database import db
+from config import config
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import logging
+import threading
+import time
+import uuid
+import pymysql
+
+logger = logging.getLogger(__name__)
+
+BREAKING_NEWS_RECIPIENTS_SQL = """
+    FROM users u
+    LEFT JOIN notification_preferences np ON u.id = np.user_id
+    WHERE (np.breaking_news = TRUE OR np.breaking_news IS NULL)
+    AND u.is_active = TRUE
+"""
+
+
+class FanoutJob:
+    """Progress of one fan-out: how many notifications were written and how fast"""
+    
+    def __init__(self, notification_type, title, message, link=None, recipients_sql=BREAKING_NEWS_RECIPIENTS_SQL):
+        self.id = uuid.uuid4().hex[:12]
+        self.notification_type = notification_type
+        self.title = title
+        self.message = message
+        self.link = link
+        self.recipients_sql = recipients_sql
+        self.status = 'pending'
+        self.total = None
+        self.sent = 0
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self._started = None
+        self._finished = None
+    
+    @property
+    def elapsed(self):
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.monotonic()) - self._started
+    
+    @property
+    def rate(self):
+        """Notifications written per second"""
+        elapsed = self.elapsed
+        return self.sent / elapsed if elapsed > 0 else 0.0
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'type': self.notification_type,
+            'message': self.message,
+            'link': self.link,
+            'status': self.status,
+            'total': self.total,
+            'sent': self.sent,
+            'progress': round(self.sent / self.total, 4) if self.total else None,
+            'notifications_per_second': round(self.rate, 1),
+            'elapsed_seconds': round(self.elapsed, 3),
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class NotificationFanout:
+    """Writes a notification for every recipient off the request thread.
+    
+    Recipients are streamed with a server-side cursor and notifications are
+    inserted in chunks of multi-row INSERTs, one transaction per chunk.
+    """
+    
+    def __init__(self, chunk_size=1000, max_workers=1, history_size=50):
+        self.chunk_size = chunk_size
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='notification-fanout')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def submit(self, job, subject=None):
+        """Queue a job; subject (a NotificationSubject) queues delivery of every written notification"""
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history_size:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self.run, job, subject)
+        return job
+    
+    def get_job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def list_jobs(self):
+        """Recent jobs, newest first"""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+    
+    def stats(self):
+        """Recent jobs by status and notifications still to be written by unfinished jobs"""
+        jobs = self.list_jobs()
+        stats = {'pending': 0, 'running': 0, 'completed': 0, 'failed': 0}
+        remaining = 0
+        for job in jobs:
+            stats[job.status] = stats.get(job.status, 0) + 1
+            if job.status in ('pending', 'running') and job.total is not None:
+                remaining += job.total - job.sent
+        stats['queue_depth'] = stats['pending'] + stats['running']
+        stats['remaining_notifications'] = remaining
+        return stats
+    
+    def run(self, job, subject=None):
+        """Execute a job on the calling thread"""
+        job.status = 'running'
+        job.started_at = datetime.now()
+        job._started = time.monotonic()
+        logger.info(f"Notification fan-out {job.id} started: {job.notification_type} '{job.message}'")
+        
+        try:
+            with db.get_connection() as reader, db.get_connection() as writer:
+                try:
+                    with reader.cursor() as cursor:
+                        cursor.execute("SELECT COUNT(*) AS total " + job.recipients_sql)
+                        job.total = cursor.fetchone()['total']
+                    
+                    cursor = reader.cursor(pymysql.cursors.SSCursor)
+                    try:
+                        cursor.execute("SELECT u.id " + job.recipients_sql + " ORDER BY u.id")
+                        while True:
+                            rows = cursor.fetchmany(self.chunk_size)
+                            if not rows:
+                                break
+                            self._write_chunk(writer, job, [row[0] for row in rows], subject)
+                    finally:
+                        cursor.close()
+                finally:
+                    reader.rollback()
+            job.status = 'completed'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            logger.error(f"Notification fan-out {job.id} failed after {job.sent} notifications: {e}", exc_info=True)
+        finally:
+            job._finished = time.monotonic()
+            job.finished_at = datetime.now()
+        
+        logger.info(
+            f"Notification fan-out {job.id} {job.status}: {job.sent}/{job.total} notifications "
+            f"in {job.elapsed:.2f}s ({job.rate:.0f}/s)"
+        )
+        return job
+    
+    def _write_chunk(self, conn, job, user_ids, subject):
+        """Insert one chunk of notifications in a single statement and commit it"""
+        values = ','.join(['(%s, %s, %s, %s, %s, FALSE)'] * len(user_ids))
+        params = []
+        for user_id in user_ids:
+            params.extend([user_id, job.notification_type, job.title, job.message, job.link])
+        
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO notifications (user_id, type, title, message, link, is_read) VALUES {values}",
+                    params
+                )
+                if subject is not None:
+                    notification_ids = self._read_back_ids(cursor, job, user_ids)
+                    # Deliveries are queued in the chunk's transaction and sent by the notification worker
+                    subject.notify_observers([
+                        {
+                            'id': notification_ids.get(user_id),
+                            'user_id': user_id,
+                            'type': job.notification_type,
+                            'title': job.title,
+                            'message': job.message,
+                            'link': job.link
+                        }
+                        for user_id in user_ids
+                    ], cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        job.sent += len(user_ids)
+    
+    @staticmethod
+    def _read_back_ids(cursor, job, user_ids):
+        """{user_id: notification id} of the rows the chunk's INSERT just wrote.
+        
+        The rows start at lastrowid and are normally consecutive; matching type,
+        title, message and link keeps rows of other jobs out. Should the
+        auto-increment lock mode leave gaps, the range is widened and the
+        lowest id per user, the chunk's own row, wins.
+        """
+        first_id = cursor.lastrowid
+        placeholders = ','.join(['%s'] * len(user_ids))
+        sql = f"""
+            SELECT id, user_id FROM notifications
+            WHERE id BETWEEN %s AND %s AND type = %s AND title = %s AND message = %s AND link <=> %s
+            AND user_id IN ({placeholders})
+            ORDER BY id
+        """
+        params = [job.notification_type, job.title, job.message, job.link] + user_ids
+        
+        notification_ids = {}
+        for last_id in (first_id + len(user_ids) - 1, first_id + 10 * len(user_ids)):
+            cursor.execute(sql, [first_id, last_id] + params)
+            notification_ids = {}
+            for row in cursor.fetchall():
+                notification_ids.setdefault(row['user_id'], row['id'])
+            if len(notification_ids) == len(user_ids):
+                break
+        return notification_ids
+
+
+# Global fan-out engine
+notification_fanout = NotificationFanout(
+    chunk_size=config.NOTIFICATION_FANOUT_CHUNK_SIZE,
+    max_workers=config.NOTIFICATION_FANOUT_WORKERS
+)
@@ -0,0 +1,197 @@
+"""
+Notification Outbox - durable queue of notification deliveries per channel
+"""
+from app.database import db
+from config import config
+import json
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationOutbox:
+    """Deliveries waiting in the notification_outbox table.
+    
+    enqueue() writes one row per notification and channel with the caller's
+    cursor, so deliveries commit or roll back together with the notification.
+    Workers claim due rows with SELECT ... FOR UPDATE SKIP LOCKED, which lets
+    any number of them poll the same channel. A claim is a lease:
+    release_expired() returns rows of a worker that died to the queue, and
+    marking rows delivered or failed only touches rows the worker still holds.
+    Failed deliveries are retried with exponential backoff until max_attempts.
+    """
+    
+    def __init__(self, max_attempts=8, retry_base=5, retry_max=3600, lease_seconds=300):
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+    
+    def enqueue(self, cursor, channels, notifications):
+        """Queue every notification for every channel with one multi-row INSERT"""
+        rows = []
+        for notification in notifications:
+            payload = json.dumps(notification, default=str)
+            for channel in channels:
+                rows.append((notification.get('id'), notification['user_id'], channel, payload))
+        if not rows:
+            return 0
+        values = ','.join(['(%s, %s, %s, %s)'] * len(rows))
+        cursor.execute(
+            f"INSERT INTO notification_outbox (notification_id, user_id, channel, payload) VALUES {values}",
+            [value for row in rows for value in row]
+        )
+        return len(rows)
+    
+    def claim(self, channel, limit, worker_id):
+        """Lease up to limit due deliveries of channel; returns [{'id', 'attempts', 'payload'}]"""
+        with db.get_cursor() as cursor:
+            sql = """
+                SELECT id, attempts, payload FROM notification_outbox
+                WHERE status = 'pending' AND channel = %s AND available_at <= NOW()
+                ORDER BY available_at, id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """
+            cursor.execute(sql, (channel, limit))
+            rows = cursor.fetchall()
+            if not rows:
+                return []
+            
+            placeholders = ','.join(['%s'] * len(rows))
+            cursor.execute(
+                f"""
+                    UPDATE notification_outbox
+                    SET status = 'processing', attempts = attempts + 1, locked_by = %s,
+                        locked_until = NOW() + INTERVAL %s SECOND
+                    WHERE id IN ({placeholders})
+                """,
+                [worker_id, self.lease_seconds] + [row['id'] for row in rows]
+            )
+        
+        for row in rows:
+            row['attempts'] += 1
+            row['payload'] = json.loads(row['payload'])
+        return rows
+    
+    def mark_delivered(self, rows, worker_id):
+        """Mark claimed rows delivered; rows whose lease worker_id lost are left alone"""
+        if not rows:
+            return
+        placeholders = ','.join(['%s'] * len(rows))
+        with db.get_cursor() as cursor:
+            cursor.execute(
+                f"""
+                    UPDATE notification_outbox
+                    SET status = 'delivered', delivered_at = NOW(), locked_by = NULL,
+                        locked_until = NULL, last_error = NULL
+                    WHERE id IN ({placeholders}) AND status = 'processing' AND locked_by = %s
+                """,
+                [row['id'] for row in rows] + [worker_id]
+            )
+            updated = cursor.rowcount
+        self._log_lost_leases(rows, updated, worker_id)
+    
+    def mark_failed(self, rows, error, worker_id):
+        """Schedule a retry with backoff, or give up after max_attempts; only rows worker_id still holds"""
+        if not rows:
+            return
+        error = str(error)[:1000]
+        updates = []
+        for row in rows:
+            if row['attempts'] >= self.max_attempts:
+                updates.append(('failed', 0, error, row['id'], worker_id))
+            else:
+                updates.append(('pending', self.retry_delay(row['attempts']), error, row['id'], worker_id))
+        with db.get_cursor() as cursor:
+            cursor.executemany(
+                """
+                    UPDATE notification_outbox
+                    SET status = %s, available_at = NOW() + INTERVAL %s SECOND, last_error = %s,
+                        locked_by = NULL, locked_until = NULL
+                    WHERE id = %s AND status = 'processing' AND locked_by = %s
+                """,
+                updates
+            )
+            updated = cursor.rowcount
+        self._log_lost_leases(rows, updated, worker_id)
+        given_up = sum(1 for update in updates if update[0] == 'failed')
+        if given_up:
+            logger.error(f"Gave up on {given_up} notification deliveries after {self.max_attempts} attempts: {error}")
+    
+    def retry_delay(self, attempts):
+        """Seconds before attempt attempts + 1: exponential with jitter, capped at retry_max"""
+        delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+        return int(random.uniform(delay / 2, delay)) + 1
+    
+    @staticmethod
+    def _log_lost_leases(rows, updated, worker_id):
+        if updated < len(rows):
+            logger.warning(
+                f"{len(rows) - updated} notification deliveries of {worker_id} were not updated: "
+                f"their lease expired and another worker may hold them"
+            )
+    
+    def release_expired(self):
+        """Make deliveries whose lease ran out (worker died mid-batch) claimable again"""
+        with db.get_cursor() as cursor:
+            sql = """
+                UPDATE notification_outbox
+                SET status = 'pending', locked_by = NULL, locked_until = NULL
+                WHERE status = 'processing' AND locked_until < NOW()
+            """
+            cursor.execute(sql)
+            released = cursor.rowcount
+        if released:
+            logger.warning(f"Released {released} notification deliveries with expired leases")
+        return released
+    
+    def purge(self, retention_days, batch_size=10000):
+        """Delete delivered rows older than retention_days, in batches"""
+        deleted = 0
+        while True:
+            with db.get_cursor() as cursor:
+                sql = """
+                    DELETE FROM notification_outbox
+                    WHERE status = 'delivered' AND delivered_at < NOW() - INTERVAL %s DAY
+                    LIMIT %s
+                """
+                cursor.execute(sql, (retention_days, batch_size))
+                count = cursor.rowcount
+            deleted += count
+            if count < batch_size:
+                return deleted
+    
+    def stats(self):
+        """Undelivered rows per channel and status, and the age of the oldest pending one"""
+        with db.get_cursor() as cursor:
+            sql = """
+                SELECT channel, status, COUNT(*) AS count,
+                       TIMESTAMPDIFF(SECOND, MIN(created_at), NOW()) AS oldest_seconds
+                FROM notification_outbox
+                WHERE status IN ('pending', 'processing', 'failed')
+                GROUP BY channel, status
+            """
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+        channels = {}
+        for row in rows:
+            channel = channels.setdefault(row['channel'], {'pending': 0, 'processing': 0, 'failed': 0})
+            channel[row['status']] = row['count']
+            if row['status'] == 'pending':
+                channel['oldest_pending_seconds'] = row['oldest_seconds']
+        return {
+            'channels': channels,
+            'max_attempts': self.max_attempts,
+            'lease_seconds': self.lease_seconds
+        }
+
+
+# Global notification outbox
+notification_outbox = NotificationOutbox(
+    max_attempts=config.NOTIFICATION_MAX_ATTEMPTS,
+    retry_base=config.NOTIFICATION_RETRY_BASE,
+    retry_max=config.NOTIFICATION_RETRY_MAX,
+    lease_seconds=config.NOTIFICATION_LEASE_SECONDS
+)
@@ -4,36 +4,63 @@ Notification Service - Observer Pattern
 from abc import ABC, abstractmethod
 from typing import List
 from app.database import db
+from app.services.notification_fanout import FanoutJob, notification_fanout
+from app.services.notification_outbox import notification_outbox
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class NotificationDeliveryError(Exception):
+    """Some notifications of a batch could not be delivered; the others were.
+    
+    failed holds the positions of the undelivered notifications in the batch.
+    """
+    
+    def __init__(self, failed, message=None):
+        super().__init__(message or f"{len(failed)} notifications of the batch failed")
+        self.failed = list(failed)
+
+
 class NotificationObserver(ABC):
-    """Abstract observer interface"""
+    """Abstract observer interface.
+    
+    Observers deliver over one channel and are called by the notification
+    worker with batches of queued notifications. Raising NotificationDeliveryError
+    fails only the notifications it lists (bad payloads, rejected recipients);
+    any other exception (provider or network down) fails the whole batch.
+    Failed notifications are retried with backoff.
+    """
+    channel = None
     
     @abstractmethod
-    def notify(self, notification_data):
-        """Handle notification"""
+    def notify_batch(self, notifications):
+        """Deliver a batch of notifications"""
         pass
+    
+    def notify(self, notification_data):
+        """Deliver a single notification"""
+        self.notify_batch([notification_data])
 
 
 class EmailNotificationObserver(NotificationObserver):
     """Email notification observer"""
+    channel = 'email'
     
-    def notify(self, notification_data):
-        logger.info(f"Email notification sent: {notification_data}")
-        # In production, would send actual email
+    def notify_batch(self, notifications):
+        logger.info(f"Email notifications sent: {len(notifications)}")
+        # In production, would send the batch through the mail provider's bulk API
         pass
 
 
 class PushNotificationObserver(NotificationObserver):
     """Push notification observer"""
+    channel = 'push'
     
-    def notify(self, notification_data):
-        logger.info(f"Push notification sent: {notification_data}")
-        # In production, would send push notification
+    def notify_batch(self, notifications):
+        logger.info(f"Push notifications sent: {len(notifications)}")
+        # In production, would send one multicast request to the push service
         pass
 
 
@@ -52,13 +79,23 @@ class NotificationSubject:
         """Detach an observer"""
         self._observers.remove(observer)
     
-    def notify_observers(self, notification_data):
-        """Notify all observers"""
+    @property
+    def channels(self):
+        """Channels of the attached observers"""
+        return [observer.channel for observer in self._observers]
+    
+    def notify_observers(self, notifications, cursor):
+        """Queue delivery of notifications to every observer in the cursor's transaction.
+        
+        Delivery happens later in notification_worker.py, so callers never wait on it.
+        """
+        return notification_outbox.enqueue(cursor, self.channels, notifications)
+    
+    def deliver(self, channel, notifications):
+        """Hand a batch to the observers of channel; called by the notification worker"""
         for observer in self._observers:
-            try:
-                observer.notify(notification_data)
-            except Exception as e:
-                logger.error(f"Error notifying observer: {e}")
+            if observer.channel == channel:
+                observer.notify_batch(notifications)
 
 
 class NotificationService(NotificationSubject):
@@ -80,7 +117,7 @@ class NotificationService(NotificationSubject):
             cursor.execute(sql, (user_id, notification_type, title, message, link))
             notification_id = cursor.lastrowid
             
-            # Notify observers
+            # Queue delivery in the same transaction as the notification
             notification_data = {
                 'id': notification_id,
                 'user_id': user_id,
@@ -89,7 +126,7 @@ class NotificationService(NotificationSubject):
                 'message': message,
                 'link': link
             }
-            self.notify_observers(notification_data)
+            self.notify_observers([notification_data], cursor)
             
             return notification_id
     
@@ -123,26 +160,19 @@ class NotificationService(NotificationSubject):
             return cursor.rowcount > 0
     
     def send_breaking_news(self, article_id, article_title):
-        """Send breaking news notification to all users with preference enabled"""
-        with db.get_cursor() as cursor:
-            # Get users who want breaking news notifications
-            sql = """
-                SELECT u.id FROM users u
-                LEFT JOIN notification_preferences np ON u.id = np.user_id
-                WHERE (np.breaking_news = TRUE OR np.breaking_news IS NULL)
-                AND u.is_active = TRUE
-            """
-            cursor.execute(sql)
-            users = cursor.fetchall()
-            
-            for user in users:
-                self.create_notification(
-                    user_id=user['id'],
-                    notification_type='breaking_news',
-                    title='Breaking News',
-                    message=article_title,
-                    link=f'/news/{article_id}'
-                )
+        """Send breaking news notification to all users with preference enabled.
+        
+        The fan-out runs in the background once the current transaction commits;
+        returns the job so callers can report its id.
+        """
+        job = FanoutJob(
+            notification_type='breaking_news',
+            title='Breaking News',
+            message=article_title,
+            link=f'/news/{article_id}'
+        )
+        db.on_commit(lambda: notification_fanout.submit(job, subject=self))
+        return job
     
     def send_daily_digest(self, user_id):
         """Send daily digest notification"""
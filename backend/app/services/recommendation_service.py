@@ -3,8 +3,11 @@ Recommendation Service - for content personalization
 """
 from app.database import db
 from app.repositories.user_repository import UserRepository
-from app.repositories.article_repository import ArticleRepository
-from app.models.article import Article
+from app.repositories.article_repository import ArticleRepository, SUMMARY_COLUMNS, SUMMARY_JOINS
+from app.models.article_summary import ArticleSummary
+from app.services.view_counter import view_counter
+from app.services.trending_service import trending_service
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -46,7 +49,11 @@ class RecommendationService:
                 cursor.execute(sql_insert, (user_id, category_id, increment))
     
     def get_recommended_articles(self, user_id, limit=10):
-        """Get recommended articles based on user preferences, views, and likes"""
+        """Get recommended articles based on user preferences, views, and likes.
+        
+        Two round-trips: one query builds the user profile, one fetches an
+        over-sampled candidate pool; the tiers are merged here in Python.
+        """
         try:
             # Convert user_id to int if string
             if isinstance(user_id, str):
@@ -56,287 +63,249 @@ class RecommendationService:
                     logger.error(f"Invalid user_id format: {user_id}")
                     return []
             
-            # Step 1: Get user's category preferences
-            with db.get_cursor() as cursor:
-                # PRIORITY 1: Get explicit favorite categories (from user_preferences)
-                # These have the highest priority since user explicitly selected them
-                sql_favorite = """
-                    SELECT category_id, preference_score
-                    FROM user_preferences
-                    WHERE user_id = %s
-                    ORDER BY preference_score DESC
-                """
-                cursor.execute(sql_favorite, (user_id,))
-                favorite_prefs = cursor.fetchall()
-                favorite_categories = [(p['category_id'], p.get('preference_score', 1.0)) for p in favorite_prefs if p.get('category_id')]
-                favorite_cat_ids = [cat_id for cat_id, _ in favorite_categories]
-                
-                logger.info(f"User {user_id} favorite categories: {favorite_cat_ids}")
-                
-                # PRIORITY 2: Get categories from liked articles (medium priority)
-                sql_liked = """
-                    SELECT DISTINCT a.category_id
-                    FROM articles a
-                    INNER JOIN article_likes al ON a.id = al.article_id
-                    WHERE al.user_id = %s AND a.category_id IS NOT NULL
-                """
-                cursor.execute(sql_liked, (user_id,))
-                liked_categories = [row['category_id'] for row in cursor.fetchall() if row.get('category_id')]
-                
-                # PRIORITY 3: Get categories from viewed articles (lowest priority)
-                sql_viewed = """
-                    SELECT DISTINCT a.category_id
-                    FROM articles a
-                    INNER JOIN article_views av ON a.id = av.article_id
-                    WHERE av.user_id = %s AND a.category_id IS NOT NULL
-                """
-                cursor.execute(sql_viewed, (user_id,))
-                viewed_categories = [row['category_id'] for row in cursor.fetchall() if row.get('category_id')]
-                
-                # Combine categories with priority: favorite > liked > viewed
-                # Remove duplicates, keeping favorite categories first
-                all_preferred = favorite_cat_ids.copy()
-                
-                # Add liked categories that aren't in favorites
-                for cat_id in liked_categories:
-                    if cat_id not in all_preferred:
-                        all_preferred.append(cat_id)
-                
-                # Add viewed categories that aren't already included
-                for cat_id in viewed_categories:
-                    if cat_id not in all_preferred:
-                        all_preferred.append(cat_id)
-                
-                logger.info(f"User {user_id} all preferred categories: {all_preferred}")
-                
-                # Get excluded article IDs (only liked and saved, not viewed - so we can show viewed articles from favorites)
-                sql_exclude = """
-                    SELECT DISTINCT article_id 
-                    FROM (
-                        SELECT article_id FROM article_likes WHERE user_id = %s
-                        UNION
-                        SELECT article_id FROM saved_articles WHERE user_id = %s
-                    ) as excluded
-                """
-                cursor.execute(sql_exclude, (user_id, user_id))
-                excluded_ids = [row['article_id'] for row in cursor.fetchall()]
-                
-                logger.info(f"User {user_id} excluded article IDs (liked/saved): {len(excluded_ids)}")
+            # Step 1: User profile - favorite, liked and viewed categories plus excluded articles
+            profile = self._get_user_profile(user_id)
+            favorite_cat_ids = profile['favorite_categories']
             
-            # Step 2: Get articles from favorite categories first (highest priority)
-            # ALWAYS prioritize favorite categories - show them even if viewed
-            articles = []
-            if favorite_cat_ids:
-                logger.info(f"Getting articles from favorite categories: {favorite_cat_ids}")
-                # Get articles from favorite categories, excluding only liked/saved
-                # This allows viewed articles from favorites to appear (they should!)
-                articles = self._get_articles_from_categories(favorite_cat_ids, excluded_ids, limit, prioritize=True)
-                logger.info(f"Found {len(articles)} articles from favorite categories (limit was {limit})")
+            # Combine categories with priority: favorite > liked > viewed
+            all_preferred = list(favorite_cat_ids)
+            for cat_id in profile['liked_categories'] + profile['viewed_categories']:
+                if cat_id not in all_preferred:
+                    all_preferred.append(cat_id)
+            other_cats = set(all_preferred) - set(favorite_cat_ids)
+            
+            # Only liked and saved are excluded, not viewed - so we can show viewed articles from favorites
+            excluded_ids = profile['excluded_ids']
             
-            # Step 3: If we don't have enough from favorites, get MORE from favorites (even if viewed)
-            # This ensures we fill up recommendations with favorite category content
-            if len(articles) < limit and favorite_cat_ids:
-                logger.info(f"Only got {len(articles)} articles from favorites, getting more from favorite categories")
-                current_article_ids = [a.id for a in articles if a.id]
-                # Only exclude articles we already have, not viewed ones
-                more_articles = self._get_articles_from_categories(favorite_cat_ids, current_article_ids, limit - len(articles), prioritize=True)
-                articles.extend(more_articles)
-                logger.info(f"Added {len(more_articles)} more articles from favorites, total: {len(articles)}")
+            logger.info(
+                f"User {user_id} preferred categories: {all_preferred} "
+                f"(favorites: {favorite_cat_ids}), excluded article IDs: {len(excluded_ids)}"
+            )
             
-            # Step 4: If we still need more articles, get from other preferred categories
-            if len(articles) < limit:
-                other_cats = [cat_id for cat_id in all_preferred if cat_id not in favorite_cat_ids]
-                if other_cats:
-                    logger.info(f"Getting articles from other preferred categories: {other_cats}")
-                    excluded_all = excluded_ids + [a.id for a in articles if a.id]
-                    more_articles = self._get_articles_from_categories(other_cats, excluded_all, limit - len(articles))
-                    articles.extend(more_articles)
+            # Step 2: One candidate query. Per category it is enough to fetch limit + |excluded|
+            # rows to fill every tier; trending needs at most 2 * limit ids to cover overlaps.
+            trending_ids = self._get_trending_article_ids(excluded_ids, limit * 2)
+            candidates = self._get_candidates(all_preferred, favorite_cat_ids, trending_ids,
+                                              limit + len(excluded_ids))
             
-            # Step 5: Fill remaining slots with trending articles
-            if len(articles) < limit:
-                logger.info(f"Filling remaining {limit - len(articles)} slots with trending articles")
-                excluded_all = excluded_ids + [a.id for a in articles if a.id]
-                trending = self._get_trending_articles(excluded_all, limit - len(articles))
-                articles.extend(trending)
+            chosen = []
+            chosen_ids = set()
             
-            logger.info(f"Returning {len(articles[:limit])} recommended articles for user {user_id}")
-            return articles[:limit]
+            def take(articles, skip_ids):
+                for article in articles:
+                    if len(chosen) >= limit:
+                        return
+                    if article.id in chosen_ids or article.id in skip_ids:
+                        continue
+                    chosen.append(article)
+                    chosen_ids.add(article.id)
+            
+            # Tier 1: favorite categories, newest first, then by engagement
+            # ALWAYS prioritize favorite categories - show them even if viewed
+            favorites = sorted(
+                (a for a in candidates.values() if a.category_id in favorite_cat_ids),
+                key=lambda a: (a.published_at or datetime.min, self._engagement(a, 0.3, 0.7)),
+                reverse=True
+            )
+            take(favorites, excluded_ids)
+            # Not enough: fill up with favorite category content even if liked or saved
+            take(favorites, ())
             
+            # Tier 2: other preferred categories by engagement
+            others = sorted(
+                (a for a in candidates.values() if a.category_id in other_cats),
+                key=lambda a: (self._engagement(a, 0.3, 0.7), a.published_at or datetime.min),
+                reverse=True
+            )
+            take(others, excluded_ids)
+            
+            # Tier 3: trending articles in their precomputed order
+            take((candidates[article_id] for article_id in trending_ids if article_id in candidates), excluded_ids)
+            
+            logger.info(f"Returning {len(chosen)} recommended articles for user {user_id}")
+            return chosen
+        
         except Exception as e:
             logger.error(f"Error getting recommendations: {e}", exc_info=True)
             # Fallback to trending articles
             try:
-                return self._get_trending_articles([], limit)
+                return self.article_repo.find_summaries_by_ids(self._get_trending_article_ids([], limit))
             except Exception as e2:
                 logger.error(f"Error getting trending articles: {e2}", exc_info=True)
                 # Last resort - return published articles
                 return self.article_repo.find_published(limit=limit)
     
-    def _get_articles_from_categories(self, category_ids, excluded_ids, limit, prioritize=False):
-        """Get articles from preferred categories"""
-        articles = []
+    def _get_user_profile(self, user_id):
+        """Favorite (by score), liked and viewed categories and liked/saved article ids in one query"""
+        with db.get_cursor() as cursor:
+            sql = """
+                SELECT 'favorite' as source, category_id as value, preference_score as score
+                FROM user_preferences
+                WHERE user_id = %s AND category_id IS NOT NULL
+                UNION ALL
+                SELECT DISTINCT 'liked', a.category_id, NULL
+                FROM article_likes al
+                INNER JOIN articles a ON a.id = al.article_id
+                WHERE al.user_id = %s AND a.category_id IS NOT NULL
+                UNION ALL
+                SELECT DISTINCT 'viewed', a.category_id, NULL
+                FROM article_views av
+                INNER JOIN articles a ON a.id = av.article_id
+                WHERE av.user_id = %s AND a.category_id IS NOT NULL
+                UNION ALL
+                SELECT 'excluded', article_id, NULL FROM article_likes WHERE user_id = %s
+                UNION ALL
+                SELECT 'excluded', article_id, NULL FROM saved_articles WHERE user_id = %s
+            """
+            cursor.execute(sql, (user_id,) * 5)
+            rows = cursor.fetchall()
         
-        if not category_ids:
-            logger.warning("No category IDs provided to _get_articles_from_categories")
-            return articles
+        favorites = sorted(
+            (row for row in rows if row['source'] == 'favorite'),
+            key=lambda row: row['score'] if row['score'] is not None else 1.0,
+            reverse=True
+        )
+        return {
+            'favorite_categories': [row['value'] for row in favorites],
+            'liked_categories': [row['value'] for row in rows if row['source'] == 'liked'],
+            'viewed_categories': [row['value'] for row in rows if row['source'] == 'viewed'],
+            'excluded_ids': {row['value'] for row in rows if row['source'] == 'excluded'}
+        }
+    
+    def _get_candidates(self, category_ids, favorite_cat_ids, trending_ids, per_category):
+        """Summaries of the top articles of each preferred category plus the trending ids"""
+        if not category_ids and not trending_ids:
+            return {}
         
-        try:
-            with db.get_cursor() as cursor:
-                # Build category placeholders
-                cat_placeholders = ','.join(['%s'] * len(category_ids))
-                
-                # Build exclude clause
-                if excluded_ids:
-                    exclude_placeholders = ','.join(['%s'] * len(excluded_ids))
-                    exclude_clause = f"AND a.id NOT IN ({exclude_placeholders})"
-                    params = category_ids + excluded_ids + [limit]
-                else:
-                    exclude_clause = ""
-                    params = category_ids + [limit]
-                
-                # Query with author and category info
-                # If prioritizing (favorite categories), prioritize by recency first, then engagement
-                if prioritize:
-                    order_by = "a.published_at DESC, (a.views_count * 0.3 + a.likes_count * 0.7) DESC"
-                else:
-                    order_by = "(a.views_count * 0.3 + a.likes_count * 0.7) DESC, a.published_at DESC"
-                
-                sql = f"""
-                    SELECT a.*, 
-                           u.username as author_username, u.first_name as author_first_name, u.last_name as author_last_name,
-                           c.name as category_name, c.slug as category_slug
+        filters = []
+        params = []
+        
+        # Favorites rank by recency, other categories by engagement (see the tiers above)
+        if favorite_cat_ids:
+            fav_placeholders = ','.join(['%s'] * len(favorite_cat_ids))
+            recency_rank = f"CASE WHEN a.category_id IN ({fav_placeholders}) THEN a.published_at END DESC,"
+            params.extend(favorite_cat_ids)
+        else:
+            recency_rank = ""
+        
+        if category_ids:
+            filters.append(f"a.category_id IN ({','.join(['%s'] * len(category_ids))})")
+            params.extend(category_ids)
+        if trending_ids:
+            trending_placeholders = ','.join(['%s'] * len(trending_ids))
+            filters.append(f"a.id IN ({trending_placeholders})")
+            params.extend(trending_ids)
+        
+        outer_filter = "category_rank <= %s"
+        params.append(per_category)
+        if trending_ids:
+            outer_filter += f" OR id IN ({trending_placeholders})"
+            params.extend(trending_ids)
+        
+        with db.get_cursor() as cursor:
+            sql = f"""
+                SELECT * FROM (
+                    SELECT {SUMMARY_COLUMNS},
+                           ROW_NUMBER() OVER (
+                               PARTITION BY a.category_id
+                               ORDER BY {recency_rank}
+                                        (a.views_count * 0.3 + a.likes_count * 0.7) DESC,
+                                        a.published_at DESC
+                           ) as category_rank
                     FROM articles a
-                    LEFT JOIN users u ON a.author_id = u.id
-                    LEFT JOIN categories c ON a.category_id = c.id
+                    {SUMMARY_JOINS}
                     WHERE a.status = 'published'
-                    AND a.category_id IN ({cat_placeholders})
-                    {exclude_clause}
-                    ORDER BY {order_by}
-                    LIMIT %s
-                """
-                
-                logger.debug(f"Executing query for categories {category_ids} with exclude {len(excluded_ids) if excluded_ids else 0} articles, limit {limit}")
-                cursor.execute(sql, params)
-                results = cursor.fetchall()
-                
-                logger.info(f"Query returned {len(results)} articles from categories {category_ids}")
-                
-                for row in results:
-                    try:
-                        article = Article.from_dict(dict(row))
-                        # Load author if available
-                        if row.get('author_username'):
-                            from app.models.user import User
-                            article.author = User(
-                                id=row.get('author_id'),
-                                username=row.get('author_username'),
-                                first_name=row.get('author_first_name'),
-                                last_name=row.get('author_last_name')
-                            )
-                        # Load category if available
-                        if row.get('category_name'):
-                            from app.models.category import Category
-                            article.category = Category(
-                                id=row.get('category_id'),
-                                name=row.get('category_name'),
-                                slug=row.get('category_slug')
-                            )
-                        articles.append(article)
-                    except Exception as e:
-                        logger.error(f"Error parsing article: {e}", exc_info=True)
-                        continue
-        except Exception as e:
-            logger.error(f"Error getting articles from categories: {e}", exc_info=True)
+                    AND ({' OR '.join(filters)})
+                ) candidates
+                WHERE {outer_filter}
+            """
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
         
-        return articles
+        candidates = {}
+        for row in rows:
+            try:
+                row.pop('category_rank', None)
+                article = ArticleSummary.from_dict(row)
+                candidates[article.id] = article
+            except Exception as e:
+                logger.error(f"Error parsing article: {e}", exc_info=True)
+        return candidates
     
-    def _get_trending_articles(self, excluded_ids, limit):
-        """Get trending articles based on views and likes"""
-        articles = []
-        
+    @staticmethod
+    def _engagement(article, view_weight, like_weight):
+        return (article.views_count or 0) * view_weight + (article.likes_count or 0) * like_weight
+    
+    def _get_trending_article_ids(self, excluded_ids, limit):
+        """Get ids of trending articles from the precomputed ranking"""
         try:
-            with db.get_cursor() as cursor:
-                if excluded_ids:
-                    exclude_placeholders = ','.join(['%s'] * len(excluded_ids))
-                    exclude_clause = f"AND a.id NOT IN ({exclude_placeholders})"
-                    params = excluded_ids + [limit]
-                else:
-                    exclude_clause = ""
-                    params = [limit]
-                
-                sql = f"""
-                    SELECT a.*,
-                           u.username as author_username, u.first_name as author_first_name, u.last_name as author_last_name,
-                           c.name as category_name, c.slug as category_slug
-                    FROM articles a
-                    LEFT JOIN users u ON a.author_id = u.id
-                    LEFT JOIN categories c ON a.category_id = c.id
-                    WHERE a.status = 'published'
-                    {exclude_clause}
-                    ORDER BY 
-                        (a.views_count * 0.4 + a.likes_count * 0.6) DESC,
-                        a.published_at DESC
-                    LIMIT %s
-                """
-                
-                cursor.execute(sql, params)
-                results = cursor.fetchall()
-                
-                for row in results:
-                    try:
-                        article = Article.from_dict(dict(row))
-                        # Load author if available
-                        if row.get('author_username'):
-                            from app.models.user import User
-                            article.author = User(
-                                id=row.get('author_id'),
-                                username=row.get('author_username'),
-                                first_name=row.get('author_first_name'),
-                                last_name=row.get('author_last_name')
-                            )
-                        # Load category if available
-                        if row.get('category_name'):
-                            from app.models.category import Category
-                            article.category = Category(
-                                id=row.get('category_id'),
-                                name=row.get('category_name'),
-                                slug=row.get('category_slug')
-                            )
-                        articles.append(article)
-                    except Exception as e:
-                        logger.error(f"Error parsing trending article: {e}", exc_info=True)
-                        continue
+            return trending_service.get_trending_ids(limit, exclude=excluded_ids)
         except Exception as e:
             logger.error(f"Error getting trending articles: {e}", exc_info=True)
-        
-        return articles
+            return []
     
     def record_view(self, user_id, article_id, ip_address=None):
-        """Record article view for personalization"""
+        """Record article view for personalization (buffered, written in batches)"""
+        view_counter.add_user_view(article_id, user_id, ip_address)
+    
+    def record_views_batch(self, views):
+        """Persist buffered views ({(article_id, user_id): ip_address}) and update preferences.
+        
+        Views and preference increments commit in one transaction, so a failed
+        flush that is retried never skips increments of views it already wrote.
+        """
+        if not views:
+            return
+        article_ids = sorted({article_id for article_id, _ in views})
+        user_ids = sorted({user_id for _, user_id in views})
+        
         with db.get_cursor() as cursor:
-            # Check if already viewed
-            sql_check = """
-                SELECT * FROM article_views
-                WHERE article_id = %s AND user_id = %s
+            # Skip views already recorded
+            article_placeholders = ','.join(['%s'] * len(article_ids))
+            user_placeholders = ','.join(['%s'] * len(user_ids))
+            sql_check = f"""
+                SELECT article_id, user_id FROM article_views
+                WHERE article_id IN ({article_placeholders}) AND user_id IN ({user_placeholders})
             """
-            cursor.execute(sql_check, (article_id, user_id))
-            if cursor.fetchone():
-                return  # Already viewed
+            cursor.execute(sql_check, article_ids + user_ids)
+            existing = {(row['article_id'], row['user_id']) for row in cursor.fetchall()}
+            new_views = [(article_id, user_id, ip_address)
+                         for (article_id, user_id), ip_address in views.items()
+                         if (article_id, user_id) not in existing]
+            if not new_views:
+                return
             
-            # Record view
+            # Record views in one multi-row INSERT
             sql_insert = """
                 INSERT INTO article_views (article_id, user_id, ip_address)
                 VALUES (%s, %s, %s)
             """
-            cursor.execute(sql_insert, (article_id, user_id, ip_address))
+            cursor.executemany(sql_insert, new_views)
             
-            # Update preference based on article category
-            sql_article = "SELECT category_id FROM articles WHERE id = %s"
-            cursor.execute(sql_article, (article_id,))
-            article = cursor.fetchone()
+            # Update preferences based on article categories
+            sql_articles = f"SELECT id, category_id FROM articles WHERE id IN ({article_placeholders})"
+            cursor.execute(sql_articles, article_ids)
+            categories = {row['id']: row['category_id'] for row in cursor.fetchall() if row.get('category_id')}
+            increments = {}
+            for article_id, user_id, _ in new_views:
+                if article_id in categories:
+                    key = (user_id, categories[article_id])
+                    increments[key] = increments.get(key, 0) + 0.1
+            if not increments:
+                return
             
-            if article and article.get('category_id'):
-                self.update_user_preferences(user_id, article['category_id'], increment=0.1)
+            # All increments in one upsert (unique key on user_id, category_id; see migration 004)
+            values = ','.join(['(%s, %s, LEAST(5.0, %s))'] * len(increments))
+            params = []
+            for (user_id, category_id), increment in sorted(increments.items()):
+                params.extend([user_id, category_id, increment])
+            sql_preferences = f"""
+                INSERT INTO user_preferences (user_id, category_id, preference_score)
+                VALUES {values}
+                ON DUPLICATE KEY UPDATE
+                    preference_score = LEAST(5.0, preference_score + VALUES(preference_score))
+            """
+            cursor.execute(sql_preferences, params)
     
     def record_like(self, user_id, article_id):
         """Record article like for personalization (higher weight than view)"""
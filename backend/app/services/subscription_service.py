@@ -5,10 +5,19 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from app.repositories.user_repository import UserRepository
 from app.database import db
+from app.cache import TTLCache
+from config import config
 import logging
 
 logger = logging.getLogger(__name__)
 
+PREMIUM_TIER_TYPES = ('paid', 'student', 'corporate')
+
+# user_id -> (tier_type, end_date) of the active subscription, or None without one.
+# Shared by all SubscriptionService instances; entries expire when the subscription ends.
+_entitlement_cache = TTLCache(max_size=config.ENTITLEMENT_CACHE_SIZE)
+_NOT_CACHED = object()
+
 
 class SubscriptionStrategy(ABC):
     """Abstract base class for subscription strategies"""
@@ -165,24 +174,65 @@ class SubscriptionService:
             cursor.execute(sql, (user_id, tier_id, start_date, end_date, True))
             subscription_id = cursor.lastrowid
             
-            return {
-                'id': subscription_id,
-                'tier_name': tier['name'],
-                'tier_type': tier['type'],
-                'price': final_price,
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
-                'features': strategy.get_features()
-            }
+            # Drop the cached entitlement now and again once the new row is committed,
+            # so concurrent requests cannot re-cache the state from before it
+            self.invalidate_entitlement(user_id)
+        
+        # After the block: outside a request on_commit runs at once, and only now is the row committed
+        db.on_commit(lambda: self.invalidate_entitlement(user_id))
+        
+        return {
+            'id': subscription_id,
+            'tier_name': tier['name'],
+            'tier_type': tier['type'],
+            'price': final_price,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'features': strategy.get_features()
+        }
     
     def has_premium_access(self, user_id):
         """Check if user has premium access"""
+        entitlement = self.get_entitlement(user_id)
+        if not entitlement:
+            return False
+        
+        tier_type, _ = entitlement
+        return tier_type in PREMIUM_TIER_TYPES
+    
+    def get_entitlement(self, user_id):
+        """(tier_type, end_date) of the user's active subscription or None, cached until end_date"""
+        if isinstance(user_id, str):
+            try:
+                user_id = int(user_id)
+            except (ValueError, TypeError):
+                logger.error(f"Invalid user_id format: {user_id}")
+                return None
+        
+        entitlement = _entitlement_cache.get(user_id, _NOT_CACHED)
+        if entitlement is not _NOT_CACHED:
+            return entitlement
+        
         subscription = self.get_user_subscription(user_id)
         if not subscription:
-            return False
+            # Short-lived so subscriptions created by other processes show up quickly
+            _entitlement_cache.set(user_id, None, ttl=config.ENTITLEMENT_NEGATIVE_TTL)
+            return None
         
-        tier_type = subscription['tier_type']
-        return tier_type in ['paid', 'student', 'corporate']
+        end_date = subscription['end_date']
+        entitlement = (subscription['tier_type'], end_date)
+        expires_at = end_date.timestamp() if isinstance(end_date, datetime) else None
+        _entitlement_cache.set(user_id, entitlement, expires_at=expires_at,
+                               ttl=None if expires_at else config.ENTITLEMENT_NEGATIVE_TTL)
+        return entitlement
+    
+    def invalidate_entitlement(self, user_id):
+        """Forget the cached entitlement of a user"""
+        _entitlement_cache.invalidate(user_id)
+    
+    def entitlement_cache_stats(self):
+        """Entitlement cache counters"""
+        return _entitlement_cache.stats()
     
     def get_all_tiers(self):
         """Get all available subscription tiers"""
@@ -0,0 +1,126 @@
+"""
+Trending Service - precomputed trending articles, refreshed periodically and on view flushes
+"""
+from app.database import db
+from app.trending import TrendingRanking
+from app.services.view_counter import view_counter
+from config import config
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TrendingService:
+    """Serves trending article ids from an in-memory ranking.
+    
+    A background thread started by start() loads the ranking from the
+    database and reloads it every refresh_interval seconds, so no request
+    waits for the full-table load; flushed view counts are applied in between
+    without a database round-trip. Until the first load completes, requests
+    get the newest published articles instead.
+    """
+    
+    def __init__(self, ranking, refresh_interval=300):
+        self.ranking = ranking
+        self.refresh_interval = refresh_interval
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._built = False
+        self._stats = {'refreshes': 0, 'view_flushes': 0, 'last_refresh_seconds': None}
+    
+    def get_trending_ids(self, limit=10, category_id=None, exclude=None):
+        """Ids of trending published articles, optionally within one category"""
+        if self._thread is None:
+            self.start()
+        if not self._built:
+            return self._newest_ids(limit, category_id, exclude)
+        return self.ranking.top(limit, category_id=category_id, exclude=exclude)
+    
+    def start(self):
+        """Load the ranking and keep it refreshed on a background thread; safe to call repeatedly"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='trending-refresh', daemon=True)
+            self._thread.start()
+    
+    def refresh(self):
+        """Reload counters of all published articles and re-rank them"""
+        started = time.monotonic()
+        with db.get_cursor() as cursor:
+            sql = """
+                SELECT id, category_id, views_count, likes_count,
+                       COALESCE(published_at, created_at) as published_at
+                FROM articles
+                WHERE status = 'published'
+            """
+            cursor.execute(sql)
+            rows = [
+                (row['id'], row['category_id'], row['views_count'], row['likes_count'], row['published_at'])
+                for row in cursor.fetchall()
+            ]
+        
+        self.ranking.rebuild(rows)
+        self._built = True
+        self._stats['refreshes'] += 1
+        self._stats['last_refresh_seconds'] = round(time.monotonic() - started, 3)
+        logger.debug(f"Trending ranking refreshed for {len(rows)} articles")
+    
+    def on_views_flushed(self, deltas):
+        """View counter flush listener: fold the new views into the ranking"""
+        if self._built and self.ranking.apply_view_deltas(deltas):
+            self._stats['view_flushes'] += 1
+    
+    def stats(self):
+        """Ranking size and refresh counters"""
+        stats = dict(self._stats)
+        stats['articles'] = len(self.ranking)
+        stats['decay'] = self.ranking.decay
+        stats['ranked_at'] = self.ranking.ranked_at.isoformat() if self.ranking.ranked_at else None
+        stats['refresh_interval'] = self.refresh_interval
+        return stats
+    
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Trending {'refresh' if self._built else 'load'} failed: {e}")
+            # A failed first load is retried sooner than a regular refresh
+            time.sleep(self.refresh_interval if self._built else min(self.refresh_interval, 10))
+    
+    @staticmethod
+    def _newest_ids(limit, category_id=None, exclude=None):
+        """Stand-in for the ranking while it loads: newest published articles"""
+        conditions = ["status = 'published'"]
+        params = []
+        if category_id is not None:
+            conditions.append("category_id = %s")
+            params.append(category_id)
+        if exclude:
+            conditions.append(f"id NOT IN ({','.join(['%s'] * len(exclude))})")
+            params.extend(exclude)
+        with db.get_cursor() as cursor:
+            sql = f"""
+                SELECT id FROM articles
+                WHERE {' AND '.join(conditions)}
+                ORDER BY COALESCE(published_at, created_at) DESC
+                LIMIT %s
+            """
+            cursor.execute(sql, params + [limit])
+            return [row['id'] for row in cursor.fetchall()]
+
+
+# Global trending service instance
+trending_service = TrendingService(
+    TrendingRanking(
+        top_n=config.TRENDING_TOP_N,
+        decay=config.TRENDING_DECAY,
+        half_life_hours=config.TRENDING_HALF_LIFE_HOURS,
+        gravity=config.TRENDING_GRAVITY
+    ),
+    refresh_interval=config.TRENDING_REFRESH_INTERVAL
+)
+view_counter.add_flush_listener(trending_service.on_views_flushed)
@@ -0,0 +1,168 @@
+"""
+View Counter Service - buffered, batched article view counting
+"""
+from app.repositories.article_repository import ArticleRepository
+from config import config
+from datetime import datetime
+import atexit
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounterBuffer:
+    """Aggregates article views in memory and flushes them to the database in batches"""
+    
+    def __init__(self, flush_interval=5.0, batch_size=500):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+        self._deltas = {}  # article_id -> views not yet written to articles.views_count
+        self._views = {}   # (article_id, user_id) -> ip_address not yet written to article_views
+        self._listeners = []
+        self._stats = {
+            'flushes': 0,
+            'failed_flushes': 0,
+            'flushed_views': 0,
+            'flushed_view_rows': 0,
+            'last_flush_at': None
+        }
+    
+    def add_view(self, article_id):
+        """Count one anonymous or authenticated view of an article"""
+        with self._lock:
+            self._deltas[article_id] = self._deltas.get(article_id, 0) + 1
+            pending = len(self._deltas) + len(self._views)
+        self._after_add(pending)
+    
+    def add_user_view(self, article_id, user_id, ip_address=None):
+        """Queue a personalised view record; repeated views by the same user collapse"""
+        with self._lock:
+            self._views.setdefault((article_id, user_id), ip_address)
+            pending = len(self._deltas) + len(self._views)
+        self._after_add(pending)
+    
+    def pending_views(self, article_id):
+        """Views of an article counted but not yet flushed"""
+        with self._lock:
+            return self._deltas.get(article_id, 0)
+    
+    def add_flush_listener(self, listener):
+        """Register a callable invoked with the flushed deltas after each successful flush"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def flush(self):
+        """Write all pending deltas and view rows; failed parts are kept for the next flush"""
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._deltas = self._deltas, {}
+                views, self._views = self._views, {}
+            
+            if not deltas and not views:
+                return 0
+            
+            flushed = 0
+            failed = False
+            
+            if deltas:
+                try:
+                    ArticleRepository().increment_views_batch(deltas)
+                    flushed += sum(deltas.values())
+                except Exception as e:
+                    logger.error(f"Failed to flush {len(deltas)} article view counters: {e}")
+                    self._restore(deltas=deltas)
+                    failed = True
+                    deltas = {}
+            
+            if views:
+                try:
+                    from app.services.recommendation_service import RecommendationService
+                    RecommendationService().record_views_batch(views)
+                except Exception as e:
+                    logger.error(f"Failed to flush {len(views)} article view records: {e}")
+                    self._restore(views=views)
+                    failed = True
+                    views = {}
+            
+            with self._lock:
+                self._stats['flushes'] += 1
+                self._stats['failed_flushes'] += 1 if failed else 0
+                self._stats['flushed_views'] += flushed
+                self._stats['flushed_view_rows'] += len(views)
+                self._stats['last_flush_at'] = datetime.now().isoformat()
+            
+            if deltas:
+                for listener in self._listeners:
+                    try:
+                        listener(deltas)
+                    except Exception as e:
+                        logger.warning(f"View flush listener failed: {e}")
+            
+            logger.debug(f"Flushed {flushed} views for {len(deltas)} articles and {len(views)} view records")
+            return flushed
+    
+    def stats(self):
+        """Pending and flushed counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending_articles'] = len(self._deltas)
+            stats['pending_views'] = sum(self._deltas.values())
+            stats['pending_view_rows'] = len(self._views)
+        stats['flush_interval'] = self.flush_interval
+        stats['batch_size'] = self.batch_size
+        return stats
+    
+    def shutdown(self):
+        """Stop the background flusher and write everything still buffered"""
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+    
+    def _after_add(self, pending):
+        if self._thread is None:
+            self._start()
+        if pending >= self.batch_size:
+            # Flush from the background thread, never inside the caller's request transaction
+            self._wakeup.set()
+    
+    def _start(self):
+        with self._lock:
+            if self._thread is not None or self._stopped:
+                return
+            self._thread = threading.Thread(target=self._run, name='view-counter-flusher', daemon=True)
+            self._thread.start()
+        atexit.register(self.shutdown)
+    
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"View counter flush failed: {e}", exc_info=True)
+    
+    def _restore(self, deltas=None, views=None):
+        """Merge unflushed data back so it is retried"""
+        with self._lock:
+            for article_id, delta in (deltas or {}).items():
+                self._deltas[article_id] = self._deltas.get(article_id, 0) + delta
+            for key, ip_address in (views or {}).items():
+                self._views.setdefault(key, ip_address)
+
+
+# Global view counter instance
+view_counter = ViewCounterBuffer(
+    flush_interval=config.VIEW_FLUSH_INTERVAL,
+    batch_size=config.VIEW_FLUSH_BATCH_SIZE
+)
@@ -0,0 +1,156 @@
+"""
+Trending - time-decayed article rankings precomputed in memory
+"""
+from datetime import datetime
+import heapq
+import threading
+
+
+def half_life_decay(age_hours, half_life_hours=24.0):
+    """Weight that halves every half_life_hours"""
+    return 0.5 ** (age_hours / half_life_hours)
+
+
+def gravity_decay(age_hours, gravity=1.8):
+    """Hacker News style gravity: 1 / (age + 2) ^ gravity"""
+    return 1.0 / (age_hours + 2) ** gravity
+
+
+class TrendingRanking:
+    """Top-N articles, overall and per category, by engagement decayed with age.
+    
+    Rows are (id, category_id, views_count, likes_count, published_at).
+    rebuild() scores every article and keeps the top_n per list with bounded
+    heaps; apply_view_deltas() re-scores only the articles whose views changed
+    and merges them into the current lists, so a flush costs O(top_n + changed)
+    regardless of how many articles there are. Scores are taken at the time of
+    the last rebuild: half-life decay keeps the order of untouched articles
+    exact in between, gravity decay is exact again at the next rebuild.
+    Reads are slices of a precomputed list.
+    """
+    
+    def __init__(self, top_n=200, decay='half_life', half_life_hours=24.0, gravity=1.8,
+                 view_weight=0.4, like_weight=0.6):
+        if decay not in ('half_life', 'gravity'):
+            raise ValueError(f"Unknown trending decay: {decay}")
+        self.top_n = top_n
+        self.decay = decay
+        self.half_life_hours = half_life_hours
+        self.gravity = gravity
+        self.view_weight = view_weight
+        self.like_weight = like_weight
+        self._articles = {}  # id -> [category_id, views, likes, published timestamp]
+        self._scored_overall = []  # [(score, published, id)], best first
+        self._scored_by_category = {}
+        self._overall = []
+        self._by_category = {}
+        self._scored_at = 0.0
+        self._lock = threading.Lock()
+        self.ranked_at = None
+    
+    def score(self, views, likes, published_at, now=None):
+        """Trending score of one article"""
+        now = now or datetime.now()
+        published = published_at.timestamp() if isinstance(published_at, datetime) else published_at
+        return self._score(views, likes, published, now.timestamp())
+    
+    def rebuild(self, rows, now=None):
+        """Replace all articles with rows and rank them"""
+        now = now or datetime.now()
+        timestamp = now.timestamp()
+        articles = {}
+        by_category = {}
+        for article_id, category_id, views, likes, published_at in rows:
+            published = published_at.timestamp() if isinstance(published_at, datetime) else 0.0
+            article = articles[article_id] = [category_id, views or 0, likes or 0, published]
+            by_category.setdefault(category_id, []).append(
+                (self._score(article[1], article[2], published, timestamp), published, article_id)
+            )
+        
+        scored_by_category = {
+            category_id: heapq.nlargest(self.top_n, scored)
+            for category_id, scored in by_category.items()
+        }
+        # The overall top-N is within the union of the per-category top-Ns
+        scored_overall = heapq.nlargest(
+            self.top_n, (entry for scored in scored_by_category.values() for entry in scored)
+        )
+        with self._lock:
+            self._articles = articles
+            self._scored_at = timestamp
+            self._publish(scored_overall, scored_by_category, now)
+    
+    def apply_view_deltas(self, deltas, now=None):
+        """Add flushed view counts ({article_id: views}) and re-rank them; unknown ids are ignored"""
+        with self._lock:
+            changed = {}
+            for article_id, delta in deltas.items():
+                article = self._articles.get(article_id)
+                if article is not None:
+                    article[1] += delta
+                    category_id, views, likes, published = article
+                    changed[article_id] = (
+                        category_id, (self._score(views, likes, published, self._scored_at), published, article_id)
+                    )
+            if not changed:
+                return False
+            
+            categories = {category_id for category_id, _ in changed.values()}
+            scored_by_category = dict(self._scored_by_category)
+            for category_id in categories:
+                scored_by_category[category_id] = self._merge(
+                    scored_by_category.get(category_id, []),
+                    changed,
+                    [entry for article_category, entry in changed.values() if article_category == category_id]
+                )
+            scored_overall = self._merge(self._scored_overall, changed, [entry for _, entry in changed.values()])
+            self._publish(scored_overall, scored_by_category, now or datetime.now(), categories)
+        return True
+    
+    def top(self, limit=10, category_id=None, exclude=None):
+        """Ids of the highest ranked articles, skipping excluded ids"""
+        ranked = self._by_category.get(category_id, []) if category_id is not None else self._overall
+        if not exclude:
+            return ranked[:limit]
+        exclude = set(exclude)
+        result = []
+        for article_id in ranked:
+            if article_id not in exclude:
+                result.append(article_id)
+                if len(result) >= limit:
+                    break
+        return result
+    
+    def __len__(self):
+        return len(self._articles)
+    
+    def _score(self, views, likes, published, now):
+        age_hours = max(0.0, (now - published) / 3600.0)
+        if self.decay == 'gravity':
+            weight = gravity_decay(age_hours, self.gravity)
+        else:
+            weight = half_life_decay(age_hours, self.half_life_hours)
+        # +1 keeps fresh articles without engagement ordered by age
+        return (views * self.view_weight + likes * self.like_weight + 1) * weight
+    
+    def _merge(self, scored, changed, entries):
+        """Top-N of scored with the changed articles replaced by their new entries"""
+        kept = [entry for entry in scored if entry[2] not in changed]
+        return heapq.nlargest(self.top_n, kept + entries)
+    
+    def _publish(self, scored_overall, scored_by_category, now, categories=None):
+        """Swap in new ranked lists, re-listing only categories if given; caller holds the lock"""
+        if categories is None:
+            by_category = {}
+            categories = scored_by_category
+        else:
+            by_category = dict(self._by_category)
+        for category_id in categories:
+            by_category[category_id] = [article_id for _, _, article_id in scored_by_category[category_id]]
+        
+        self._scored_overall = scored_overall
+        self._scored_by_category = scored_by_category
+        # Readers pick up the new lists with a single reference swap
+        self._overall = [article_id for _, _, article_id in scored_overall]
+        self._by_category = by_category
+        self.ranked_at = now
@@ -0,0 +1,3 @@
+"""
+Benchmarks - load tests and micro-benchmarks for the Flask API
+"""
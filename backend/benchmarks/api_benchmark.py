@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+API benchmark - scripted user journeys against the Flask API
+
+Boots create_app() in-process against the database from the environment
+(DB_HOST, DB_NAME, ...), optionally seeds it with seed_bulk.py at a preset
+scale, and runs virtual users through reader and member journeys: feed and
+next page, article detail, comments, categories, search, recommended,
+like/save, posting comments and notifications. Each endpoint gets p50/p95/p99
+latency, throughput and database queries per request; the result is written
+as a JSON baseline and can be compared with an earlier one, failing when an
+endpoint got slower or issues more queries.
+
+A disposable MariaDB works as the database:
+    docker run -d --name news-bench -p 3307:3306 -e MARIADB_ROOT_PASSWORD=bench \\
+        -e MARIADB_DATABASE=news_bench mariadb:11
+    (load the schema, then)
+    DB_PORT=3307 DB_PASSWORD=bench DB_NAME=news_bench \\
+        python -m benchmarks.api_benchmark --seed-db --scale small
+
+Usage (from the backend directory):
+    python -m benchmarks.api_benchmark --scale small --out benchmarks/baselines/small.json
+    python -m benchmarks.api_benchmark --scale small --compare benchmarks/baselines/small.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.database import db
+from app.instrumentation import query_instrumentation
+from benchmarks.stats import summary
+import seed_bulk
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+logger = logging.getLogger(__name__)
+
+# seed_bulk.py sizes per scale
+SCALES = {
+    'small': {'users': 2000, 'authors': 50, 'articles': 5000, 'comments': 10000},
+    'medium': {'users': 50000, 'authors': 500, 'articles': 100000, 'comments': 200000},
+    'large': {'users': 500000, 'authors': 2000, 'articles': 1000000, 'comments': 2000000},
+}
+
+# Statement count in the Server-Timing header the query instrumentation adds
+_STATEMENTS = re.compile(r'\bdb;[^,]*desc="(\d+) queries"')
+
+
+def statement_count(response):
+    """Statements the request ran, from the db entry of its Server-Timing header"""
+    match = _STATEMENTS.search(response.headers.get('Server-Timing', ''))
+    return int(match.group(1)) if match else 0
+
+
+class Recorder:
+    """Latency, query count and status of every request, grouped by endpoint"""
+    
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._endpoints = {}
+    
+    def record(self, endpoint, elapsed, queries, ok):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {'samples': [], 'queries': [], 'errors': 0})
+            stats['samples'].append(elapsed)
+            stats['queries'].append(queries)
+            if not ok:
+                stats['errors'] += 1
+    
+    def report(self, duration):
+        endpoints = {}
+        for endpoint, stats in sorted(self._endpoints.items()):
+            result = summary(stats['samples'])
+            result['errors'] = stats['errors']
+            result['throughput_rps'] = round(len(stats['samples']) / duration, 1) if duration else None
+            result['queries_per_request'] = round(sum(stats['queries']) / len(stats['queries']), 2)
+            result['max_queries'] = max(stats['queries'])
+            endpoints[endpoint] = result
+        return endpoints
+
+
+class VirtualUser:
+    """One simulated client running journeys through a Flask test client"""
+    
+    def __init__(self, app, recorder, rng, account=None, password=None, write=True):
+        self.client = app.test_client()
+        self.recorder = recorder
+        self.rng = rng
+        self.account = account
+        self.password = password
+        self.write = write
+        self.headers = {}
+    
+    def request(self, endpoint, method, url, expected=(200,), **kwargs):
+        """Send one request and record it under endpoint; returns the JSON body or None"""
+        started = time.perf_counter()
+        response = self.client.open(url, method=method, headers=self.headers, **kwargs)
+        elapsed = time.perf_counter() - started
+        ok = response.status_code in expected
+        self.recorder.record(endpoint, elapsed, statement_count(response), ok)
+        if not ok:
+            logger.debug(f"{method} {url} -> {response.status_code}")
+        return response.get_json(silent=True) if ok else None
+    
+    def login(self):
+        body = self.request('POST /api/auth/login', 'POST', '/api/auth/login',
+                            json={'email': self.account['email'], 'password': self.password})
+        if body:
+            self.headers = {'Authorization': f"Bearer {body['access_token']}"}
+        return body is not None
+    
+    def run_journey(self):
+        if self.headers:
+            self.member_journey()
+        else:
+            self.reader_journey()
+    
+    def reader_journey(self):
+        """Anonymous reader: feed, next page, an article with comments, categories, search"""
+        articles = self.browse_feed()
+        self.request('GET /api/news/categories', 'GET', '/api/news/categories')
+        if articles:
+            self.read_article(self.pick(articles))
+        word = self.rng.choice(seed_bulk.WORDS)
+        self.request('GET /api/news/search', 'GET', f'/api/news/search?q={word}&limit=20')
+    
+    def member_journey(self):
+        """Signed-in member: feed, recommendations, an article, like/save, comment, notifications"""
+        articles = self.browse_feed()
+        recommended = self.request('GET /api/news/recommended', 'GET', '/api/news/recommended?limit=10')
+        candidates = (recommended or {}).get('articles') or articles
+        if candidates:
+            article_id = self.pick(candidates)
+            self.read_article(article_id)
+            # Like and save toggle: run each twice to leave the data as it was
+            for _ in range(2):
+                self.request('POST /api/news/<id>/like', 'POST', f'/api/news/{article_id}/like')
+                self.request('POST /api/news/<id>/save', 'POST', f'/api/news/{article_id}/save')
+            if self.write:
+                self.request('POST /api/comments/articles/<id>/comments', 'POST',
+                             f'/api/comments/articles/{article_id}/comments', expected=(200, 201),
+                             json={'content': ' '.join(self.rng.choices(seed_bulk.WORDS, k=12))})
+        self.request('GET /api/notifications', 'GET', '/api/notifications?limit=20')
+    
+    def browse_feed(self):
+        params = ''
+        if self.rng.random() < 0.3:
+            params = f'&category_id={self.rng.randint(1, 8)}'
+        body = self.request('GET /api/news', 'GET', f'/api/news?limit=20{params}') or {}
+        articles = body.get('articles') or []
+        if body.get('next_cursor') and self.rng.random() < 0.5:
+            page = self.request('GET /api/news (next page)', 'GET',
+                                f"/api/news?limit=20{params}&cursor={body['next_cursor']}") or {}
+            articles = page.get('articles') or articles
+        return articles
+    
+    def read_article(self, article_id):
+        # Premium articles answer 403 to readers without a subscription; that is a valid outcome
+        self.request('GET /api/news/<id>', 'GET', f'/api/news/{article_id}', expected=(200, 403))
+        self.request('GET /api/comments/articles/<id>/comments', 'GET',
+                     f'/api/comments/articles/{article_id}/comments?limit=20&replies_limit=3')
+    
+    def pick(self, articles):
+        # Readers favour the top of a list
+        index = min(int(self.rng.expovariate(0.3)), len(articles) - 1)
+        return articles[index]['id']
+
+
+def seeded_accounts(limit):
+    """Active reader accounts created by seed_bulk.py, in a stable order"""
+    with db.get_cursor() as cursor:
+        sql = """
+            SELECT id, email FROM users
+            WHERE role = 'user' AND is_active = TRUE AND email LIKE %s
+            ORDER BY id
+            LIMIT %s
+        """
+        cursor.execute(sql, ('%@seed.example', limit))
+        return cursor.fetchall()
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    if args.seed_db:
+        scale = SCALES[args.scale]
+        seed_bulk.seed(seed_bulk.parse_args([
+            '--users', str(scale['users']), '--authors', str(scale['authors']),
+            '--articles', str(scale['articles']), '--comments', str(scale['comments']),
+            '--seed', str(args.seed), '--password', args.password
+        ]))
+    
+    # Queries per request come from the instrumentation's Server-Timing header
+    query_instrumentation.enabled = True
+    app = create_app()
+    recorder = Recorder()
+    members = int(round(args.users * args.member_ratio))
+    accounts = seeded_accounts(members) if members else []
+    if len(accounts) < members:
+        logger.warning(f"Only {len(accounts)} seeded accounts found for {members} members")
+    
+    virtual_users = []
+    for index in range(args.users):
+        account = accounts[index] if index < len(accounts) else None
+        virtual_users.append(VirtualUser(
+            app, recorder, random.Random(args.seed * 1000 + index), account=account,
+            password=args.password, write=not args.read_only
+        ))
+    
+    # Log in and warm caches and the connection pool outside the measurement
+    for user in virtual_users:
+        if user.account:
+            user.login()
+    for _ in range(args.warmup):
+        for user in virtual_users:
+            user.run_journey()
+    
+    def drive(user):
+        for _ in range(args.iterations):
+            user.run_journey()
+    
+    recorder.enabled = True
+    started = time.perf_counter()
+    threads = [threading.Thread(target=drive, args=(user,)) for user in virtual_users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - started
+    recorder.enabled = False
+    
+    endpoints = recorder.report(duration)
+    requests_total = sum(e['count'] for e in endpoints.values())
+    return {
+        'meta': {
+            'scale': args.scale,
+            'seed': args.seed,
+            'virtual_users': args.users,
+            'members': len(accounts),
+            'iterations': args.iterations,
+            'read_only': args.read_only,
+            'duration_s': round(duration, 2),
+            'requests': requests_total,
+            'throughput_rps': round(requests_total / duration, 1) if duration else None,
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        },
+        'endpoints': endpoints
+    }
+
+
+def compare(result, baseline, threshold, query_tolerance):
+    """Markdown table of changes against baseline and the list of regressions"""
+    lines = [
+        '| endpoint | p95 ms (base → now) | p99 ms (base → now) | queries/req (base → now) | |',
+        '|---|---|---|---|---|'
+    ]
+    regressions = []
+    for endpoint, now in result['endpoints'].items():
+        base = baseline['endpoints'].get(endpoint)
+        if not base:
+            lines.append(f"| {endpoint} | new | new | {now['queries_per_request']} | |")
+            continue
+        flags = []
+        if base['p95_ms'] and now['p95_ms'] > base['p95_ms'] * (1 + threshold):
+            flags.append('slower')
+        if now['queries_per_request'] > base['queries_per_request'] + query_tolerance:
+            flags.append('more queries')
+        if flags:
+            regressions.append((endpoint, flags))
+        lines.append(
+            f"| {endpoint} | {base['p95_ms']} → {now['p95_ms']} | {base['p99_ms']} → {now['p99_ms']} | "
+            f"{base['queries_per_request']} → {now['queries_per_request']} | {', '.join(flags)} |"
+        )
+    return '\n'.join(lines), regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Flask API user journeys')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed-db', action='store_true', help='load a dataset of --scale with seed_bulk.py first')
+    parser.add_argument('--seed', type=int, default=42, help='dataset and journey random seed')
+    parser.add_argument('--users', type=int, default=16, help='concurrent virtual users')
+    parser.add_argument('--member-ratio', type=float, default=0.5, help='share of signed-in virtual users')
+    parser.add_argument('--iterations', type=int, default=20, help='journeys per virtual user')
+    parser.add_argument('--warmup', type=int, default=1, help='unmeasured journeys per virtual user')
+    parser.add_argument('--read-only', action='store_true', help='do not post comments')
+    parser.add_argument('--password', default='password123', help='password of the seeded accounts')
+    parser.add_argument('--out', help='write the JSON result here')
+    parser.add_argument('--compare', help='baseline JSON to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative p95 increase')
+    parser.add_argument('--query-tolerance', type=float, default=0.5,
+                        help='allowed increase of queries per request')
+    args = parser.parse_args()
+    
+    result = run(args)
+    output = json.dumps(result, indent=2)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+        logger.info(f"Results written to {args.out}")
+    else:
+        print(output)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        table, regressions = compare(result, baseline, args.threshold, args.query_tolerance)
+        print(table)
+        if regressions:
+            for endpoint, flags in regressions:
+                logger.error(f"Regression in {endpoint}: {', '.join(flags)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
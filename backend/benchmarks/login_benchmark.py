@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Login benchmark - password check latency under a burst of concurrent logins
+
+Runs the burst twice in-process: bcrypt inline on every request thread (the
+old behaviour) and through the bounded password hashing pool. Meanwhile a
+probe thread renders a feed-sized JSON payload in a loop, standing in for
+feed requests, so the report shows login p50/p99 next to feed p50/p99.
+
+With --url the burst is sent to a running server's login endpoint instead.
+
+Usage:
+    python benchmarks/login_benchmark.py --logins 400 --concurrency 64 --rounds 12
+    python benchmarks/login_benchmark.py --url http://localhost:5000/api/auth/login \\
+        --email user@example.com --password secret
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.passwords import PasswordHasher, PasswordHasherBusy
+from benchmarks.stats import summary
+
+
+class FeedProbe:
+    """Measures how long a small feed-like unit of work takes while logins run"""
+    
+    def __init__(self):
+        self.samples = []
+        self._stop = threading.Event()
+        self._payload = {
+            'articles': [
+                {'id': i, 'title': f'Article {i}', 'excerpt': 'x' * 200, 'views_count': i * 7}
+                for i in range(20)
+            ]
+        }
+    
+    def run(self):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            json.dumps(self._payload)
+            self.samples.append(time.perf_counter() - started)
+            time.sleep(0.005)
+    
+    def stop(self):
+        self._stop.set()
+
+
+def run_burst(check, logins, concurrency):
+    """Run logins checks on concurrency request threads; latency samples, rejections and errors"""
+    samples = []
+    rejected = [0]
+    lock = threading.Lock()
+    
+    def login():
+        started = time.perf_counter()
+        try:
+            check()
+        except PasswordHasherBusy:
+            with lock:
+                rejected[0] += 1
+            return
+        elapsed = time.perf_counter() - started
+        with lock:
+            samples.append(elapsed)
+    
+    probe = FeedProbe()
+    probe_thread = threading.Thread(target=probe.run, daemon=True)
+    probe_thread.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(login) for _ in range(logins)]
+    duration = time.perf_counter() - started
+    probe.stop()
+    probe_thread.join()
+    
+    # Anything but a rejection (HTTP 401/500, connection errors, ...) is an error
+    errors = {}
+    for future in futures:
+        error = future.exception()
+        if error is not None:
+            message = f"{type(error).__name__}: {error}"
+            errors[message] = errors.get(message, 0) + 1
+    
+    return {
+        'duration_s': round(duration, 2),
+        'logins_per_s': round(len(samples) / duration, 1),
+        'rejected': rejected[0],
+        'errors': sum(errors.values()),
+        'error_messages': dict(sorted(errors.items(), key=lambda item: -item[1])[:5]),
+        'login': summary(samples),
+        'feed_probe': summary(probe.samples)
+    }
+
+
+def run_in_process(args):
+    hasher = PasswordHasher(rounds=args.rounds, max_workers=args.workers, max_pending=args.max_pending)
+    password_hash = hasher.hash(args.password)
+    
+    results = {
+        'inline': run_burst(lambda: hasher.verify_and_update(args.password, password_hash),
+                            args.logins, args.concurrency),
+        'pool': run_burst(lambda: hasher.check(args.password, password_hash),
+                          args.logins, args.concurrency)
+    }
+    results['pool']['hasher'] = hasher.stats()
+    return results
+
+
+def run_against_server(args):
+    body = json.dumps({'email': args.email, 'password': args.password}).encode('utf-8')
+    
+    def check():
+        request = urllib.request.Request(args.url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 503:
+                raise PasswordHasherBusy()
+            raise
+    
+    return {'server': run_burst(check, args.logins, args.concurrency)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure login latency under concurrent logins')
+    parser.add_argument('--logins', type=int, default=200, help='total login attempts')
+    parser.add_argument('--concurrency', type=int, default=32, help='concurrent request threads')
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt cost (in-process mode)')
+    parser.add_argument('--workers', type=int, default=4, help='hashing pool size (in-process mode)')
+    parser.add_argument('--max-pending', type=int, default=256, help='hashing queue bound (in-process mode)')
+    parser.add_argument('--url', help='login endpoint of a running server')
+    parser.add_argument('--email', default='user@example.com')
+    parser.add_argument('--password', default='password123')
+    args = parser.parse_args()
+    
+    results = run_against_server(args) if args.url else run_in_process(args)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+"""
+Benchmark statistics - latency percentiles and summaries
+"""
+import statistics
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of samples (seconds), in milliseconds"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return round(ordered[index] * 1000, 1)
+
+
+def summary(samples):
+    """Count, p50/p95/p99, max and mean of latency samples in milliseconds"""
+    return {
+        'count': len(samples),
+        'p50_ms': percentile(samples, 0.50),
+        'p95_ms': percentile(samples, 0.95),
+        'p99_ms': percentile(samples, 0.99),
+        'max_ms': percentile(samples, 1.0),
+        'mean_ms': round(statistics.mean(samples) * 1000, 1) if samples else None
+    }
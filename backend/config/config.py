@@ -30,6 +30,25 @@ class Config:
         self.DB_PASSWORD = os.getenv('DB_PASSWORD', '')
         self.DB_NAME = os.getenv('DB_NAME', 'news_newspaper')
         
+        # Connection pool configuration
+        self.DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+        self.DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', 20))
+        self.DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+        self.DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))
+        self.DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True') == 'True'
+        
+        # Request metrics (/metrics, Prometheus text format)
+        self.METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+        
+        # Query instrumentation (per-request counts, Server-Timing, slow query log); follows DEBUG unless set
+        self.QUERY_INSTRUMENTATION_ENABLED = os.getenv('QUERY_INSTRUMENTATION_ENABLED', str(self.DEBUG)).lower() == 'true'
+        self.SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
+        self.SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1))
+        self.QUERY_REPEAT_WARNING = int(os.getenv('QUERY_REPEAT_WARNING', 10))
+        self.QUERY_DEBUG_HISTORY = int(os.getenv('QUERY_DEBUG_HISTORY', 100))
+        # /api/_debug/queries (admins only); off unless explicitly enabled
+        self.QUERY_DEBUG_ENDPOINT = os.getenv('QUERY_DEBUG_ENDPOINT', 'False').lower() == 'true'
+        
         # JWT configuration
         self.JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', self.SECRET_KEY)
         # Default to 7 days (604800 seconds) for development, can be changed in .env
@@ -39,10 +58,63 @@ class Config:
         self.API_PREFIX = '/api'
         self.CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
         
+        # View counter buffering
+        self.VIEW_FLUSH_INTERVAL = float(os.getenv('VIEW_FLUSH_INTERVAL', 5))
+        self.VIEW_FLUSH_BATCH_SIZE = int(os.getenv('VIEW_FLUSH_BATCH_SIZE', 500))
+        
+        # Article search index
+        self.SEARCH_INDEX_ENABLED = os.getenv('SEARCH_INDEX_ENABLED', 'True').lower() == 'true'
+        self.SEARCH_REFRESH_INTERVAL = float(os.getenv('SEARCH_REFRESH_INTERVAL', 60))
+        
+        # Trending articles
+        self.TRENDING_REFRESH_INTERVAL = float(os.getenv('TRENDING_REFRESH_INTERVAL', 300))
+        self.TRENDING_TOP_N = int(os.getenv('TRENDING_TOP_N', 200))
+        self.TRENDING_DECAY = os.getenv('TRENDING_DECAY', 'half_life')
+        self.TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', 24))
+        self.TRENDING_GRAVITY = float(os.getenv('TRENDING_GRAVITY', 1.8))
+        
+        # HTTP caching of read endpoints (max ages apply to anonymous responses)
+        self.HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'True').lower() == 'true'
+        self.HTTP_CACHE_MAX_AGE = int(os.getenv('HTTP_CACHE_MAX_AGE', 30))
+        self.HTTP_CACHE_CATALOG_MAX_AGE = int(os.getenv('HTTP_CACHE_CATALOG_MAX_AGE', 300))
+        
+        # Anonymous feed page cache
+        self.FEED_CACHE_ENABLED = os.getenv('FEED_CACHE_ENABLED', 'True').lower() == 'true'
+        self.FEED_CACHE_SIZE = int(os.getenv('FEED_CACHE_SIZE', 1000))
+        self.FEED_CACHE_TTL = float(os.getenv('FEED_CACHE_TTL', 30))
+        
+        # Category catalog reload interval (picks up writes made by other processes)
+        self.CATEGORY_CATALOG_TTL = float(os.getenv('CATEGORY_CATALOG_TTL', 300))
+        
+        # Principal (role / active flag) cache for authorization checks
+        self.PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', 10000))
+        self.PRINCIPAL_CACHE_TTL = float(os.getenv('PRINCIPAL_CACHE_TTL', 60))
+        
+        # Password hashing (bcrypt cost and the worker pool that runs it)
+        self.PASSWORD_HASH_ROUNDS = int(os.getenv('PASSWORD_HASH_ROUNDS', 12))
+        self.PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 4))
+        self.PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))
+        
+        # Premium entitlement cache
+        self.ENTITLEMENT_CACHE_SIZE = int(os.getenv('ENTITLEMENT_CACHE_SIZE', 10000))
+        self.ENTITLEMENT_NEGATIVE_TTL = float(os.getenv('ENTITLEMENT_NEGATIVE_TTL', 60))
+        
         # Notification configuration
         self.BREAKING_NEWS_ENABLED = True
+        self.NOTIFICATION_FANOUT_CHUNK_SIZE = int(os.getenv('NOTIFICATION_FANOUT_CHUNK_SIZE', 1000))
+        self.NOTIFICATION_FANOUT_WORKERS = int(os.getenv('NOTIFICATION_FANOUT_WORKERS', 1))
         self.DAILY_DIGEST_TIME = os.getenv('DAILY_DIGEST_TIME', '08:00')
         
+        # Notification delivery (outbox and notification_worker.py)
+        self.NOTIFICATION_WORKER_CONCURRENCY = int(os.getenv('NOTIFICATION_WORKER_CONCURRENCY', 4))
+        self.NOTIFICATION_BATCH_SIZE = int(os.getenv('NOTIFICATION_BATCH_SIZE', 100))
+        self.NOTIFICATION_POLL_INTERVAL = float(os.getenv('NOTIFICATION_POLL_INTERVAL', 1))
+        self.NOTIFICATION_MAX_ATTEMPTS = int(os.getenv('NOTIFICATION_MAX_ATTEMPTS', 8))
+        self.NOTIFICATION_RETRY_BASE = float(os.getenv('NOTIFICATION_RETRY_BASE', 5))
+        self.NOTIFICATION_RETRY_MAX = float(os.getenv('NOTIFICATION_RETRY_MAX', 3600))
+        self.NOTIFICATION_LEASE_SECONDS = int(os.getenv('NOTIFICATION_LEASE_SECONDS', 300))
+        self.NOTIFICATION_OUTBOX_RETENTION_DAYS = int(os.getenv('NOTIFICATION_OUTBOX_RETENTION_DAYS', 7))
+        
     @property
     def DATABASE_URL(self):
         """Construct database connection URL"""
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Notification worker - delivers queued notifications in batches per channel
+
+Request handlers only write notifications and their outbox rows
+(services/notification_outbox.py); this process claims due deliveries in
+batches, hands each batch to the observers of its channel (email, push) and
+retries failed deliveries with exponential backoff; observers can fail
+single notifications of a batch without failing the rest. Run as many
+workers as needed: claims skip rows other workers hold.
+
+Usage:
+    python notification_worker.py
+    python notification_worker.py --concurrency 8 --batch-size 200 --channels email
+    python notification_worker.py --once   # drain what is due and exit
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import config
+from app.database import db
+from app.services.notification_service import NotificationDeliveryError, NotificationService
+from app.services.notification_outbox import notification_outbox
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('notification_worker')
+
+# Seconds between lease expiry checks and between purges of delivered rows
+MAINTENANCE_INTERVAL = 60
+PURGE_INTERVAL = 3600
+
+
+class NotificationWorker:
+    """Threads that claim and deliver outbox batches until stopped"""
+    
+    def __init__(self, channels, concurrency, batch_size, poll_interval):
+        self.service = NotificationService()
+        self.channels = channels
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {'batches': 0, 'delivered': 0, 'failed': 0}
+    
+    def run_once(self, thread_name='main'):
+        """Deliver one batch of every channel; returns the number of deliveries claimed"""
+        claimed = 0
+        worker_id = f"{self.worker_id}:{thread_name}"
+        for channel in self.channels:
+            rows = notification_outbox.claim(channel, self.batch_size, worker_id)
+            if not rows:
+                continue
+            claimed += len(rows)
+            delivered, failed, error = self.deliver(channel, rows)
+            notification_outbox.mark_delivered(delivered, worker_id)
+            notification_outbox.mark_failed(failed, error, worker_id)
+            self._count(delivered=len(delivered), failed=len(failed))
+        return claimed
+    
+    def deliver(self, channel, rows):
+        """Deliver rows in one batch; returns (delivered rows, failed rows, error).
+        
+        A NotificationDeliveryError fails only the rows it names; any other
+        error fails the whole batch, which goes to backoff without another call.
+        """
+        try:
+            self.service.deliver(channel, [row['payload'] for row in rows])
+            return rows, [], None
+        except NotificationDeliveryError as e:
+            failed_positions = set(e.failed)
+            failed = [row for position, row in enumerate(rows) if position in failed_positions]
+            delivered = [row for position, row in enumerate(rows) if position not in failed_positions]
+            logger.warning(f"Delivery of {len(failed)} of {len(rows)} {channel} notifications failed: {e}")
+            return delivered, failed, e
+        except Exception as e:
+            logger.warning(f"Delivery of {len(rows)} {channel} notifications failed: {e}")
+            return [], rows, e
+    
+    def drain(self):
+        """Deliver until nothing is due"""
+        while self.run_once():
+            pass
+    
+    def run(self):
+        """Run concurrency delivery threads and the maintenance loop until stop()"""
+        logger.info(
+            f"Notification worker {self.worker_id} started: channels={','.join(self.channels)} "
+            f"concurrency={self.concurrency} batch_size={self.batch_size}"
+        )
+        threads = [
+            threading.Thread(target=self._deliver_loop, args=(f"t{i}",), name=f"notification-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        last_purge = 0
+        while not self._stop.is_set():
+            try:
+                notification_outbox.release_expired()
+                if time.monotonic() - last_purge >= PURGE_INTERVAL:
+                    purged = notification_outbox.purge(config.NOTIFICATION_OUTBOX_RETENTION_DAYS)
+                    if purged:
+                        logger.info(f"Purged {purged} delivered notifications from the outbox")
+                    last_purge = time.monotonic()
+            except Exception as e:
+                logger.error(f"Outbox maintenance failed: {e}")
+            self._stop.wait(MAINTENANCE_INTERVAL)
+        
+        for thread in threads:
+            thread.join()
+        logger.info(f"Notification worker stopped: {self.stats()}")
+    
+    def stop(self, *_):
+        self._stop.set()
+    
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+    
+    def _deliver_loop(self, thread_name):
+        while not self._stop.is_set():
+            try:
+                claimed = self.run_once(thread_name)
+            except Exception as e:
+                logger.error(f"Notification delivery loop error: {e}", exc_info=True)
+                claimed = 0
+            if not claimed:
+                self._stop.wait(self.poll_interval)
+    
+    def _count(self, delivered=0, failed=0):
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['delivered'] += delivered
+            self._stats['failed'] += failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Deliver queued notifications')
+    parser.add_argument('--channels', help='comma-separated channels (default: all observer channels)')
+    parser.add_argument('--concurrency', type=int, default=config.NOTIFICATION_WORKER_CONCURRENCY,
+                        help='delivery threads')
+    parser.add_argument('--batch-size', type=int, default=config.NOTIFICATION_BATCH_SIZE,
+                        help='deliveries per batch and channel')
+    parser.add_argument('--poll-interval', type=float, default=config.NOTIFICATION_POLL_INTERVAL,
+                        help='seconds to wait when nothing is due')
+    parser.add_argument('--once', action='store_true', help='deliver everything due, then exit')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    channels = args.channels.split(',') if args.channels else NotificationService().channels
+    worker = NotificationWorker(channels, args.concurrency, args.batch_size, args.poll_interval)
+    
+    try:
+        if args.once:
+            notification_outbox.release_expired()
+            worker.drain()
+            logger.info(f"Outbox drained: {worker.stats()}")
+            return
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        worker.run()
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
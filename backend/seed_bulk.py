@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Bulk seeding - deterministic synthetic dataset for staging and load tests
+
+Generates users, authors (editor users), categories, articles, comments,
+likes, views, saved articles and premium subscriptions with Zipf-skewed
+popularity, and loads them with batched multi-row INSERTs or LOAD DATA
+LOCAL INFILE. Non-unique secondary indexes are dropped for the load and
+rebuilt afterwards with one ALTER TABLE per table.
+
+The same --seed always produces the same rows (dated relative to now, or to
+a fixed day with --fixed-clock; only the bcrypt salt of the shared password
+hash differs). Rows get explicit ids after the current maximum, so the
+tool appends to an existing database.
+
+Usage:
+    python seed_bulk.py --users 500000 --articles 1000000
+    python seed_bulk.py --users 20000 --articles 50000 --mode infile
+    python seed_bulk.py --rebuild-indexes   # after an interrupted load
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pymysql
+from config import config
+from app.passwords import password_hasher
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+logger = logging.getLogger(__name__)
+
+# Tables whose secondary indexes are dropped during the load, in load order
+TABLES = ['users', 'categories', 'articles', 'comments', 'article_likes',
+          'article_views', 'saved_articles', 'user_subscriptions']
+INDEX_STATE_FILE = os.path.join(tempfile.gettempdir(), 'seed_bulk_indexes.json')
+
+CATEGORIES = [
+    ('Politics', 'politics'), ('Economy', 'economy'), ('Technology', 'technology'),
+    ('Science', 'science'), ('Health', 'health'), ('Sports', 'sports'),
+    ('Culture', 'culture'), ('World', 'world')
+]
+FIRST_NAMES = ['Sarah', 'Michael', 'Emma', 'David', 'Lisa', 'James', 'Olivia', 'Robert',
+               'Sophia', 'William', 'Jennifer', 'Christopher', 'Anna', 'Taras', 'Iryna', 'Oleh']
+LAST_NAMES = ['Johnson', 'Chen', 'Williams', 'Brown', 'Anderson', 'Taylor', 'Martinez', 'Wilson',
+              'Thomas', 'Davis', 'Lee', 'Garcia', 'Kovalenko', 'Shevchenko', 'Bondar', 'Melnyk']
+WORDS = ('government economy market election policy climate energy research health vaccine '
+         'team match season record city council budget tax growth technology startup data '
+         'network security privacy court ruling summit agreement festival film music art '
+         'exhibition science space mission discovery ocean species report analysis crisis '
+         'reform investment industry workers union school students university hospital').split()
+
+
+def slugify(text):
+    """Convert text to URL-friendly slug"""
+    text = text.lower()
+    text = re.sub(r'[^\w\s-]', '', text)
+    text = re.sub(r'[-\s]+', '-', text)
+    return text.strip('-')
+
+
+class Zipf:
+    """Samples 0..n-1 with probability proportional to 1 / (rank + 1) ^ s"""
+    
+    def __init__(self, n, s, rng):
+        self.rng = rng
+        self.population = range(n)
+        self.cum_weights = list(accumulate(1.0 / (rank + 1) ** s for rank in range(n)))
+    
+    def sample(self, k=1):
+        return self.rng.choices(self.population, cum_weights=self.cum_weights, k=k)
+
+
+class Progress:
+    """Logs rows loaded and rows/sec for one table"""
+    
+    def __init__(self, table, total=None, interval=5.0):
+        self.table = table
+        self.total = total
+        self.interval = interval
+        self.rows = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+    
+    def add(self, rows):
+        self.rows += rows
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self._report('...')
+    
+    def done(self):
+        self._report('done')
+    
+    def _report(self, state):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total = f"/{self.total}" if self.total else ''
+        logger.info(f"{self.table}: {self.rows}{total} rows, {self.rows / elapsed:,.0f} rows/s {state}")
+
+
+class BulkLoader:
+    """Writes row batches with multi-row INSERTs or LOAD DATA LOCAL INFILE"""
+    
+    def __init__(self, conn, mode='insert', batch_size=5000):
+        self.conn = conn
+        self.mode = mode
+        self.batch_size = batch_size
+    
+    def load(self, table, columns, rows, total=None):
+        """Load an iterable of row tuples; returns the number of rows"""
+        progress = Progress(table, total)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._write(table, columns, batch)
+                progress.add(len(batch))
+                batch = []
+        if batch:
+            self._write(table, columns, batch)
+            progress.add(len(batch))
+        progress.done()
+        return progress.rows
+    
+    def _write(self, table, columns, batch):
+        if self.mode == 'infile':
+            self._load_infile(table, columns, batch)
+        else:
+            self._insert(table, columns, batch)
+        self.conn.commit()
+    
+    def _insert(self, table, columns, batch):
+        # pymysql turns executemany of an INSERT ... VALUES into multi-row statements
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+        with self.conn.cursor() as cursor:
+            cursor.executemany(sql, batch)
+    
+    def _load_infile(self, table, columns, batch):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', encoding='utf-8', delete=False) as f:
+            writer = csv.writer(f, lineterminator='\n')
+            for row in batch:
+                writer.writerow([self._csv_value(value) for value in row])
+            path = f.name
+        try:
+            sql = f"""
+                LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+                CHARACTER SET utf8mb4
+                FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+                LINES TERMINATED BY '\\n'
+                ({', '.join(columns)})
+            """
+            with self.conn.cursor() as cursor:
+                cursor.execute(sql, (path,))
+        finally:
+            os.unlink(path)
+    
+    @staticmethod
+    def _csv_value(value):
+        if value is None:
+            return '\\N'
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d %H:%M:%S')
+        return value
+
+
+class IndexManager:
+    """Drops non-unique secondary indexes before a load and recreates them afterwards.
+    
+    InnoDB has no DISABLE KEYS, so the definitions are saved to a state file,
+    the indexes dropped, and a table's indexes re-added in one ALTER TABLE
+    (FULLTEXT ones separately). Indexes backing foreign keys cannot be dropped and are kept.
+    """
+    
+    def __init__(self, conn, state_file=INDEX_STATE_FILE):
+        self.conn = conn
+        self.state_file = state_file
+    
+    def drop(self, tables):
+        if os.path.exists(self.state_file):
+            raise RuntimeError(f"{self.state_file} exists: rebuild the indexes of an earlier load first "
+                               f"(--rebuild-indexes)")
+        dropped = {}
+        with self.conn.cursor() as cursor:
+            for table in tables:
+                for name, definition in self._secondary_indexes(cursor, table).items():
+                    try:
+                        cursor.execute(f"ALTER TABLE {table} DROP INDEX `{name}`")
+                    except pymysql.err.MySQLError as e:
+                        logger.info(f"Keeping index {table}.{name}: {e.args[-1]}")
+                        continue
+                    dropped.setdefault(table, {})[name] = definition
+                    # Save after every drop so an interrupted run can still rebuild
+                    with open(self.state_file, 'w') as f:
+                        json.dump(dropped, f)
+        logger.info(f"Dropped {sum(len(i) for i in dropped.values())} secondary indexes")
+        return dropped
+    
+    def rebuild(self):
+        if not os.path.exists(self.state_file):
+            logger.info("No dropped indexes to rebuild")
+            return
+        with open(self.state_file) as f:
+            dropped = json.load(f)
+        with self.conn.cursor() as cursor:
+            for table, indexes in dropped.items():
+                started = time.monotonic()
+                regular = [d for d in indexes.values() if not d.startswith('ADD FULLTEXT')]
+                if regular:
+                    cursor.execute(f"ALTER TABLE {table} {', '.join(regular)}")
+                # InnoDB builds one FULLTEXT index per statement
+                for definition in indexes.values():
+                    if definition.startswith('ADD FULLTEXT'):
+                        cursor.execute(f"ALTER TABLE {table} {definition}")
+                logger.info(f"Rebuilt {len(indexes)} indexes on {table} in {time.monotonic() - started:.1f}s")
+        os.unlink(self.state_file)
+    
+    def _secondary_indexes(self, cursor, table):
+        cursor.execute("""
+            SELECT index_name as name, column_name as col, sub_part as sub_part,
+                   index_type as index_type, seq_in_index as seq
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s
+              AND index_name <> 'PRIMARY' AND non_unique = 1
+            ORDER BY index_name, seq_in_index
+        """, (table,))
+        columns = {}
+        index_types = {}
+        for row in cursor.fetchall():
+            name = row['name']
+            index_types[name] = row['index_type']
+            columns.setdefault(name, []).append(f"`{row['col']}`" + (f"({row['sub_part']})" if row['sub_part'] else ''))
+        return {
+            name: f"ADD {'FULLTEXT ' if index_types[name] == 'FULLTEXT' else ''}INDEX `{name}` ({', '.join(cols)})"
+            for name, cols in columns.items()
+        }
+
+
+class DatasetGenerator:
+    """Deterministic synthetic rows; ids continue after the current maxima"""
+    
+    def __init__(self, args, start_ids, category_ids, tier_ids):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.start_ids = start_ids
+        self.category_ids = category_ids
+        self.tier_ids = tier_ids
+        self.now = datetime(2025, 1, 1) if args.fixed_clock else datetime.now().replace(microsecond=0)
+        self.password_hash = password_hasher.hash(args.password)
+        self.user_ids = range(start_ids['users'], start_ids['users'] + args.users + args.authors)
+        self.author_ids = self.user_ids[args.users:]
+        self.article_ids = range(start_ids['articles'], start_ids['articles'] + args.articles)
+        # Article popularity: article ids are shuffled so the popular ones are spread over time
+        self.popular_articles = list(self.article_ids)
+        self.rng.shuffle(self.popular_articles)
+        self.article_zipf = Zipf(len(self.popular_articles), args.zipf, self.rng) if args.articles else None
+        self.article_published = {}
+    
+    def users(self):
+        """Readers first, then editors (the authors)"""
+        for index, user_id in enumerate(self.user_ids):
+            is_author = index >= self.args.users
+            first_name = self.rng.choice(FIRST_NAMES)
+            last_name = self.rng.choice(LAST_NAMES)
+            created_at = self.now - timedelta(days=self.rng.randint(0, self.args.days * 2),
+                                              seconds=self.rng.randint(0, 86399))
+            yield (
+                user_id, f"{'author' if is_author else 'user'}{user_id}", f"user{user_id}@seed.example",
+                self.password_hash, first_name, last_name, 'editor' if is_author else 'user',
+                self.rng.random() > 0.01, created_at, created_at
+            )
+    
+    def articles(self):
+        author_zipf = Zipf(len(self.author_ids), 1.0, self.rng)
+        category_zipf = Zipf(len(self.category_ids), 0.8, self.rng)
+        for article_id in self.article_ids:
+            words = self.rng.sample(WORDS, self.rng.randint(4, 9))
+            title = ' '.join(words).capitalize()
+            paragraphs = [
+                ' '.join(self.rng.choices(WORDS, k=self.rng.randint(40, 120))).capitalize() + '.'
+                for _ in range(self.rng.randint(3, 12))
+            ]
+            content = '\n\n'.join(paragraphs)
+            # Recent days are busier: squaring the uniform sample skews ages towards 0
+            age = timedelta(days=self.args.days * self.rng.random() ** 2, seconds=self.rng.randint(0, 86399))
+            published_at = self.now - age
+            status = 'published' if self.rng.random() < 0.95 else 'draft'
+            if status == 'published':
+                self.article_published[article_id] = published_at
+            yield (
+                article_id, title, f"{slugify(title)}-{article_id}", content, paragraphs[0][:250],
+                self.author_ids[author_zipf.sample()[0]], self.category_ids[category_zipf.sample()[0]],
+                self.rng.random() < 0.02, self.rng.random() < 0.15, status,
+                published_at if status == 'published' else None, 0, 0, published_at, published_at
+            )
+    
+    def per_user(self, mean):
+        """(user_id, sorted distinct popular article ids) with about mean articles per user"""
+        if not self.article_zipf:
+            return
+        for user_id in self.user_ids:
+            count = int(self.rng.expovariate(1.0 / mean)) if mean > 0 else 0
+            if count:
+                picks = {self.popular_articles[i] for i in self.article_zipf.sample(count)}
+                yield user_id, sorted(picks)
+    
+    def likes(self):
+        for user_id, article_ids in self.per_user(self.args.likes_per_user):
+            for article_id in article_ids:
+                yield article_id, user_id
+    
+    def views(self):
+        for user_id, article_ids in self.per_user(self.args.views_per_user):
+            for article_id in article_ids:
+                ip_address = f"10.{user_id % 256}.{(user_id >> 8) % 256}.{self.rng.randint(1, 254)}"
+                yield article_id, user_id, ip_address
+    
+    def saved(self):
+        for user_id, article_ids in self.per_user(self.args.saved_per_user):
+            for article_id in article_ids:
+                yield user_id, article_id, self._after_publish(article_id)
+    
+    def comments(self):
+        """Comment threads on popular articles; about a third are replies"""
+        if not self.article_zipf or not self.args.comments:
+            return
+        counts = {}
+        for index in self.article_zipf.sample(self.args.comments):
+            article_id = self.popular_articles[index]
+            counts[article_id] = counts.get(article_id, 0) + 1
+        
+        comment_id = self.start_ids['comments']
+        for article_id in sorted(counts):
+            thread_ids = []
+            created_at = self.article_published.get(article_id, self.now - timedelta(days=1))
+            for _ in range(counts[article_id]):
+                created_at = min(self.now, created_at + timedelta(seconds=self.rng.randint(30, 7200)))
+                parent_id = self.rng.choice(thread_ids) if thread_ids and self.rng.random() < 0.35 else None
+                content = ' '.join(self.rng.choices(WORDS, k=self.rng.randint(5, 40))).capitalize() + '.'
+                yield (comment_id, content, self.rng.choice(self.user_ids), article_id, parent_id,
+                       True, created_at, created_at)
+                thread_ids.append(comment_id)
+                comment_id += 1
+    
+    def subscriptions(self):
+        if not self.tier_ids:
+            return
+        for user_id in self.user_ids[:self.args.users]:
+            if self.rng.random() < self.args.premium_ratio:
+                start_date = self.now - timedelta(days=self.rng.randint(0, 300))
+                end_date = start_date + timedelta(days=self.rng.choice([30, 365]))
+                yield user_id, self.rng.choice(self.tier_ids), start_date, end_date, end_date > self.now
+    
+    def _after_publish(self, article_id):
+        published_at = self.article_published.get(article_id, self.now - timedelta(days=self.args.days))
+        span = max(1, int((self.now - published_at).total_seconds()))
+        return published_at + timedelta(seconds=self.rng.randint(0, span))
+
+
+def connect(local_infile=False):
+    return pymysql.connect(
+        host=config.DB_HOST,
+        port=config.DB_PORT,
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        database=config.DB_NAME,
+        charset='utf8mb4',
+        cursorclass=pymysql.cursors.DictCursor,
+        autocommit=False,
+        local_infile=local_infile,
+        read_timeout=3600,
+        write_timeout=3600
+    )
+
+
+def prepare(conn):
+    """Ensure the base categories exist; current max ids, category ids and tier ids"""
+    with conn.cursor() as cursor:
+        for name, slug in CATEGORIES:
+            cursor.execute("INSERT IGNORE INTO categories (name, slug) VALUES (%s, %s)", (name, slug))
+        conn.commit()
+        
+        start_ids = {}
+        for table in ('users', 'articles', 'comments'):
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 as next_id FROM {table}")
+            start_ids[table] = cursor.fetchone()['next_id']
+        cursor.execute("SELECT id FROM categories ORDER BY id")
+        category_ids = [row['id'] for row in cursor.fetchall()]
+        cursor.execute("SELECT id FROM subscription_tiers WHERE type <> 'free' AND is_active = TRUE")
+        tier_ids = [row['id'] for row in cursor.fetchall()]
+    return start_ids, category_ids, tier_ids
+
+
+def refresh_counters(conn, first_article_id):
+    """Set likes_count and views_count of the new articles from the loaded rows (the schema has no comments_count)"""
+    started = time.monotonic()
+    with conn.cursor() as cursor:
+        for column, table in (('likes_count', 'article_likes'), ('views_count', 'article_views')):
+            cursor.execute(f"""
+                UPDATE articles a
+                JOIN (SELECT article_id, COUNT(*) as total FROM {table}
+                      WHERE article_id >= %s GROUP BY article_id) t ON t.article_id = a.id
+                SET a.{column} = t.total
+            """, (first_article_id,))
+        conn.commit()
+    logger.info(f"Article counters refreshed in {time.monotonic() - started:.1f}s")
+
+
+def seed(args):
+    conn = connect(local_infile=args.mode == 'infile')
+    indexes = IndexManager(conn)
+    
+    if args.rebuild_indexes:
+        indexes.rebuild()
+        return
+    
+    start_ids, category_ids, tier_ids = prepare(conn)
+    generator = DatasetGenerator(args, start_ids, category_ids, tier_ids)
+    loader = BulkLoader(conn, mode=args.mode, batch_size=args.batch_size)
+    started = time.monotonic()
+    
+    with conn.cursor() as cursor:
+        # Session only: ids are explicit and generated rows are consistent
+        cursor.execute("SET unique_checks = 0, foreign_key_checks = 0")
+    if not args.keep_indexes:
+        indexes.drop(TABLES)
+    
+    try:
+        total = 0
+        total += loader.load('users', [
+            'id', 'username', 'email', 'password_hash', 'first_name', 'last_name',
+            'role', 'is_active', 'created_at', 'updated_at'
+        ], generator.users(), total=args.users + args.authors)
+        total += loader.load('articles', [
+            'id', 'title', 'slug', 'content', 'excerpt', 'author_id', 'category_id', 'is_breaking',
+            'is_premium', 'status', 'published_at', 'views_count', 'likes_count', 'created_at', 'updated_at'
+        ], generator.articles(), total=args.articles)
+        total += loader.load('comments', [
+            'id', 'content', 'user_id', 'article_id', 'parent_id', 'is_approved', 'created_at', 'updated_at'
+        ], generator.comments(), total=args.comments)
+        total += loader.load('article_likes', ['article_id', 'user_id'], generator.likes())
+        total += loader.load('article_views', ['article_id', 'user_id', 'ip_address'], generator.views())
+        total += loader.load('saved_articles', ['user_id', 'article_id', 'created_at'], generator.saved())
+        total += loader.load('user_subscriptions', ['user_id', 'tier_id', 'start_date', 'end_date', 'is_active'],
+                             generator.subscriptions())
+    finally:
+        if not args.keep_indexes:
+            indexes.rebuild()
+    
+    refresh_counters(conn, start_ids['articles'])
+    elapsed = time.monotonic() - started
+    logger.info(f"Loaded {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    conn.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk-load a deterministic synthetic dataset')
+    parser.add_argument('--users', type=int, default=500000, help='reader accounts')
+    parser.add_argument('--authors', type=int, default=2000, help='editor accounts that write articles')
+    parser.add_argument('--articles', type=int, default=1000000)
+    parser.add_argument('--comments', type=int, default=2000000)
+    parser.add_argument('--likes-per-user', type=float, default=8.0, help='mean likes per user')
+    parser.add_argument('--views-per-user', type=float, default=30.0, help='mean recorded views per user')
+    parser.add_argument('--saved-per-user', type=float, default=2.0, help='mean saved articles per user')
+    parser.add_argument('--premium-ratio', type=float, default=0.05, help='share of readers with a subscription')
+    parser.add_argument('--days', type=int, default=365, help='articles are published over this many days')
+    parser.add_argument('--zipf', type=float, default=1.1, help='article popularity skew (Zipf exponent)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--fixed-clock', action='store_true', help='date rows relative to 2025-01-01, not now')
+    parser.add_argument('--password', default='password123', help='password of every generated account')
+    parser.add_argument('--mode', choices=['insert', 'infile'], default='insert',
+                        help='multi-row INSERTs or LOAD DATA LOCAL INFILE (needs local_infile on the server)')
+    parser.add_argument('--batch-size', type=int, default=5000, help='rows per INSERT batch / CSV file')
+    parser.add_argument('--keep-indexes', action='store_true', help='do not drop secondary indexes')
+    parser.add_argument('--rebuild-indexes', action='store_true',
+                        help='only recreate indexes dropped by an interrupted run')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    seed(parse_args())
@@ -0,0 +1,77 @@
+"""Statement counts of the article loading profiles."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.utils import Base, QueryCounter
+from app.dal.models import (
+    ArticleModel,
+    ArticleStatusEnum,
+    ArticleTagModel,
+    AuthorModel,
+    CategoryModel,
+    UserModel,
+)
+from app.dal.repositories.article_repository import ArticleLoad, ArticleRepository
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine)()
+    user = UserModel(username="author", email="author@example.com", password_hash="x")
+    author = AuthorModel(user=user)
+    categories = [CategoryModel(name=f"Category {i}", slug=f"category-{i}") for i in range(5)]
+    published_at = datetime(2025, 1, 1)
+    for i in range(120):
+        session.add(ArticleModel(
+            title=f"Article {i}",
+            content="Content",
+            author=author,
+            category=categories[i % len(categories)],
+            status=ArticleStatusEnum.PUBLISHED,
+            published_at=published_at + timedelta(minutes=i),
+            tags=[ArticleTagModel(tag="news"), ArticleTagModel(tag=f"tag-{i}")],
+        ))
+    session.commit()
+    # Nothing may be served from the identity map
+    session.expunge_all()
+    yield session
+    session.close()
+
+
+def test_list_profile_loads_a_page_in_two_statements(engine, session):
+    repository = ArticleRepository(session)
+    
+    with QueryCounter(engine) as counter:
+        articles = repository.get_published(0, 100, load=ArticleLoad.LIST)
+        for article in articles:
+            article.category.name
+            [tag.tag for tag in article.tags]
+    
+    assert len(articles) == 100
+    assert counter.count == 2
+
+
+def test_detail_profile_loads_an_article_in_two_statements(engine, session):
+    repository = ArticleRepository(session)
+    article_id = session.query(ArticleModel.id).first()[0]
+    session.expunge_all()
+    
+    with QueryCounter(engine) as counter:
+        article = repository.get_by_id(article_id, load=ArticleLoad.DETAIL)
+        article.category.name
+        article.author.bio
+        [tag.tag for tag in article.tags]
+    
+    assert article.id == article_id
+    assert counter.count == 2
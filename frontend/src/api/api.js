@@ -121,6 +121,7 @@ export const usersApi = {
 // Admin API
 export const adminApi = {
   listArticles: (params) => api.get('/admin/articles', { params }),
+  getArticle: (id) => api.get(`/admin/articles/${id}`),
   updateArticle: (id, data) => api.put(`/admin/articles/${id}`, data),
   deleteArticle: (id) => api.delete(`/admin/articles/${id}`),
   createCategory: (data) => api.post('/admin/categories', data),
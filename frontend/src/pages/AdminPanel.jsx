@@ -63,6 +63,16 @@ const AdminPanel = () => {
     }
   }
 
+  // The list only carries summaries; load the full article (with content) to edit it
+  const handleEditArticle = async (id) => {
+    try {
+      const response = await adminApi.getArticle(id)
+      setEditDialog({ open: true, article: response.data.article })
+    } catch (error) {
+      console.error('Failed to fetch article:', error)
+    }
+  }
+
   const handleUpdateArticle = async () => {
     try {
       await adminApi.updateArticle(editDialog.article.id, editDialog.article)
@@ -113,7 +123,7 @@ const AdminPanel = () => {
                   <TableCell>
                     <Button
                       size="small"
-                      onClick={() => setEditDialog({ open: true, article })}
+                      onClick={() => handleEditArticle(article.id)}
                     >
                       Edit
                     </Button>